@@ -0,0 +1,133 @@
+# adaptive_quiz/management/commands/calibrate_items.py
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from adaptive_quiz.models import Question, QuizAttempt, ItemCalibrationRun
+from adaptive_quiz.question_pool import question_pools
+from utils.irt_calibration import IRTCalibrator
+
+
+class Command(BaseCommand):
+    help = 'Calibrate 2PL IRT difficulty/discrimination for quiz questions from QuizAttempt history'
+
+    # Priors for questions without a previous calibration
+    DEFAULT_DIFFICULTY_SD = 1.0
+    DEFAULT_DISCRIMINATION = 1.0
+    DEFAULT_LOG_DISCRIMINATION_SD = 0.5
+    # Smallest prior SD carried into an incremental refit, so items can still drift
+    MIN_PRIOR_SD = 0.05
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true',
+                            help='Only use attempts since the last calibration, with the stored parameters as priors')
+        parser.add_argument('--max-iter', type=int, default=500, help='Maximum fitting iterations')
+        parser.add_argument('--tol', type=float, default=1e-4, help='Convergence tolerance (largest parameter step)')
+        parser.add_argument('--dry-run', action='store_true', help='Fit and report without saving')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        incremental = options['incremental']
+
+        since_attempt_id = 0
+        if incremental:
+            last_run = ItemCalibrationRun.objects.filter(completed_at__isnull=False).first()
+            if last_run is None:
+                self.stdout.write('No previous calibration found, running a full calibration')
+                incremental = False
+            else:
+                since_attempt_id = last_run.last_attempt_id
+
+        attempts = QuizAttempt.objects.filter(
+            id__gt=since_attempt_id, question__is_active=True
+        ).order_by('id').values_list('id', 'quiz__user_id', 'question_id', 'is_correct')
+        rows = np.array(list(attempts.iterator(chunk_size=10000)), dtype=np.int64).reshape(-1, 4)
+
+        if len(rows) == 0:
+            self.stdout.write(self.style.SUCCESS('No new attempts to calibrate'))
+            return
+
+        attempt_ids, user_ids, question_ids, correct = rows.T
+        users, person_index = np.unique(user_ids, return_inverse=True)
+        items, item_index = np.unique(question_ids, return_inverse=True)
+
+        questions = Question.objects.in_bulk(items.tolist())
+        questions = [questions[question_id] for question_id in items.tolist()]
+        priors = self._priors(questions, incremental)
+
+        calibrator = IRTCalibrator(max_iter=options['max_iter'], tol=options['tol'])
+        responses = calibrator.response_matrix(person_index, item_index, correct, len(users), len(items))
+        result = calibrator.fit(responses, *priors, standardize=not incremental)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Attempts: {len(rows)} ({responses.nnz} unique user/question responses)")
+        self.stdout.write(f"Users: {len(users)}, questions: {len(items)}")
+        self.stdout.write(f"Iterations: {result['iterations']} "
+                          f"({'converged' if result['converged'] else 'not converged'}), "
+                          f"log-likelihood {result['log_likelihood']:.2f}")
+        self.stdout.write(f"Fitted in {elapsed:.2f}s ({len(rows) / elapsed:.0f} attempts/sec)")
+
+        if options['dry_run']:
+            for question, b, a in zip(questions, result['difficulty'], result['discrimination']):
+                self.stdout.write(f"  Q{question.id} ({question.difficulty}): b={b:.3f}, a={a:.3f}")
+            self.stdout.write(self.style.WARNING('Dry run, nothing saved'))
+            return
+
+        now = timezone.now()
+        with transaction.atomic():
+            for question, b, se_b, a, se_log_a, count in zip(
+                questions, result['difficulty'], result['difficulty_se'], result['discrimination'],
+                result['log_discrimination_se'], result['responses_per_item']
+            ):
+                question.irt_difficulty = round(float(b), 4)
+                question.irt_difficulty_se = round(float(se_b), 4)
+                question.irt_discrimination = round(float(a), 4)
+                question.irt_discrimination_se = round(float(se_log_a), 4)
+                question.irt_response_count = int(count) + (question.irt_response_count if incremental else 0)
+                question.irt_calibrated_at = now
+
+            Question.objects.bulk_update(questions, [
+                'irt_difficulty', 'irt_difficulty_se', 'irt_discrimination',
+                'irt_discrimination_se', 'irt_response_count', 'irt_calibrated_at'
+            ], batch_size=500)
+
+            ItemCalibrationRun.objects.create(
+                mode='incremental' if incremental else 'full',
+                completed_at=now,
+                last_attempt_id=int(attempt_ids.max()),
+                attempts_used=len(rows),
+                users=len(users),
+                items_calibrated=len(questions),
+                iterations=result['iterations'],
+                converged=result['converged'],
+                log_likelihood=result['log_likelihood']
+            )
+
+        # bulk_update() sends no signals: rebuild the pools serving these questions
+        for category_id in {question.category_id for question in questions}:
+            question_pools.invalidate(category_id)
+
+        self.stdout.write(self.style.SUCCESS(f'Calibrated {len(questions)} questions'))
+
+    def _priors(self, questions, incremental):
+        """Prior means and SDs for difficulty and log-discrimination"""
+        n_items = len(questions)
+        difficulty = np.empty(n_items)
+        difficulty_sd = np.full(n_items, self.DEFAULT_DIFFICULTY_SD)
+        discrimination = np.full(n_items, self.DEFAULT_DISCRIMINATION)
+        log_discrimination_sd = np.full(n_items, self.DEFAULT_LOG_DISCRIMINATION_SD)
+
+        for i, question in enumerate(questions):
+            difficulty[i] = Question.DIFFICULTY_THETA.get(question.difficulty, 0.0)
+            if incremental and question.is_calibrated:
+                difficulty[i] = question.irt_difficulty
+                discrimination[i] = question.irt_discrimination
+                if question.irt_difficulty_se:
+                    difficulty_sd[i] = max(question.irt_difficulty_se, self.MIN_PRIOR_SD)
+                if question.irt_discrimination_se:
+                    log_discrimination_sd[i] = max(question.irt_discrimination_se, self.MIN_PRIOR_SD)
+
+        return difficulty, difficulty_sd, discrimination, log_discrimination_sd
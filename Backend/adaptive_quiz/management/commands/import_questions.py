@@ -0,0 +1,65 @@
+# adaptive_quiz/management/commands/import_questions.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from adaptive_quiz.question_import import QuestionBankImporter, iter_csv_records, iter_json_records
+
+
+class Command(BaseCommand):
+    help = 'Import quiz questions from JSON, JSON Lines or CSV files (upsert by external_id)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Question files (.json, .jsonl or .csv)')
+        parser.add_argument('--format', choices=['json', 'csv'],
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Questions per transaction')
+        parser.add_argument('--no-create-categories', action='store_true',
+                            help='Reject questions whose category does not exist')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the files without writing')
+
+    def handle(self, *args, **options):
+        importer = QuestionBankImporter(
+            batch_size=options['batch_size'],
+            create_categories=not options['no_create_categories'],
+            dry_run=options['dry_run']
+        )
+        started = time.perf_counter()
+
+        for path in options['paths']:
+            if not os.path.exists(path):
+                raise CommandError(f'File not found: {path}')
+
+            file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'json')
+            self.stdout.write(f'Importing {path} ({file_format})...')
+            with open(path, encoding='utf-8-sig', newline='') as fp:
+                records = iter_csv_records(fp) if file_format == 'csv' else iter_json_records(fp)
+                try:
+                    importer.run(records, source=os.path.basename(path))
+                except ValueError as e:
+                    raise CommandError(f'Could not parse {path}: {e}')
+
+        elapsed = time.perf_counter() - started
+        stats = importer.stats
+        rate = stats['read'] / elapsed if elapsed > 0 else 0
+
+        for error in importer.errors:
+            self.stdout.write(self.style.WARNING(f'  Skipped {error}'))
+        if stats['invalid'] > len(importer.errors):
+            self.stdout.write(self.style.WARNING(f"  ... and {stats['invalid'] - len(importer.errors)} more"))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Validated {stats['read']} rows in {elapsed:.2f}s ({rate:.0f} rows/sec): "
+                f"{stats['valid']} valid, {stats['invalid']} invalid"
+            ))
+            return
+
+        self.stdout.write(f"  Options: {stats['options_created']} created, {stats['options_updated']} updated, "
+                          f"{stats['options_deleted']} deleted")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['read']} rows in {elapsed:.2f}s ({rate:.0f} rows/sec): "
+            f"{stats['created']} created, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['invalid']} invalid, {stats['duplicates']} duplicates"
+        ))
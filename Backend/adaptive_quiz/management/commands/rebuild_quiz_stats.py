@@ -0,0 +1,24 @@
+# adaptive_quiz/management/commands/rebuild_quiz_stats.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from adaptive_quiz.quiz_stats import rebuild_quiz_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-category and per-user quiz stats tables from the quiz history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding quiz stats...')
+        started = time.perf_counter()
+
+        categories, users = rebuild_quiz_stats(batch_size=options['batch_size'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {categories} category rows and {users} user rows in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,26 @@
+# adaptive_quiz/management/commands/recompute_skill_profiles.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from adaptive_quiz.models import UserSkillProfile
+
+
+class Command(BaseCommand):
+    help = 'Recompute user skill profiles from quiz attempt history in one pass'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help='Only recompute this user ID (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Users per pass and rows per bulk write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Recomputing skill profiles...')
+        started = time.perf_counter()
+
+        written = UserSkillProfile.recompute_from_attempts(
+            user_ids=options['user_ids'], batch_size=options['batch_size']
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {written} profiles in {elapsed:.2f}s'))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adaptive_quiz', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemCalibrationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('full', 'Full'), ('incremental', 'Incremental')], max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_attempt_id', models.BigIntegerField(default=0, help_text='Highest QuizAttempt ID included')),
+                ('attempts_used', models.IntegerField(default=0)),
+                ('users', models.IntegerField(default=0)),
+                ('items_calibrated', models.IntegerField(default=0)),
+                ('iterations', models.IntegerField(default=0)),
+                ('converged', models.BooleanField(default=False)),
+                ('log_likelihood', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_calibrated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_difficulty',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_difficulty_se',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_discrimination',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_discrimination_se',
+            field=models.FloatField(blank=True, help_text='Standard error of log(discrimination)', null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='irt_response_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
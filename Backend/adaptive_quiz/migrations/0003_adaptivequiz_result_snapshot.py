@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adaptive_quiz', '0002_question_irt_calibration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adaptivequiz',
+            name='result_snapshot',
+            field=models.JSONField(blank=True, help_text='Results, review and topic breakdown computed at completion', null=True),
+        ),
+    ]
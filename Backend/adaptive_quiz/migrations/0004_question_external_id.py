@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adaptive_quiz', '0003_adaptivequiz_result_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='external_id',
+            field=models.CharField(blank=True, help_text='Content vendor ID, used to upsert imported questions', max_length=100, null=True, unique=True),
+        ),
+    ]
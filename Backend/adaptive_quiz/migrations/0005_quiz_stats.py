@@ -0,0 +1,75 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_quiz_stats(apps, schema_editor):
+    AdaptiveQuiz = apps.get_model('adaptive_quiz', 'AdaptiveQuiz')
+    QuizCategoryStats = apps.get_model('adaptive_quiz', 'QuizCategoryStats')
+    UserQuizStats = apps.get_model('adaptive_quiz', 'UserQuizStats')
+
+    completed = models.Q(is_completed=True)
+    rows = AdaptiveQuiz.objects.order_by().values('user_id', 'category_id').annotate(
+        quizzes_started=models.Count('id'),
+        quizzes_completed=models.Count('id', filter=completed),
+        score_sum=models.Sum('total_score', filter=completed),
+        correct_answers_sum=models.Sum('correct_answers', filter=completed)
+    )
+
+    user_rows, category_rows = [], {}
+    for row in rows:
+        counters = {field: row[field] or 0 for field in ('quizzes_started', 'quizzes_completed', 'score_sum', 'correct_answers_sum')}
+        user_rows.append(UserQuizStats(user_id=row['user_id'], category_id=row['category_id'], **counters))
+        totals = category_rows.setdefault(row['category_id'], dict.fromkeys(counters, 0))
+        for field, value in counters.items():
+            totals[field] += value
+
+    QuizCategoryStats.objects.bulk_create(
+        QuizCategoryStats(category_id=category_id, **totals) for category_id, totals in category_rows.items()
+    )
+    UserQuizStats.objects.bulk_create(user_rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('adaptive_quiz', '0004_question_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizCategoryStats',
+            fields=[
+                ('quizzes_started', models.IntegerField(default=0)),
+                ('quizzes_completed', models.IntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0, help_text='Sum of total_score over completed quizzes')),
+                ('correct_answers_sum', models.BigIntegerField(default=0, help_text='Sum of correct_answers over completed quizzes')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='quiz_stats', serialize=False, to='adaptive_quiz.quizcategory')),
+            ],
+            options={
+                'verbose_name_plural': 'Quiz Category Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserQuizStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quizzes_started', models.IntegerField(default=0)),
+                ('quizzes_completed', models.IntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0, help_text='Sum of total_score over completed quizzes')),
+                ('correct_answers_sum', models.BigIntegerField(default=0, help_text='Sum of correct_answers over completed quizzes')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_quiz_stats', to='adaptive_quiz.quizcategory')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User Quiz Stats',
+                'unique_together': {('user', 'category')},
+            },
+        ),
+        migrations.RunPython(backfill_quiz_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:46
+
+from django.db import migrations, models
+
+
+def remove_repeated_attempts(apps, schema_editor):
+    """Keep the first attempt of each question in a quiz (repeats could only come from concurrent submits)"""
+    QuizAttempt = apps.get_model('adaptive_quiz', 'QuizAttempt')
+    repeated = QuizAttempt.objects.order_by().values('quiz_id', 'question_id').annotate(
+        first_id=models.Min('id'), count=models.Count('id')
+    ).filter(count__gt=1)
+    for row in repeated.iterator():
+        QuizAttempt.objects.filter(
+            quiz_id=row['quiz_id'], question_id=row['question_id'], id__gt=row['first_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adaptive_quiz', '0005_quiz_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_repeated_attempts, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='quizattempt',
+            unique_together={('quiz', 'question')},
+        ),
+    ]
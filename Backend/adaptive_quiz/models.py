@@ -1,7 +1,8 @@
 # adaptive_quiz/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 import json
 
 class QuizCategory(models.Model):
@@ -32,6 +33,14 @@ class Question(models.Model):
         ('expert', 'Expert')
     ]
     
+    # Default IRT difficulty (theta scale) for each label, used until calibrated
+    DIFFICULTY_THETA = {
+        'easy': -1.5,
+        'medium': -0.5,
+        'hard': 0.5,
+        'expert': 1.5
+    }
+    
     category = models.ForeignKey(
         QuizCategory, 
         on_delete=models.CASCADE, 
@@ -45,12 +54,39 @@ class Question(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    external_id = models.CharField(
+        max_length=100, unique=True, null=True, blank=True,
+        help_text="Content vendor ID, used to upsert imported questions"
+    )
+    
+    # 2PL item parameters learned from QuizAttempt history (calibrate_items)
+    irt_difficulty = models.FloatField(null=True, blank=True)
+    irt_discrimination = models.FloatField(null=True, blank=True)
+    irt_difficulty_se = models.FloatField(null=True, blank=True)
+    irt_discrimination_se = models.FloatField(null=True, blank=True, help_text="Standard error of log(discrimination)")
+    irt_response_count = models.IntegerField(default=0)
+    irt_calibrated_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['category', 'difficulty']
     
     def __str__(self):
         return f"{self.question_text[:50]}... ({self.difficulty})"
+    
+    @property
+    def is_calibrated(self):
+        return self.irt_difficulty is not None and self.irt_discrimination is not None
+    
+    @classmethod
+    def parameters_from(cls, difficulty, irt_difficulty, irt_discrimination):
+        """(difficulty, discrimination) from a question's fields, falling back to the difficulty label"""
+        if irt_difficulty is not None and irt_discrimination is not None:
+            return irt_difficulty, irt_discrimination
+        return cls.DIFFICULTY_THETA.get(difficulty, 0.0), 1.0
+    
+    def irt_parameters(self):
+        """(difficulty, discrimination), falling back to the difficulty label"""
+        return self.parameters_from(self.difficulty, self.irt_difficulty, self.irt_discrimination)
 
 
 class QuestionOption(models.Model):
@@ -89,6 +125,11 @@ class AdaptiveQuiz(models.Model):
     correct_answers = models.IntegerField(default=0)
     is_completed = models.BooleanField(default=False)
     time_taken = models.IntegerField(default=0, help_text="Total time in seconds")
+    result_snapshot = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Results, review and topic breakdown computed at completion"
+    )
     
     class Meta:
         ordering = ['-started_at']
@@ -132,11 +173,103 @@ class QuizAttempt(models.Model):
     
     class Meta:
         ordering = ['answered_at']
+        # A question is answered at most once per quiz
+        unique_together = ['quiz', 'question']
     
     def __str__(self):
         return f"{self.quiz.user.username} - Q{self.question.id} - {'✓' if self.is_correct else '✗'}"
 
 
+class QuizStatsCounters(models.Model):
+    """Running quiz totals, maintained as quizzes start and complete"""
+    quizzes_started = models.IntegerField(default=0)
+    quizzes_completed = models.IntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0, help_text="Sum of total_score over completed quizzes")
+    correct_answers_sum = models.BigIntegerField(default=0, help_text="Sum of correct_answers over completed quizzes")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def quizzes_in_progress(self):
+        return max(self.quizzes_started - self.quizzes_completed, 0)
+    
+    @property
+    def average_score(self):
+        if self.quizzes_completed == 0:
+            return 0
+        return self.score_sum / self.quizzes_completed
+    
+    @property
+    def average_correct_answers(self):
+        if self.quizzes_completed == 0:
+            return 0
+        return self.correct_answers_sum / self.quizzes_completed
+
+
+class QuizCategoryStats(QuizStatsCounters):
+    """Quiz totals for a category"""
+    category = models.OneToOneField(
+        QuizCategory,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='quiz_stats'
+    )
+    
+    class Meta:
+        verbose_name_plural = "Quiz Category Stats"
+    
+    def __str__(self):
+        return f"{self.category.name} - {self.quizzes_completed} completed"
+
+
+class UserQuizStats(QuizStatsCounters):
+    """A user's quiz totals in one category"""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='quiz_stats'
+    )
+    category = models.ForeignKey(
+        QuizCategory,
+        on_delete=models.CASCADE,
+        related_name='user_quiz_stats'
+    )
+    
+    class Meta:
+        unique_together = ['user', 'category']
+        verbose_name_plural = "User Quiz Stats"
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.category.name} - {self.quizzes_completed} completed"
+
+
+class ItemCalibrationRun(models.Model):
+    """A run of the IRT item calibration job"""
+    MODE_CHOICES = [
+        ('full', 'Full'),
+        ('incremental', 'Incremental')
+    ]
+    
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES)
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    last_attempt_id = models.BigIntegerField(default=0, help_text="Highest QuizAttempt ID included")
+    attempts_used = models.IntegerField(default=0)
+    users = models.IntegerField(default=0)
+    items_calibrated = models.IntegerField(default=0)
+    iterations = models.IntegerField(default=0)
+    converged = models.BooleanField(default=False)
+    log_likelihood = models.FloatField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{self.mode} calibration ({self.started_at:%Y-%m-%d %H:%M}) - {self.items_calibrated} items"
+
+
 class UserSkillProfile(models.Model):
     """User's skill profile based on quiz performance"""
     user = models.OneToOneField(
@@ -160,33 +293,126 @@ class UserSkillProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - Skill Profile"
     
-    def update_skill(self, skill_name, performance):
+    @staticmethod
+    def apply_performance(skill_data, skill_name, performance):
         """
-        Update skill level based on quiz performance
-        Performance should be a value between 0-100
+        Fold one performance (0-100) into a skill_data dict in place
+        (running average of all attempts)
         """
-        if not isinstance(self.skill_data, dict):
-            self.skill_data = {}
+        current = skill_data.get(skill_name) or {'level': 0, 'attempts': 0, 'last_score': 0}
         
-        if skill_name not in self.skill_data:
-            self.skill_data[skill_name] = {
-                'level': 0, 
-                'attempts': 0,
-                'last_score': 0
-            }
-        
-        current_level = self.skill_data[skill_name]['level']
-        attempts = self.skill_data[skill_name]['attempts'] + 1
+        current_level = current['level']
+        attempts = current['attempts'] + 1
         
         # Adaptive learning algorithm - weighted average
         new_level = (current_level * (attempts - 1) + performance) / attempts
         
-        self.skill_data[skill_name] = {
+        skill_data[skill_name] = {
             'level': round(new_level, 2),
             'attempts': attempts,
             'last_score': performance
         }
-        self.save()
+    
+    def update_skill(self, skill_name, performance, commit=True):
+        """
+        Update skill level based on quiz performance
+        Performance should be a value between 0-100
+        With commit=False the caller saves the profile
+        """
+        if not isinstance(self.skill_data, dict):
+            self.skill_data = {}
+        
+        self.apply_performance(self.skill_data, skill_name, performance)
+        if commit:
+            self.save()
+    
+    @classmethod
+    def apply_skill_updates(cls, user_id, updates):
+        """
+        Apply (skill_name, performance) updates for one answer or a whole quiz
+        in a single locked read-modify-write, so concurrent quizzes for the
+        same user cannot overwrite each other's skill_data.
+        """
+        updates = list(updates)
+        if not updates:
+            return None
+        
+        with transaction.atomic():
+            profile, created = cls.objects.select_for_update().get_or_create(user_id=user_id)
+            for skill_name, performance in updates:
+                profile.update_skill(skill_name, performance, commit=False)
+            profile.save(update_fields=['skill_data', 'last_updated'])
+        return profile
+    
+    @classmethod
+    def recompute_from_attempts(cls, user_ids=None, batch_size=500):
+        """
+        Rebuild skill_data and quiz statistics for many users from their
+        QuizAttempt history in one pass (replaying attempts in answer order).
+        Profiles of users without attempts or completed quizzes are reset.
+        A user_ids list is processed batch_size users at a time, keeping
+        the IN filters within the database's bound-variable limit.
+        Returns the number of profiles written.
+        """
+        with transaction.atomic():
+            if user_ids is None:
+                return cls._recompute_users(None, batch_size)
+            user_ids = list(user_ids)
+            return sum(
+                cls._recompute_users(user_ids[start:start + batch_size], batch_size)
+                for start in range(0, len(user_ids), batch_size)
+            )
+    
+    @classmethod
+    def _recompute_users(cls, user_ids, batch_size):
+        """recompute_from_attempts for some users (every user if None)"""
+        attempts = QuizAttempt.objects.order_by('quiz__user_id', 'answered_at', 'id')
+        quizzes = AdaptiveQuiz.objects.filter(is_completed=True)
+        profiles = cls.objects.all()
+        if user_ids is not None:
+            attempts = attempts.filter(quiz__user_id__in=user_ids)
+            quizzes = quizzes.filter(user_id__in=user_ids)
+            profiles = profiles.filter(user_id__in=user_ids)
+        
+        skill_data = {}
+        rows = attempts.values_list('quiz__user_id', 'question__skill_tags', 'is_correct')
+        for user_id, skill_tags, is_correct in rows.iterator(chunk_size=2000):
+            user_skills = skill_data.setdefault(user_id, {})
+            performance = 100 if is_correct else 0
+            for skill_tag in skill_tags or []:
+                if isinstance(skill_tag, str):
+                    cls.apply_performance(user_skills, skill_tag, performance)
+        
+        quiz_stats = {
+            row['user_id']: row
+            for row in quizzes.values('user_id').annotate(
+                count=models.Count('id'), avg_score=models.Avg('total_score')
+            )
+        }
+        
+        # Every profile in scope is rewritten, so those left without attempts are reset
+        existing = {profile.user_id: profile for profile in profiles.iterator(chunk_size=2000)}
+        missing = (set(skill_data) | set(quiz_stats)) - set(existing)
+        
+        now = timezone.now()
+        to_update, to_create = [], []
+        for user_id in set(existing) | missing:
+            stats = quiz_stats.get(user_id, {})
+            profile = existing.get(user_id) or cls(user_id=user_id)
+            profile.skill_data = skill_data.get(user_id, {})
+            profile.total_quizzes_taken = stats.get('count', 0)
+            profile.average_score = round(stats.get('avg_score') or 0, 2)
+            profile.last_updated = now
+            (to_update if profile.pk else to_create).append(profile)
+        
+        if to_update:
+            cls.objects.bulk_update(
+                to_update, ['skill_data', 'total_quizzes_taken', 'average_score', 'last_updated'],
+                batch_size=batch_size
+            )
+        cls.objects.bulk_create(to_create, batch_size=batch_size)
+        
+        return len(to_update) + len(to_create)
     
     def get_top_skills(self, limit=5):
         """Get user's top skills by level"""
@@ -0,0 +1,327 @@
+# adaptive_quiz/question_import.py
+import csv
+import json
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import QuizCategory, Question, QuestionOption, QuizAttempt
+from .question_pool import question_pools
+
+DIFFICULTIES = {difficulty for difficulty, _ in Question.DIFFICULTY_CHOICES}
+OPTION_COLUMN = re.compile(r'^option_(\d+)$')
+
+
+def iter_json_records(fp, chunk_size=64 * 1024):
+    """
+    Yield (record number, object) from a JSON array or JSON Lines file,
+    decoding one object at a time instead of loading the whole file.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    number = 0
+    eof = False
+
+    while True:
+        # Skip whitespace and the array's brackets and separators
+        while position < len(buffer) and buffer[position] in ' \t\r\n,[]':
+            position += 1
+
+        if position >= len(buffer):
+            if eof:
+                return
+            buffer, position = fp.read(chunk_size), 0
+            eof = not buffer
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Object continues in the next chunk
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        number += 1
+        position = end
+        yield number, record
+
+
+def iter_csv_records(fp):
+    """
+    Yield (line number, record) from a CSV file with the columns external_id,
+    category, question_text, difficulty, points, time_limit, skill_tags
+    (separated by ';'), option_1..option_N, correct_option (1-based, several
+    separated by ';') and explanation (shown for the correct options).
+    """
+    reader = csv.DictReader(fp)
+    option_columns = sorted(
+        (int(match.group(1)), column)
+        for column in reader.fieldnames or []
+        for match in [OPTION_COLUMN.match(column.strip())] if match
+    )
+
+    for row in reader:
+        correct = {value.strip() for value in (row.get('correct_option') or '').split(';') if value.strip()}
+        explanation = (row.get('explanation') or '').strip()
+        options = []
+        for number, column in option_columns:
+            text = (row.get(column) or '').strip()
+            if text:
+                is_correct = str(number) in correct
+                options.append({
+                    'text': text,
+                    'is_correct': is_correct,
+                    'explanation': explanation if is_correct else ''
+                })
+
+        record = {key: value for key, value in row.items() if key and value not in (None, '')}
+        record['skill_tags'] = [tag.strip() for tag in (row.get('skill_tags') or '').split(';') if tag.strip()]
+        record['options'] = options
+        yield reader.line_num, record
+
+
+def clean_record(record):
+    """
+    Validate an imported question and return it in the importer's form.
+    Raises ValueError with the reason if the record is invalid.
+    """
+    if not isinstance(record, dict):
+        raise ValueError('record is not an object')
+
+    external_id = str(record.get('external_id') or '').strip()
+    category = str(record.get('category') or '').strip()
+    question_text = str(record.get('question_text') or '').strip()
+    if not external_id:
+        raise ValueError('external_id is required')
+    if len(external_id) > 100:
+        raise ValueError('external_id is longer than 100 characters')
+    if not category:
+        raise ValueError('category is required')
+    if not question_text:
+        raise ValueError('question_text is required')
+
+    difficulty = str(record.get('difficulty') or 'medium').strip().lower()
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"unknown difficulty '{difficulty}'")
+
+    try:
+        points = int(record.get('points', 10))
+        time_limit = int(record.get('time_limit', 60))
+    except (TypeError, ValueError):
+        raise ValueError('points and time_limit must be integers')
+
+    skill_tags = record.get('skill_tags') or []
+    if not isinstance(skill_tags, list):
+        raise ValueError('skill_tags must be a list')
+
+    is_active = record.get('is_active', True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() not in ('0', 'false', 'no')
+
+    options = []
+    for option in record.get('options') or []:
+        if not isinstance(option, dict) or not str(option.get('text') or '').strip():
+            raise ValueError('every option needs a text')
+        text = str(option['text']).strip()
+        if len(text) > 500:
+            raise ValueError('option text is longer than 500 characters')
+        options.append({
+            'option_text': text,
+            'is_correct': bool(option.get('is_correct', False)),
+            'explanation': str(option.get('explanation') or '')
+        })
+    if len(options) < 2:
+        raise ValueError('at least two options are required')
+    if not any(option['is_correct'] for option in options):
+        raise ValueError('no correct option')
+
+    return {
+        'external_id': external_id,
+        'category': category,
+        'question': {
+            'question_text': question_text,
+            'difficulty': difficulty,
+            'points': points,
+            'time_limit': time_limit,
+            'skill_tags': [str(tag) for tag in skill_tags],
+            'is_active': bool(is_active)
+        },
+        'options': options
+    }
+
+
+class QuestionBankImporter:
+    """
+    Upsert questions and their options by external ID, a batch at a time.
+
+    Each batch reads the existing questions (with options) in two queries,
+    then bulk-creates new questions, bulk-updates changed ones and writes the
+    options in bulk, all in one transaction. Options of existing questions
+    are matched by position; surplus options that quiz attempts point to
+    are kept (marked incorrect) rather than deleted. Bulk writes bypass
+    model signals, so the affected question pools are invalidated here.
+    """
+
+    QUESTION_FIELDS = ['category_id', 'question_text', 'difficulty', 'points', 'time_limit', 'skill_tags', 'is_active']
+    OPTION_FIELDS = ['option_text', 'is_correct', 'explanation', 'order']
+    # Invalid records kept for the report
+    MAX_ERRORS = 50
+
+    def __init__(self, batch_size=1000, create_categories=True, dry_run=False):
+        self.batch_size = batch_size
+        self.create_categories = create_categories
+        self.dry_run = dry_run
+        self.stats = dict.fromkeys([
+            'read', 'valid', 'invalid', 'duplicates', 'created', 'updated', 'unchanged',
+            'options_created', 'options_updated', 'options_deleted'
+        ], 0)
+        self.errors = []
+        self._categories = None
+
+    def run(self, records, source=''):
+        """Import (position, record) pairs; returns the running stats"""
+        batch = {}
+        for position, record in records:
+            self.stats['read'] += 1
+            try:
+                cleaned = clean_record(record)
+            except ValueError as e:
+                self._error(source, position, str(e))
+                continue
+            self.stats['valid'] += 1
+
+            if cleaned['external_id'] in batch:
+                self.stats['duplicates'] += 1
+            batch[cleaned['external_id']] = (position, cleaned)
+
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch, source)
+                batch = {}
+
+        if batch:
+            self._write_batch(batch, source)
+        return self.stats
+
+    def _error(self, source, position, message):
+        self.stats['invalid'] += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(f'{source}:{position}: {message}' if source else f'{position}: {message}')
+
+    def _category_id(self, name):
+        if self._categories is None:
+            self._categories = dict(QuizCategory.objects.values_list('name', 'id'))
+        if name not in self._categories:
+            if not self.create_categories:
+                raise ValueError(f"unknown category '{name}'")
+            self._categories[name] = QuizCategory.objects.create(name=name, description=name).id
+        return self._categories[name]
+
+    def _write_batch(self, batch, source):
+        if self.dry_run:
+            return
+
+        touched_categories = set()
+        with transaction.atomic():
+            existing = {
+                question.external_id: question
+                for question in Question.objects.filter(external_id__in=list(batch)).prefetch_related('options')
+            }
+
+            now = timezone.now()
+            new_questions, new_options = [], {}
+            changed_questions, option_creates, option_updates, surplus = [], [], [], []
+
+            for external_id, (position, record) in batch.items():
+                try:
+                    values = dict(record['question'], category_id=self._category_id(record['category']))
+                except ValueError as e:
+                    self.stats['valid'] -= 1
+                    self._error(source, position, str(e))
+                    continue
+
+                question = existing.get(external_id)
+                if question is None:
+                    touched_categories.add(values['category_id'])
+                    new_questions.append(Question(external_id=external_id, **values))
+                    new_options[external_id] = record['options']
+                    continue
+
+                question_changed = any(getattr(question, field) != value for field, value in values.items())
+                if question_changed:
+                    touched_categories.update([question.category_id, values['category_id']])
+                    for field, value in values.items():
+                        setattr(question, field, value)
+                    question.updated_at = now
+                    changed_questions.append(question)
+
+                current = list(question.options.all())
+                options_changed = False
+                for order, option in enumerate(record['options']):
+                    if order < len(current):
+                        existing_option = current[order]
+                        target = dict(option, order=order)
+                        if any(getattr(existing_option, field) != value for field, value in target.items()):
+                            for field, value in target.items():
+                                setattr(existing_option, field, value)
+                            option_updates.append(existing_option)
+                            options_changed = True
+                    else:
+                        option_creates.append(QuestionOption(question=question, order=order, **option))
+                        options_changed = True
+                if len(current) > len(record['options']):
+                    surplus.extend(current[len(record['options']):])
+                    options_changed = True
+
+                if question_changed or options_changed:
+                    self.stats['updated'] += 1
+                else:
+                    self.stats['unchanged'] += 1
+
+            if new_questions:
+                Question.objects.bulk_create(new_questions, batch_size=self.batch_size)
+                if new_questions[0].pk is None:
+                    # Backends that don't return primary keys from bulk inserts
+                    ids = dict(Question.objects.filter(
+                        external_id__in=[question.external_id for question in new_questions]
+                    ).values_list('external_id', 'id'))
+                    for question in new_questions:
+                        question.pk = ids[question.external_id]
+                for question in new_questions:
+                    option_creates.extend(
+                        QuestionOption(question_id=question.pk, order=order, **option)
+                        for order, option in enumerate(new_options[question.external_id])
+                    )
+                self.stats['created'] += len(new_questions)
+
+            if changed_questions:
+                Question.objects.bulk_update(
+                    changed_questions, self.QUESTION_FIELDS + ['updated_at'], batch_size=self.batch_size
+                )
+
+            if surplus:
+                answered = set(QuizAttempt.objects.filter(
+                    selected_option__in=surplus
+                ).values_list('selected_option_id', flat=True))
+                for option in surplus:
+                    if option.id in answered and option.is_correct:
+                        option.is_correct = False
+                        option_updates.append(option)
+                removable = [option.id for option in surplus if option.id not in answered]
+                QuestionOption.objects.filter(id__in=removable).delete()
+                self.stats['options_deleted'] += len(removable)
+
+            if option_updates:
+                QuestionOption.objects.bulk_update(option_updates, self.OPTION_FIELDS, batch_size=self.batch_size)
+                self.stats['options_updated'] += len(option_updates)
+            if option_creates:
+                QuestionOption.objects.bulk_create(option_creates, batch_size=self.batch_size)
+                self.stats['options_created'] += len(option_creates)
+
+        for category_id in touched_categories:
+            question_pools.invalidate(category_id)
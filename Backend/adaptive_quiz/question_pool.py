@@ -0,0 +1,97 @@
+# adaptive_quiz/question_pool.py
+import random
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Question
+
+
+class QuestionPoolIndex:
+    """
+    Cached per-category item bank: active question IDs with their 2PL
+    parameters (calibrated by calibrate_items, else the difficulty label's
+    defaults, see Question.irt_parameters).
+
+    Each pool is built with one query and kept in the Django cache until a
+    question in the category changes (see signals.py) or is recalibrated.
+    Selection scores every question's Fisher information at the target
+    ability with array operations and picks at random among the most
+    informative unanswered ones, so calibrated parameters decide what is
+    served while the same question isn't always shown to everyone.
+    """
+
+    KEY_PREFIX = 'question_pool'
+    # Most informative questions a pick is drawn from (exposure control)
+    TOP_K = 5
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'QUESTION_POOL_CACHE_TIMEOUT', 60 * 60
+        )
+
+    def _key(self, category_id):
+        return f'{self.KEY_PREFIX}:{category_id}'
+
+    def get_pool(self, category_id):
+        """{'ids', 'difficulty', 'discrimination'} arrays of a category's active questions"""
+        key = self._key(category_id)
+        pool = cache.get(key)
+        if pool is None:
+            pool = self.build(category_id)
+            cache.set(key, pool, self.timeout)
+        return pool
+
+    def build(self, category_id):
+        """Build a category pool from the database"""
+        rows = Question.objects.filter(
+            category_id=category_id, is_active=True
+        ).order_by('id').values_list('id', 'difficulty', 'irt_difficulty', 'irt_discrimination')
+
+        ids, difficulty, discrimination = [], [], []
+        for question_id, label, irt_difficulty, irt_discrimination in rows:
+            b, a = Question.parameters_from(label, irt_difficulty, irt_discrimination)
+            ids.append(question_id)
+            difficulty.append(b)
+            discrimination.append(a)
+        return {
+            'ids': np.array(ids, dtype=np.int64),
+            'difficulty': np.array(difficulty, dtype=np.float64),
+            'discrimination': np.array(discrimination, dtype=np.float64),
+        }
+
+    def invalidate(self, category_id):
+        """Drop a category pool (rebuilt on next use)"""
+        cache.delete(self._key(category_id))
+
+    def information(self, pool, ability):
+        """Fisher information of every question in a pool at an ability (2PL)"""
+        a = pool['discrimination']
+        probability = 1.0 / (1.0 + np.exp(-a * (ability - pool['difficulty'])))
+        return a ** 2 * probability * (1.0 - probability)
+
+    def select(self, category_id, ability, exclude_ids=()):
+        """
+        ID of a random question among the TOP_K unanswered ones most
+        informative at the ability (ties included). None if the category
+        is exhausted.
+        """
+        pool = self.get_pool(category_id)
+        if not len(pool['ids']):
+            return None
+
+        information = self.information(pool, ability)
+        if exclude_ids:
+            information[np.isin(pool['ids'], list(exclude_ids))] = -np.inf
+        remaining = np.flatnonzero(np.isfinite(information))
+        if not remaining.size:
+            return None
+
+        k = min(self.TOP_K, remaining.size)
+        threshold = np.partition(information[remaining], -k)[-k]
+        candidates = remaining[information[remaining] >= threshold]
+        return int(pool['ids'][random.choice(candidates)])
+
+
+question_pools = QuestionPoolIndex()
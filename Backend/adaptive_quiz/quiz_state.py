@@ -0,0 +1,81 @@
+# adaptive_quiz/quiz_state.py
+from django.conf import settings
+from django.core.cache import cache
+
+
+class QuizRuntimeState:
+    """
+    Compact per-quiz state kept in the cache between requests.
+
+    Holds the answered question IDs, a ring buffer of the most recent
+    results (bit i = result of the i-th latest answer) and the correct
+    option of the question last served, so the question/answer cycle does
+    not have to re-read attempts. On a cache miss the state is rebuilt
+    from the quiz's attempts with one query, and so is a cached state that
+    is behind the quiz row (answers taken by a worker with another cache).
+    """
+
+    KEY_PREFIX = 'quiz_state'
+    WINDOW = 5  # Answers kept in the recent-results ring buffer
+
+    __slots__ = (
+        'quiz_id', 'answered_ids', 'recent_bits', 'recent_count',
+        'served_question_id', 'served_correct_option_id'
+    )
+
+    def __init__(self, quiz_id, answered_ids=(), recent_bits=0, recent_count=0,
+                 served_question_id=None, served_correct_option_id=None):
+        self.quiz_id = quiz_id
+        self.answered_ids = list(answered_ids)
+        self.recent_bits = recent_bits
+        self.recent_count = recent_count
+        self.served_question_id = served_question_id
+        self.served_correct_option_id = served_correct_option_id
+
+    @classmethod
+    def _key(cls, quiz_id):
+        return f'{cls.KEY_PREFIX}:{quiz_id}'
+
+    @classmethod
+    def load(cls, quiz):
+        """Cached state for a quiz, rebuilt from its attempts on a miss or if stale"""
+        cached = cache.get(cls._key(quiz.id))
+        if cached is not None and len(cached[0]) == quiz.total_questions:
+            return cls(quiz.id, *cached)
+
+        state = cls(quiz.id)
+        for question_id, is_correct in quiz.attempts.order_by('answered_at').values_list('question_id', 'is_correct'):
+            state.record_answer(question_id, is_correct)
+        state.save()
+        return state
+
+    @classmethod
+    def delete(cls, quiz_id):
+        cache.delete(cls._key(quiz_id))
+
+    def save(self):
+        cache.set(self._key(self.quiz_id), (
+            tuple(self.answered_ids), self.recent_bits, self.recent_count,
+            self.served_question_id, self.served_correct_option_id
+        ), getattr(settings, 'QUIZ_STATE_CACHE_TIMEOUT', 60 * 60))
+
+    def has_answered(self, question_id):
+        return question_id in self.answered_ids
+
+    def record_answer(self, question_id, is_correct):
+        """Add an answer to the answered set and the recent-results ring buffer"""
+        if question_id not in self.answered_ids:
+            self.answered_ids.append(question_id)
+        self.recent_bits = ((self.recent_bits << 1) | int(bool(is_correct))) & ((1 << self.WINDOW) - 1)
+        self.recent_count = min(self.recent_count + 1, self.WINDOW)
+        if question_id == self.served_question_id:
+            self.served_question_id = self.served_correct_option_id = None
+
+    def recent_results(self):
+        """Correctness of the last WINDOW answers (most recent first)"""
+        return [bool(self.recent_bits >> i & 1) for i in range(self.recent_count)]
+
+    def serve(self, question_id, correct_option_id):
+        """Remember the correct option of the question being served"""
+        self.served_question_id = question_id
+        self.served_correct_option_id = correct_option_id
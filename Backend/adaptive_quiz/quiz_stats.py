@@ -0,0 +1,98 @@
+# adaptive_quiz/quiz_stats.py
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import AdaptiveQuiz, QuizCategoryStats, UserQuizStats
+
+
+def _bump(model, lookup, **deltas):
+    """Add deltas to a stats row in one UPDATE, creating the row on first use"""
+    changes = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(updated_at=timezone.now(), **changes):
+        return
+    if any(delta < 0 for delta in deltas.values()):
+        # Nothing to take away from (the row went with its user or category)
+        return
+    # Insert an empty row, unless a concurrent request just did, then add to it
+    model.objects.bulk_create([model(**lookup)], ignore_conflicts=True)
+    model.objects.filter(**lookup).update(updated_at=timezone.now(), **changes)
+
+
+def _record(quiz, **deltas):
+    _bump(QuizCategoryStats, {'category_id': quiz.category_id}, **deltas)
+    _bump(UserQuizStats, {'user_id': quiz.user_id, 'category_id': quiz.category_id}, **deltas)
+
+
+def record_quiz_started(quiz):
+    """Count a newly created quiz"""
+    _record(quiz, quizzes_started=1)
+
+
+def record_quiz_completed(quiz):
+    """Fold a just-completed quiz into its category's and user's totals"""
+    _record(
+        quiz,
+        quizzes_completed=1,
+        score_sum=quiz.total_score,
+        correct_answers_sum=quiz.correct_answers
+    )
+
+
+def record_quiz_deleted(quiz):
+    """Take a deleted quiz back out of the totals"""
+    deltas = {'quizzes_started': -1}
+    if quiz.is_completed:
+        deltas.update(
+            quizzes_completed=-1,
+            score_sum=-quiz.total_score,
+            correct_answers_sum=-quiz.correct_answers
+        )
+    _record(quiz, **deltas)
+
+
+def user_totals(user_id):
+    """(completed quizzes, average score) across a user's categories"""
+    totals = UserQuizStats.objects.filter(user_id=user_id).aggregate(
+        completed=Sum('quizzes_completed'), score_sum=Sum('score_sum')
+    )
+    completed = totals['completed'] or 0
+    average = totals['score_sum'] / completed if completed else 0
+    return completed, round(average, 2)
+
+
+def rebuild_quiz_stats(batch_size=1000):
+    """
+    Recompute every stats row from the quizzes table, for the initial load
+    or to repair drift. Returns (category rows, user rows) written.
+    """
+    completed = Q(is_completed=True)
+    rows = AdaptiveQuiz.objects.order_by().values('user_id', 'category_id').annotate(
+        started=Count('id'),
+        completed=Count('id', filter=completed),
+        score_sum=Sum('total_score', filter=completed),
+        correct_answers_sum=Sum('correct_answers', filter=completed)
+    )
+
+    user_rows, category_rows = [], {}
+    for row in rows.iterator(chunk_size=2000):
+        counters = {
+            'quizzes_started': row['started'],
+            'quizzes_completed': row['completed'],
+            'score_sum': row['score_sum'] or 0,
+            'correct_answers_sum': row['correct_answers_sum'] or 0
+        }
+        user_rows.append(UserQuizStats(user_id=row['user_id'], category_id=row['category_id'], **counters))
+        category = category_rows.setdefault(
+            row['category_id'], QuizCategoryStats(category_id=row['category_id'])
+        )
+        for field, value in counters.items():
+            setattr(category, field, getattr(category, field) + value)
+
+    with transaction.atomic():
+        UserQuizStats.objects.all().delete()
+        QuizCategoryStats.objects.all().delete()
+        QuizCategoryStats.objects.bulk_create(category_rows.values(), batch_size=batch_size)
+        UserQuizStats.objects.bulk_create(user_rows, batch_size=batch_size)
+
+    return len(category_rows), len(user_rows)
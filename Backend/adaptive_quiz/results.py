@@ -0,0 +1,87 @@
+# adaptive_quiz/results.py
+from collections import Counter
+
+from django.db.models import Count, Q
+
+from .serializers import (
+    AdaptiveQuizSerializer, QuestionDetailSerializer,
+    QuizAttemptSerializer, QuestionOptionReviewSerializer
+)
+
+DIFFICULTY_ORDER = ['easy', 'medium', 'hard', 'expert']
+
+
+def build_result_snapshot(quiz):
+    """
+    Compute everything the results, review and learning_resources endpoints
+    show for a completed quiz: one aggregate query for difficulty stats and
+    one attempts query (plus an options prefetch) for the rest.
+    """
+    # Performance by difficulty
+    rows = quiz.attempts.values('question__difficulty').annotate(
+        total=Count('id'),
+        correct=Count('id', filter=Q(is_correct=True))
+    )
+    by_difficulty = {row['question__difficulty']: row for row in rows}
+    difficulty_stats = {}
+    for difficulty in DIFFICULTY_ORDER:
+        row = by_difficulty.get(difficulty)
+        if row and row['total']:
+            difficulty_stats[difficulty] = {
+                'total': row['total'],
+                'correct': row['correct'],
+                'accuracy': round((row['correct'] / row['total']) * 100, 2)
+            }
+
+    attempts = quiz.attempts.select_related(
+        'question__category', 'selected_option'
+    ).prefetch_related('question__options')
+
+    review = []
+    weak_topics = Counter()
+    strong_topics = Counter()
+    for attempt in attempts:
+        question = attempt.question
+        correct_option = next((option for option in question.options.all() if option.is_correct), None)
+
+        review.append({
+            'question': QuestionDetailSerializer(question).data,
+            'attempt': QuizAttemptSerializer(attempt).data,
+            'correct_option': QuestionOptionReviewSerializer(correct_option).data if correct_option else None
+        })
+
+        # Topics from incorrect / correct answers
+        if question.skill_tags:
+            (strong_topics if attempt.is_correct else weak_topics).update(question.skill_tags)
+
+    quiz.attempts_count = len(review)
+    return {
+        'quiz': AdaptiveQuizSerializer(quiz).data,
+        'difficulty_stats': difficulty_stats,
+        'performance_summary': {
+            'accuracy': quiz.calculate_accuracy(),
+            'score_percentage': quiz.calculate_score_percentage(),
+            'total_time': quiz.time_taken,
+            'average_time_per_question': round(
+                quiz.time_taken / quiz.total_questions if quiz.total_questions > 0 else 0, 2
+            )
+        },
+        'review': review,
+        'weak_topics': weak_topics.most_common(),
+        'strong_topics': strong_topics.most_common()
+    }
+
+
+def get_result_snapshot(quiz):
+    """Stored snapshot of a completed quiz (built and stored if missing)"""
+    if quiz.result_snapshot is None:
+        quiz.result_snapshot = build_result_snapshot(quiz)
+        type(quiz).objects.filter(pk=quiz.pk).update(result_snapshot=quiz.result_snapshot)
+    return quiz.result_snapshot
+
+
+def quiz_detail(snapshot):
+    """AdaptiveQuizDetailSerializer-shaped quiz data from a snapshot"""
+    detail = {key: value for key, value in snapshot['quiz'].items() if key != 'attempts_count'}
+    detail['attempts'] = [item['attempt'] for item in snapshot['review']]
+    return detail
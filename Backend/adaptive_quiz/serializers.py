@@ -64,7 +64,9 @@ class QuizCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_question_count(self, obj):
-        """Get count of active questions in this category"""
+        """Get count of active questions in this category (annotated by the viewset)"""
+        if hasattr(obj, 'question_count'):
+            return obj.question_count
         return obj.questions.filter(is_active=True).count()
 
 
@@ -116,7 +118,9 @@ class AdaptiveQuizSerializer(serializers.ModelSerializer):
         return obj.calculate_score_percentage()
     
     def get_attempts_count(self, obj):
-        """Get count of question attempts"""
+        """Get count of question attempts (annotated by the list queryset)"""
+        if hasattr(obj, 'attempts_count'):
+            return obj.attempts_count
         return obj.attempts.count()
 
 
@@ -216,17 +220,17 @@ class SubmitAnswerSerializer(serializers.Serializer):
     time_taken = serializers.IntegerField(required=True, min_value=0)
     
     def validate_question_id(self, value):
-        """Validate that question exists"""
+        """Validate that question exists (kept as self.question)"""
         try:
-            Question.objects.get(id=value, is_active=True)
+            self.question = Question.objects.get(id=value, is_active=True)
             return value
         except Question.DoesNotExist:
             raise serializers.ValidationError("Question not found or inactive.")
     
     def validate_selected_option_id(self, value):
-        """Validate that option exists"""
+        """Validate that option exists (kept as self.selected_option)"""
         try:
-            QuestionOption.objects.get(id=value)
+            self.selected_option = QuestionOption.objects.get(id=value)
             return value
         except QuestionOption.DoesNotExist:
             raise serializers.ValidationError("Option not found.")
@@ -1,11 +1,45 @@
 # adaptive_quiz/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserSkillProfile
+from .models import UserSkillProfile, Question, AdaptiveQuiz
+from .question_pool import question_pools
+from .quiz_stats import record_quiz_deleted
 
 @receiver(post_save, sender=User)
 def create_skill_profile(sender, instance, created, **kwargs):
     """Create skill profile when new user is created"""
     if created:
-        UserSkillProfile.objects.create(user=instance)
\ No newline at end of file
+        UserSkillProfile.objects.create(user=instance)
+
+
+@receiver(post_init, sender=Question)
+def remember_question_category(sender, instance, **kwargs):
+    """Category the question was loaded with, to invalidate it after a move"""
+    instance._loaded_category_id = instance.__dict__.get('category_id')
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_pool(sender, instance, **kwargs):
+    """
+    Rebuild the pools of the question's category (and the one it moved
+    from) now and again on commit, dropping any pool a concurrent request
+    built from the data before the write committed
+    """
+    category_ids = {instance.category_id, getattr(instance, '_loaded_category_id', None)} - {None}
+    instance._loaded_category_id = instance.category_id
+
+    def invalidate():
+        for category_id in category_ids:
+            question_pools.invalidate(category_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=AdaptiveQuiz)
+def remove_quiz_from_stats(sender, instance, **kwargs):
+    """Keep the category and user quiz stats in step with deletes"""
+    record_quiz_deleted(instance)
@@ -0,0 +1,598 @@
+# adaptive_quiz/tests.py
+import json
+import os
+import tempfile
+from collections import Counter
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from utils.irt_calibration import IRTCalibrator
+from .models import (
+    QuizCategory, Question, QuestionOption, AdaptiveQuiz, QuizAttempt, UserSkillProfile,
+    QuizCategoryStats, UserQuizStats, ItemCalibrationRun
+)
+from .question_pool import question_pools
+from .quiz_state import QuizRuntimeState
+from .quiz_stats import rebuild_quiz_stats
+from .serializers import (
+    AdaptiveQuizSerializer, AdaptiveQuizDetailSerializer, QuestionDetailSerializer,
+    QuizAttemptSerializer, QuestionOptionReviewSerializer
+)
+
+
+class QuizAPITestCase(TestCase):
+    """A category of tagged questions and a started quiz for the test user"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = QuizCategory.objects.create(name='Python Programming', description='Python')
+        for i in range(40):
+            question = Question.objects.create(
+                category=cls.category,
+                question_text=f'Question {i}',
+                difficulty=['easy', 'medium', 'hard', 'expert'][i % 4],
+                skill_tags=['python', f'topic_{i % 3}']
+            )
+            QuestionOption.objects.create(question=question, option_text='Right', is_correct=True, order=0)
+            QuestionOption.objects.create(question=question, option_text='Wrong', order=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/adaptive-quiz/quizzes/start/', {'category_id': self.category.id}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.quiz_id = response.json()['quiz']['id']
+
+    def _get_question(self):
+        return self.client.get(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/get_question/')
+
+    def _submit(self, question, option_index):
+        return self.client.post(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/submit_answer/', {
+            'question_id': question['id'],
+            'selected_option_id': question['options'][option_index]['id'],
+            'time_taken': 5
+        }, format='json')
+
+
+class QuizAnswerCycleQueryCountTest(QuizAPITestCase):
+    """get_question and submit_answer run a fixed number of queries per step"""
+
+    # Test user, quiz, chosen question, its options
+    GET_QUESTION_QUERIES = 4
+    # Test user, quiz, question and option validation, attempt insert
+    # (+ savepoint and release), quiz update, locked skill profile read and
+    # write (+ savepoint and release), attempts count; savepoints only occur
+    # inside the test transaction
+    SUBMIT_ANSWER_QUERIES = 13
+
+    def test_answer_cycle_query_counts(self):
+        seen = set()
+        for step in range(10):
+            with self.assertNumQueries(self.GET_QUESTION_QUERIES):
+                question = self._get_question().json()
+            self.assertNotIn(question['id'], seen)
+            seen.add(question['id'])
+
+            with self.assertNumQueries(self.SUBMIT_ANSWER_QUERIES):
+                response = self._submit(question, step % 2)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['is_correct'], step % 2 == 0)
+            self.assertEqual(response.json()['correct_option_id'], question['options'][0]['id'])
+
+        response = self._get_question().json()
+        self.assertTrue(response['quiz_complete'])
+
+    def test_state_rebuilt_after_cache_loss(self):
+        question = self._get_question().json()
+        self._submit(question, 0)
+        cache.clear()
+
+        state = QuizRuntimeState.load(QuizAttempt.objects.get().quiz)
+        self.assertEqual(state.answered_ids, [question['id']])
+        self.assertEqual(state.recent_results(), [True])
+
+        response = self._submit(question, 0)
+        self.assertEqual(response.status_code, 400)
+
+    def test_stale_cached_state_is_rebuilt(self):
+        # Another worker's cache: it saw the quiz before this answer was taken
+        question = self._get_question().json()
+        stale = cache.get(QuizRuntimeState._key(self.quiz_id))
+        self._submit(question, 0)
+        cache.set(QuizRuntimeState._key(self.quiz_id), stale)
+
+        for _ in range(5):
+            self.assertNotEqual(self._get_question().json()['id'], question['id'])
+        cache.set(QuizRuntimeState._key(self.quiz_id), stale)
+        response = self._submit(question, 0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(QuizAttempt.objects.filter(question_id=question['id']).count(), 1)
+
+    def test_database_rejects_repeated_answers(self):
+        # An attempt the quiz row and cached state don't know of yet (a concurrent submit)
+        question = self._get_question().json()
+        QuizAttempt.objects.create(
+            quiz_id=self.quiz_id, question_id=question['id'], selected_option_id=question['options'][0]['id'],
+            is_correct=True, time_taken=5
+        )
+
+        response = self._submit(question, 0)
+        self.assertEqual(response.status_code, 400)
+        quiz = AdaptiveQuiz.objects.get(id=self.quiz_id)
+        self.assertEqual((quiz.total_questions, quiz.total_score), (0, 0))
+
+    def test_recent_results_ring_buffer(self):
+        state = QuizRuntimeState(self.quiz_id)
+        for i, is_correct in enumerate([True, False, True, True, False, False, True]):
+            state.record_answer(i, is_correct)
+
+        self.assertEqual(state.recent_results(), [True, False, False, True, True])
+        self.assertEqual(len(state.answered_ids), 7)
+
+
+class QuestionPoolTest(QuizAPITestCase):
+    """Category pools follow question writes and recover from writes that skip signals"""
+
+    def pool_ids(self):
+        return question_pools.get_pool(self.category.id)['ids'].tolist()
+
+    def test_signals_invalidate_the_pool(self):
+        ids = self.pool_ids()
+        self.assertEqual(len(ids), 40)
+
+        question = Question.objects.create(category=self.category, question_text='New', difficulty='hard')
+        self.assertIn(question.id, self.pool_ids())
+
+        question.irt_difficulty, question.irt_discrimination = 2.5, 1.8
+        question.save()
+        pool = question_pools.get_pool(self.category.id)
+        index = pool['ids'].tolist().index(question.id)
+        self.assertEqual((pool['difficulty'][index], pool['discrimination'][index]), (2.5, 1.8))
+
+        question.is_active = False
+        question.save()
+        self.assertNotIn(question.id, self.pool_ids())
+
+        removed = Question.objects.get(id=ids[0])
+        removed.delete()
+        self.assertEqual(self.pool_ids(), ids[1:])
+
+    def test_pool_built_before_commit_is_dropped_on_commit(self):
+        stale = question_pools.get_pool(self.category.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            question = Question.objects.create(category=self.category, question_text='New', difficulty='hard')
+            # A concurrent request rebuilt the pool from the data before this write committed
+            cache.set(question_pools._key(self.category.id), stale)
+        self.assertIn(question.id, self.pool_ids())
+
+    def test_moving_a_question_invalidates_both_categories(self):
+        other = QuizCategory.objects.create(name='Go', description='Go')
+        self.assertEqual(question_pools.get_pool(other.id)['ids'].tolist(), [])
+        question = Question.objects.get(id=self.pool_ids()[0])
+
+        question.category = other
+        question.save()
+        self.assertNotIn(question.id, self.pool_ids())
+        self.assertEqual(question_pools.get_pool(other.id)['ids'].tolist(), [question.id])
+
+    def test_stale_pool_is_rebuilt_and_retried(self):
+        self.pool_ids()
+        # One expert question stays active; bulk updates send no signals, so the
+        # cached pool still serves the deactivated easy questions first
+        survivor = Question.objects.filter(category=self.category, difficulty='expert').order_by('id').first()
+        Question.objects.filter(category=self.category).exclude(id=survivor.id).update(is_active=False)
+        self.assertEqual(len(self.pool_ids()), 40)
+
+        question = self._get_question().json()
+        self.assertEqual(question['id'], survivor.id)
+        self.assertEqual(self.pool_ids(), [survivor.id])
+
+        self._submit(question, 0)
+        response = self._get_question().json()
+        self.assertTrue(response['quiz_complete'])
+
+
+class SkillProfileRecomputeTest(QuizAPITestCase):
+    """Bulk recompute from attempts matches the per-answer updates"""
+
+    def test_recompute_matches_incremental_updates(self):
+        for step in range(6):
+            question = self._get_question().json()
+            self._submit(question, step % 2)
+        self.client.post(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/complete/')
+
+        profile = UserSkillProfile.objects.get(user__username='test_quiz_user')
+        incremental = (profile.skill_data, profile.total_quizzes_taken, profile.average_score)
+
+        UserSkillProfile.objects.filter(pk=profile.pk).update(skill_data={}, total_quizzes_taken=0)
+        self.assertEqual(UserSkillProfile.recompute_from_attempts(), 1)
+
+        profile.refresh_from_db()
+        self.assertEqual((profile.skill_data, profile.total_quizzes_taken, profile.average_score), incremental)
+        self.assertEqual(profile.skill_data['python']['attempts'], 6)
+
+    def test_profiles_without_attempts_are_reset(self):
+        other = User.objects.create_user(username='other', password='pass')
+        UserSkillProfile.objects.filter(user=other).update(
+            skill_data={'go': {'level': 'expert', 'attempts': 3}}, total_quizzes_taken=2, average_score=80
+        )
+
+        self.assertEqual(UserSkillProfile.recompute_from_attempts(), 2)
+        profile = UserSkillProfile.objects.get(user=other)
+        self.assertEqual((profile.skill_data, profile.total_quizzes_taken, profile.average_score), ({}, 0, 0))
+
+    def test_user_ids_are_processed_in_batches(self):
+        question = self._get_question().json()
+        self._submit(question, 0)
+        user_id = User.objects.get(username='test_quiz_user').id
+
+        # More IDs than SQLite binds in one statement, a few at a time
+        user_ids = list(range(user_id + 1, user_id + 40000)) + [user_id]
+        self.assertEqual(UserSkillProfile.recompute_from_attempts(user_ids, batch_size=5000), 1)
+        self.assertEqual(UserSkillProfile.objects.get(user_id=user_id).skill_data['python']['attempts'], 1)
+
+
+class QuizStatsTest(QuizAPITestCase):
+    """Category and user stats rows follow start, complete and delete"""
+
+    def _complete(self, correct):
+        for step in range(3):
+            self._submit(self._get_question().json(), 0 if step < correct else 1)
+        return self.client.post(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/complete/')
+
+    def _counters(self):
+        return [
+            (row.quizzes_started, row.quizzes_completed, row.score_sum, row.correct_answers_sum)
+            for row in [QuizCategoryStats.objects.get(), UserQuizStats.objects.get()]
+        ]
+
+    def test_stats_follow_quiz_lifecycle(self):
+        self.assertEqual(self._complete(correct=2).status_code, 200)
+        response = self.client.post(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/complete/')
+        self.assertEqual(response.status_code, 400)
+        self.client.post('/api/adaptive-quiz/quizzes/start/', {'category_id': self.category.id}, format='json')
+        self.assertEqual(self._counters(), [(2, 1, 20, 2)] * 2)
+
+        stats = self.client.get(f'/api/adaptive-quiz/categories/{self.category.id}/stats/').json()
+        self.assertEqual((stats['total_questions'], stats['total_quizzes'], stats['average_score']), (40, 2, 20))
+
+        progress = self.client.get('/api/adaptive-quiz/skill-profiles/progress/').json()['statistics']
+        self.assertEqual((progress['total_quizzes_completed'], progress['quizzes_in_progress']), (1, 1))
+        self.assertEqual(progress['category_breakdown'], [
+            {'category__name': 'Python Programming', 'count': 1, 'avg_score': 20.0, 'avg_accuracy': 2.0}
+        ])
+        profile = UserSkillProfile.objects.get(user__username='test_quiz_user')
+        self.assertEqual((profile.total_quizzes_taken, profile.average_score), (1, 20))
+
+        AdaptiveQuiz.objects.get(pk=self.quiz_id).delete()
+        self.assertEqual(self._counters(), [(1, 0, 0, 0)] * 2)
+
+    def test_quizzes_are_not_written_around_the_stats(self):
+        url = f'/api/adaptive-quiz/quizzes/{self.quiz_id}/'
+        self.assertEqual(self.client.post('/api/adaptive-quiz/quizzes/', {'category': self.category.id}).status_code, 405)
+        self.assertEqual(self.client.patch(url, {'is_completed': True, 'total_score': 50}).status_code, 405)
+        self.assertEqual(self.client.put(url, {'category': self.category.id}).status_code, 405)
+        self.assertEqual(self._counters(), [(1, 0, 0, 0)] * 2)
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self._counters(), [(0, 0, 0, 0)] * 2)
+
+    def test_rebuild_matches_incremental_updates(self):
+        self._complete(correct=3)
+        incremental = self._counters()
+
+        QuizCategoryStats.objects.update(quizzes_started=0, score_sum=0)
+        UserQuizStats.objects.all().delete()
+        self.assertEqual(rebuild_quiz_stats(), (1, 1))
+        self.assertEqual(self._counters(), incremental)
+
+
+class ResultSnapshotTest(QuizAPITestCase):
+    """The stored result snapshot matches the results computed from the attempts"""
+
+    def setUp(self):
+        super().setUp()
+        for step in range(8):
+            self._submit(self._get_question().json(), 0 if step % 3 else 1)
+        self.client.post(f'/api/adaptive-quiz/quizzes/{self.quiz_id}/complete/')
+
+    def _rendered(self, data):
+        return json.loads(JSONRenderer().render(data))
+
+    def _computed(self):
+        """results / review / topic data as computed per request from the attempts"""
+        quiz = AdaptiveQuiz.objects.get(pk=self.quiz_id)
+        attempts = quiz.attempts.select_related('question', 'selected_option')
+
+        difficulty_stats = {}
+        for difficulty in ['easy', 'medium', 'hard', 'expert']:
+            difficulty_attempts = attempts.filter(question__difficulty=difficulty)
+            if difficulty_attempts.exists():
+                correct = difficulty_attempts.filter(is_correct=True).count()
+                difficulty_stats[difficulty] = {
+                    'total': difficulty_attempts.count(),
+                    'correct': correct,
+                    'accuracy': round(correct / difficulty_attempts.count() * 100, 2)
+                }
+
+        review = []
+        weak_topics, strong_topics = [], []
+        for attempt in attempts:
+            correct_option = attempt.question.options.filter(is_correct=True).first()
+            review.append({
+                'question': QuestionDetailSerializer(attempt.question).data,
+                'attempt': QuizAttemptSerializer(attempt).data,
+                'correct_option': QuestionOptionReviewSerializer(correct_option).data if correct_option else None
+            })
+            (strong_topics if attempt.is_correct else weak_topics).extend(attempt.question.skill_tags)
+
+        return self._rendered({
+            'results': {
+                'quiz': AdaptiveQuizDetailSerializer(quiz).data,
+                'difficulty_stats': difficulty_stats,
+                'performance_summary': {
+                    'accuracy': quiz.calculate_accuracy(),
+                    'score_percentage': quiz.calculate_score_percentage(),
+                    'total_time': quiz.time_taken,
+                    'average_time_per_question': round(quiz.time_taken / quiz.total_questions, 2)
+                }
+            },
+            'review': {'quiz': AdaptiveQuizSerializer(quiz).data, 'review': review},
+            'weak_areas': Counter(weak_topics).most_common(5),
+            'strong_areas': Counter(strong_topics).most_common(3)
+        })
+
+    def _served(self):
+        url = f'/api/adaptive-quiz/quizzes/{self.quiz_id}'
+        resources = self.client.get(f'{url}/learning_resources/').json()
+        return {
+            'results': self.client.get(f'{url}/results/').json(),
+            'review': self.client.get(f'{url}/review/').json(),
+            'weak_areas': resources['performance_summary']['weak_areas'],
+            'strong_areas': resources['performance_summary']['strong_areas']
+        }
+
+    def test_snapshot_matches_computed_results(self):
+        self.assertIsNotNone(AdaptiveQuiz.objects.get(pk=self.quiz_id).result_snapshot)
+        computed = self._computed()
+
+        self.assertEqual(self._served(), computed)
+        self.assertEqual(len(computed['review']['review']), 8)
+        self.assertEqual(sum(stats['total'] for stats in computed['results']['difficulty_stats'].values()), 8)
+        self.assertTrue(computed['weak_areas'] and computed['strong_areas'])
+
+    def test_missing_snapshot_is_built_on_first_view(self):
+        # Quizzes completed before snapshots were stored
+        AdaptiveQuiz.objects.filter(pk=self.quiz_id).update(result_snapshot=None)
+
+        self.assertEqual(self._served(), self._computed())
+        self.assertIsNotNone(AdaptiveQuiz.objects.get(pk=self.quiz_id).result_snapshot)
+
+
+class ImportQuestionsCommandTest(TestCase):
+    """import_questions upserts by external_id in bulk"""
+
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as fp:
+            fp.write(content)
+        return path
+
+    def _import(self, path, **options):
+        out = StringIO()
+        call_command('import_questions', path, batch_size=2, stdout=out, **options)
+        return out.getvalue()
+
+    def _records(self, count, text='Question'):
+        return [{
+            'external_id': f'vendor-{i}',
+            'category': 'Imported',
+            'question_text': f'{text} {i}',
+            'difficulty': ['easy', 'medium', 'hard'][i % 3],
+            'skill_tags': ['python'],
+            'options': [
+                {'text': 'Right', 'is_correct': True, 'explanation': 'Because'},
+                {'text': 'Wrong'}
+            ]
+        } for i in range(count)]
+
+    def test_json_import_is_idempotent(self):
+        records = self._records(5) + [{'external_id': 'broken', 'category': 'Imported', 'options': []}]
+        path = self._write('bank.json', json.dumps(records, indent=2))
+
+        output = self._import(path)
+        self.assertIn('5 created', output)
+        self.assertIn('1 invalid', output)
+        self.assertIn('rows/sec', output)
+        self.assertEqual(Question.objects.filter(external_id__startswith='vendor-').count(), 5)
+        self.assertEqual(QuestionOption.objects.count(), 10)
+
+        output = self._import(path)
+        self.assertIn('0 created, 0 updated, 5 unchanged', output)
+        self.assertEqual(QuestionOption.objects.count(), 10)
+
+    def test_update_in_place_invalidates_pool(self):
+        path = self._write('bank.jsonl', '\n'.join(json.dumps(record) for record in self._records(3)))
+        self._import(path)
+        category = QuizCategory.objects.get(name='Imported')
+        question_pools.get_pool(category.id)
+
+        records = self._records(4, text='Revised')
+        records[0]['options'] = records[0]['options'][:1] + [{'text': 'Other'}, {'text': 'Third'}]
+        path = self._write('bank.jsonl', '\n'.join(json.dumps(record) for record in records))
+        output = self._import(path)
+
+        self.assertIn('1 created, 3 updated', output)
+        self.assertEqual(Question.objects.get(external_id='vendor-0').question_text, 'Revised 0')
+        self.assertEqual(QuestionOption.objects.filter(question__external_id='vendor-0').count(), 3)
+        pool = question_pools.get_pool(category.id)
+        self.assertEqual(len(pool['ids']), 4)
+
+    def test_csv_import(self):
+        path = self._write('bank.csv', (
+            'external_id,category,question_text,difficulty,skill_tags,option_1,option_2,option_3,correct_option\n'
+            'csv-1,Imported,What is 2 + 2?,easy,math;basics,3,4,5,2\n'
+            'csv-2,Imported,Pick a prime,medium,math,4,6,7,3\n'
+            'csv-3,Imported,No answer,easy,,a,b,,\n'
+        ))
+        output = self._import(path)
+
+        self.assertIn('2 created', output)
+        self.assertIn('bank.csv:4: no correct option', output)
+        question = Question.objects.get(external_id='csv-1')
+        self.assertEqual(question.skill_tags, ['math', 'basics'])
+        self.assertEqual(question.options.get(is_correct=True).option_text, '4')
+
+
+def _simulate_responses(rng, abilities, difficulty, discrimination, observed=1.0):
+    """(person index, item index, correct) of 2PL responses, each cell kept with probability `observed`"""
+    persons, items = np.nonzero(rng.random((len(abilities), len(difficulty))) < observed)
+    p = 1 / (1 + np.exp(-discrimination[items] * (abilities[persons] - difficulty[items])))
+    return persons, items, rng.random(len(p)) < p
+
+
+class IRTCalibratorTest(SimpleTestCase):
+    """Item parameters are recovered from synthetic 2PL responses"""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(42)
+        self.difficulty = np.linspace(-2, 2, 20)
+        self.discrimination = np.tile([0.7, 1.0, 1.4, 1.9], 5)
+
+    def fit(self, persons, items, correct, n_persons, **priors):
+        calibrator = IRTCalibrator()
+        n_items = len(self.difficulty)
+        responses = calibrator.response_matrix(persons, items, correct, n_persons, n_items)
+        return calibrator.fit(
+            responses,
+            priors.get('difficulty', np.zeros(n_items)), priors.get('difficulty_sd', np.ones(n_items)),
+            priors.get('discrimination', np.ones(n_items)), priors.get('log_discrimination_sd', np.full(n_items, 0.5)),
+            standardize=priors.get('standardize', True)
+        )
+
+    def test_parameter_recovery(self):
+        abilities = self.rng.standard_normal(3000)
+        # Sparse: each person answers about 40% of the items
+        persons, items, correct = _simulate_responses(self.rng, abilities, self.difficulty, self.discrimination, 0.4)
+        result = self.fit(persons, items, correct, 3000)
+
+        self.assertTrue(result['converged'])
+        self.assertLess(np.sqrt(np.mean((result['difficulty'] - self.difficulty) ** 2)), 0.15)
+        self.assertLess(np.sqrt(np.mean((np.log(result['discrimination'] / self.discrimination)) ** 2)), 0.15)
+        self.assertGreater(np.corrcoef(result['ability'], abilities)[0, 1], 0.75)
+        self.assertEqual(result['responses_per_item'].tolist(), np.bincount(items, minlength=20).tolist())
+        # Standard errors are posterior SDs, roughly matching the actual errors
+        errors = np.abs(result['difficulty'] - self.difficulty) / result['difficulty_se']
+        self.assertLess(np.mean(errors), 2)
+
+    def test_latest_response_wins(self):
+        responses = IRTCalibrator.response_matrix([0, 0, 1], [0, 0, 0], [True, False, True], 2, 1)
+        self.assertEqual(responses.toarray().tolist(), [[-1], [1]])
+
+    def test_incremental_fit_stays_near_a_confident_prior(self):
+        abilities = self.rng.standard_normal(50)
+        persons, items, correct = _simulate_responses(self.rng, abilities, self.difficulty, self.discrimination)
+        n_items = len(self.difficulty)
+        result = self.fit(
+            persons, items, correct, 50, difficulty=self.difficulty, difficulty_sd=np.full(n_items, 0.05),
+            discrimination=self.discrimination, log_discrimination_sd=np.full(n_items, 0.05), standardize=False
+        )
+        np.testing.assert_allclose(result['difficulty'], self.difficulty, atol=0.2)
+        np.testing.assert_allclose(result['discrimination'], self.discrimination, rtol=0.2)
+
+
+class CalibratedSelectionTest(TestCase):
+    """calibrate_items writes item parameters that the question pool then selects by"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = QuizCategory.objects.create(name='Calibrated', description='IRT')
+        # All labelled 'medium', but with spread-out true difficulties
+        self.true_difficulty = np.linspace(-2, 2, 8)
+        self.questions = [
+            Question.objects.create(category=self.category, question_text=f'Q{i}', difficulty='medium')
+            for i in range(8)
+        ]
+
+    def simulate_attempts(self, n_users=400, seed=3):
+        rng = np.random.default_rng(seed)
+        users = User.objects.bulk_create([User(username=f'examinee{seed}-{i}') for i in range(n_users)])
+        quizzes = AdaptiveQuiz.objects.bulk_create([AdaptiveQuiz(user=user, category=self.category) for user in users])
+        persons, items, correct = _simulate_responses(
+            rng, rng.standard_normal(n_users), self.true_difficulty, np.ones(8)
+        )
+        QuizAttempt.objects.bulk_create([
+            QuizAttempt(quiz=quizzes[person], question=self.questions[item], is_correct=bool(right), time_taken=5)
+            for person, item, right in zip(persons, items, correct)
+        ])
+
+    def test_calibration_drives_selection(self):
+        # Uncalibrated, every question has the label's parameters
+        pool = question_pools.get_pool(self.category.id)
+        self.assertEqual(pool['difficulty'].tolist(), [Question.DIFFICULTY_THETA['medium']] * 8)
+
+        self.simulate_attempts()
+        out = StringIO()
+        call_command('calibrate_items', stdout=out)
+        self.assertIn('Calibrated 8 questions', out.getvalue())
+
+        run = ItemCalibrationRun.objects.get()
+        self.assertEqual((run.mode, run.items_calibrated, run.users), ('full', 8, 400))
+        fitted = [question.irt_difficulty for question in Question.objects.order_by('id')]
+        self.assertEqual(np.argsort(fitted).tolist(), list(range(8)))
+        self.assertTrue(all(question.irt_response_count == 400 for question in Question.objects.all()))
+
+        # The pool was invalidated and now holds the calibrated parameters
+        pool = question_pools.get_pool(self.category.id)
+        self.assertEqual(pool['difficulty'].tolist(), fitted)
+
+        question_pools.TOP_K = 1
+        try:
+            hardest = question_pools.select(self.category.id, 3.0)
+            easiest = question_pools.select(self.category.id, -3.0)
+            next_easiest = question_pools.select(self.category.id, -3.0, exclude_ids=[easiest])
+        finally:
+            del question_pools.TOP_K
+        self.assertEqual(hardest, self.questions[-1].id)
+        self.assertEqual(easiest, self.questions[0].id)
+        self.assertEqual(next_easiest, self.questions[1].id)
+
+    def test_incremental_calibration(self):
+        self.simulate_attempts(200)
+        call_command('calibrate_items', stdout=StringIO())
+        first = list(Question.objects.order_by('id').values_list('irt_difficulty', flat=True))
+        out = StringIO()
+        call_command('calibrate_items', incremental=True, stdout=out)
+        self.assertIn('No new attempts to calibrate', out.getvalue())
+
+        self.simulate_attempts(200, seed=4)
+        call_command('calibrate_items', incremental=True, stdout=StringIO())
+        self.assertEqual(ItemCalibrationRun.objects.first().mode, 'incremental')
+        questions = Question.objects.order_by('id')
+        self.assertTrue(all(question.irt_response_count == 400 for question in questions))
+        fitted = [question.irt_difficulty for question in questions]
+        self.assertGreater(np.corrcoef(fitted, self.true_difficulty)[0, 1], 0.97)
+        self.assertNotEqual(fitted, first)
+
+    def test_selection_draws_among_the_most_informative(self):
+        pool = question_pools.get_pool(self.category.id)
+        self.assertEqual(len(pool['ids']), 8)
+        # All equally informative under label defaults: any unanswered question can be drawn
+        answered = [question.id for question in self.questions[:6]]
+        drawn = {question_pools.select(self.category.id, 0.0, exclude_ids=answered) for _ in range(50)}
+        self.assertEqual(drawn, {self.questions[6].id, self.questions[7].id})
+        self.assertIsNone(question_pools.select(self.category.id, 0.0, exclude_ids=[q.id for q in self.questions]))
@@ -1,23 +1,27 @@
 # adaptive_quiz/views.py
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.utils import timezone
-from django.db.models import Avg, Count, Q
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 from .models import (
-    QuizCategory, Question, QuestionOption,
-    AdaptiveQuiz, QuizAttempt, UserSkillProfile
+    QuizCategory, Question,
+    AdaptiveQuiz, QuizAttempt, UserSkillProfile, QuizCategoryStats, UserQuizStats
 )
 from .serializers import (
-    QuizCategorySerializer, QuestionSerializer, QuestionDetailSerializer,
+    QuizCategorySerializer, QuestionSerializer,
     AdaptiveQuizSerializer, AdaptiveQuizDetailSerializer,
     QuizAttemptSerializer, UserSkillProfileSerializer,
-    StartQuizSerializer, SubmitAnswerSerializer, CompleteQuizSerializer,
-    QuestionOptionReviewSerializer
+    StartQuizSerializer, SubmitAnswerSerializer, CompleteQuizSerializer
 )
+from .question_pool import question_pools
+from .quiz_state import QuizRuntimeState
+from .quiz_stats import record_quiz_started, record_quiz_completed, user_totals
+from .results import build_result_snapshot, get_result_snapshot, quiz_detail
 
 
 class QuizCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -25,7 +29,9 @@ class QuizCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ViewSet for viewing quiz categories.
     Read-only to prevent unauthorized category creation.
     """
-    queryset = QuizCategory.objects.all()
+    queryset = QuizCategory.objects.annotate(
+        question_count=Count('questions', filter=Q(questions__is_active=True))
+    ).order_by('name')
     serializer_class = QuizCategorySerializer
     authentication_classes = []
     permission_classes = [AllowAny]
@@ -34,7 +40,9 @@ class QuizCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     def questions(self, request, pk=None):
         """Get all active questions for a category"""
         category = self.get_object()
-        questions = category.questions.filter(is_active=True)
+        questions = category.questions.filter(is_active=True).select_related(
+            'category'
+        ).prefetch_related('options')
         serializer = QuestionSerializer(questions, many=True)
         return Response(serializer.data)
     
@@ -42,24 +50,23 @@ class QuizCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     def stats(self, request, pk=None):
         """Get statistics for a category"""
         category = self.get_object()
-        total_questions = category.questions.filter(is_active=True).count()
-        total_quizzes = AdaptiveQuiz.objects.filter(category=category).count()
-        avg_score = AdaptiveQuiz.objects.filter(
-            category=category, is_completed=True
-        ).aggregate(avg=Avg('total_score'))['avg'] or 0
+        stats = QuizCategoryStats.objects.filter(category=category).first() or QuizCategoryStats(category=category)
         
         return Response({
             'category_id': category.id,
             'category_name': category.name,
-            'total_questions': total_questions,
-            'total_quizzes': total_quizzes,
-            'average_score': round(avg_score, 2)
+            'total_questions': category.question_count,
+            'total_quizzes': stats.quizzes_started,
+            'average_score': round(stats.average_score, 2)
         })
 
 
-class AdaptiveQuizViewSet(viewsets.ModelViewSet):
+class AdaptiveQuizViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                          mixins.DestroyModelMixin, viewsets.GenericViewSet):
     """
     ViewSet for managing adaptive quizzes.
+    Quizzes are created and changed only through the start, submit_answer
+    and complete actions, which keep the quiz statistics in step.
     """
     serializer_class = AdaptiveQuizSerializer
     authentication_classes = []
@@ -68,7 +75,14 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Return quizzes for the authenticated user or test user"""
         user = self.request.user if self.request.user.is_authenticated else self._get_or_create_test_user()
-        return AdaptiveQuiz.objects.filter(user=user).order_by('-started_at')
+        queryset = AdaptiveQuiz.objects.filter(user=user).select_related('user', 'category').order_by('-started_at')
+        if self.action == 'list':
+            queryset = queryset.annotate(attempts_count=Count('attempts'))
+        elif self.action == 'retrieve':
+            queryset = queryset.prefetch_related(Prefetch(
+                'attempts', queryset=QuizAttempt.objects.select_related('question', 'selected_option')
+            ))
+        return queryset
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -105,8 +119,9 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         ).first()
         
         if incomplete_quiz:
-            # Return existing quiz with first question
-            first_question = self._get_next_question(incomplete_quiz)
+            # Return existing quiz with its next unanswered question
+            state = QuizRuntimeState.load(incomplete_quiz)
+            first_question = self._get_next_question(incomplete_quiz, exclude_ids=state.answered_ids, state=state)
             return Response({
                 'message': 'Continuing incomplete quiz',
                 'quiz': AdaptiveQuizSerializer(incomplete_quiz).data,
@@ -114,14 +129,16 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_200_OK)
         
         # Create new quiz
-        quiz = AdaptiveQuiz.objects.create(
-            user=user,
-            category=category,
-            current_difficulty='easy'
-        )
+        with transaction.atomic():
+            quiz = AdaptiveQuiz.objects.create(
+                user=user,
+                category=category,
+                current_difficulty='easy'
+            )
+            record_quiz_started(quiz)
         
         # Get first question
-        first_question = self._get_next_question(quiz)
+        first_question = self._get_next_question(quiz, state=QuizRuntimeState(quiz.id))
         
         return Response({
             'quiz': AdaptiveQuizSerializer(quiz).data,
@@ -144,8 +161,9 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         REQUIRED_QUESTIONS = 10
         questions_answered = quiz.total_questions
         
-        # Get list of already answered question IDs
-        answered_question_ids = list(quiz.attempts.values_list('question_id', flat=True).distinct())
+        # Get list of already answered question IDs (cached runtime state)
+        state = QuizRuntimeState.load(quiz)
+        answered_question_ids = state.answered_ids
         
         # Check if we've reached exactly 10 questions
         if questions_answered >= REQUIRED_QUESTIONS:
@@ -158,7 +176,7 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_200_OK)
         
         # Get next unique question (no repetition)
-        next_question = self._get_next_question(quiz, exclude_ids=answered_question_ids)
+        next_question = self._get_next_question(quiz, exclude_ids=answered_question_ids, state=state)
         
         if not next_question:
             # No more unique questions available but haven't reached 10
@@ -190,18 +208,20 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         selected_option_id = serializer.validated_data['selected_option_id']
         time_taken = serializer.validated_data['time_taken']
         
-        question = get_object_or_404(Question, id=question_id, is_active=True)
-        selected_option = get_object_or_404(QuestionOption, id=selected_option_id)
+        # Fetched during validation
+        question = serializer.question
+        selected_option = serializer.selected_option
         
         # Check if already answered (no repetition allowed)
-        if quiz.attempts.filter(question=question).exists():
+        state = QuizRuntimeState.load(quiz)
+        if state.has_answered(question.id):
             return Response(
                 {'error': 'This question has already been answered. No repetitions allowed.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         # Check if option belongs to question
-        if selected_option.question != question:
+        if selected_option.question_id != question.id:
             return Response(
                 {'error': 'Selected option does not belong to this question.'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -211,15 +231,22 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         is_correct = selected_option.is_correct
         points_earned = question.points if is_correct else 0
         
-        # Create attempt
-        attempt = QuizAttempt.objects.create(
-            quiz=quiz,
-            question=question,
-            selected_option=selected_option,
-            is_correct=is_correct,
-            points_earned=points_earned,
-            time_taken=time_taken
-        )
+        # Create attempt (the unique quiz/question constraint settles concurrent repeats)
+        try:
+            with transaction.atomic():
+                attempt = QuizAttempt.objects.create(
+                    quiz=quiz,
+                    question=question,
+                    selected_option=selected_option,
+                    is_correct=is_correct,
+                    points_earned=points_earned,
+                    time_taken=time_taken
+                )
+        except IntegrityError:
+            return Response(
+                {'error': 'This question has already been answered. No repetitions allowed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Update quiz statistics
         quiz.total_score += points_earned
@@ -230,19 +257,30 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         
         # Update difficulty based on performance
         quiz.current_difficulty = self._update_difficulty(quiz)
-        quiz.save()
+        quiz.save(update_fields=[
+            'total_score', 'max_possible_score', 'total_questions',
+            'correct_answers', 'time_taken', 'current_difficulty'
+        ])
         
         # Update user skill profile
         self._update_skill_profile(quiz, question, is_correct)
         
-        # Get correct answer for response
-        correct_option = question.options.filter(is_correct=True).first()
+        # Get correct answer for response (known if the question was served from this quiz's state)
+        if is_correct:
+            correct_option_id = selected_option.id
+        elif state.served_question_id == question.id:
+            correct_option_id = state.served_correct_option_id
+        else:
+            correct_option_id = question.options.filter(is_correct=True).values_list('id', flat=True).first()
+        
+        state.record_answer(question.id, is_correct)
+        state.save()
         
         return Response({
             'attempt': QuizAttemptSerializer(attempt).data,
             'is_correct': is_correct,
             'points_earned': points_earned,
-            'correct_option_id': correct_option.id if correct_option else None,
+            'correct_option_id': correct_option_id,
             'explanation': selected_option.explanation if selected_option.explanation else None,
             'quiz': AdaptiveQuizSerializer(quiz).data
         }, status=status.HTTP_200_OK)
@@ -260,14 +298,30 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         
         quiz.is_completed = True
         quiz.completed_at = timezone.now()
-        quiz.save()
         
-        # Update user skill profile statistics
-        self._update_user_quiz_stats(quiz)
+        # Completed quizzes are immutable: compute everything the results,
+        # review and learning resources endpoints show once, now
+        quiz.result_snapshot = build_result_snapshot(quiz)
+        
+        with transaction.atomic():
+            # Only the request that flips is_completed counts the quiz in the stats
+            claimed = AdaptiveQuiz.objects.filter(pk=quiz.pk, is_completed=False).update(
+                is_completed=True,
+                completed_at=quiz.completed_at,
+                result_snapshot=quiz.result_snapshot
+            )
+            if not claimed:
+                return Response(
+                    {'error': 'Quiz is already completed.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Update category and user statistics
+            self._update_user_quiz_stats(quiz)
+        QuizRuntimeState.delete(quiz.id)
         
-        serializer = AdaptiveQuizDetailSerializer(quiz)
         return Response({
-            'quiz': serializer.data,
+            'quiz': quiz_detail(quiz.result_snapshot),
             'message': 'Quiz completed successfully'
         }, status=status.HTTP_200_OK)
     
@@ -282,34 +336,12 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        attempts = quiz.attempts.all()
-        serializer = AdaptiveQuizDetailSerializer(quiz)
-        
-        # Calculate performance by difficulty
-        difficulty_stats = {}
-        for difficulty in ['easy', 'medium', 'hard', 'expert']:
-            difficulty_attempts = attempts.filter(question__difficulty=difficulty)
-            if difficulty_attempts.exists():
-                difficulty_stats[difficulty] = {
-                    'total': difficulty_attempts.count(),
-                    'correct': difficulty_attempts.filter(is_correct=True).count(),
-                    'accuracy': round(
-                        (difficulty_attempts.filter(is_correct=True).count() / 
-                         difficulty_attempts.count()) * 100, 2
-                    )
-                }
+        snapshot = get_result_snapshot(quiz)
         
         return Response({
-            'quiz': serializer.data,
-            'difficulty_stats': difficulty_stats,
-            'performance_summary': {
-                'accuracy': quiz.calculate_accuracy(),
-                'score_percentage': quiz.calculate_score_percentage(),
-                'total_time': quiz.time_taken,
-                'average_time_per_question': round(
-                    quiz.time_taken / quiz.total_questions if quiz.total_questions > 0 else 0, 2
-                )
-            }
+            'quiz': quiz_detail(snapshot),
+            'difficulty_stats': snapshot['difficulty_stats'],
+            'performance_summary': snapshot['performance_summary']
         })
     
     @action(detail=True, methods=['get'])
@@ -323,22 +355,11 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        attempts = quiz.attempts.select_related('question', 'selected_option').all()
-        review_data = []
-        
-        for attempt in attempts:
-            question = attempt.question
-            correct_option = question.options.filter(is_correct=True).first()
-            
-            review_data.append({
-                'question': QuestionDetailSerializer(question).data,
-                'attempt': QuizAttemptSerializer(attempt).data,
-                'correct_option': QuestionOptionReviewSerializer(correct_option).data if correct_option else None
-            })
+        snapshot = get_result_snapshot(quiz)
         
         return Response({
-            'quiz': AdaptiveQuizSerializer(quiz).data,
-            'review': review_data
+            'quiz': snapshot['quiz'],
+            'review': snapshot['review']
         })
     
     @action(detail=True, methods=['get'])
@@ -352,31 +373,14 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Analyze weak areas
-        attempts = quiz.attempts.select_related('question').all()
-        incorrect_attempts = attempts.filter(is_correct=False)
-        
-        # Get topics from incorrect answers
-        weak_topics = []
-        strong_topics = []
-        
-        for attempt in incorrect_attempts:
-            if attempt.question.skill_tags:
-                weak_topics.extend(attempt.question.skill_tags)
-        
-        correct_attempts = attempts.filter(is_correct=True)
-        for attempt in correct_attempts:
-            if attempt.question.skill_tags:
-                strong_topics.extend(attempt.question.skill_tags)
-        
-        # Count occurrences
-        from collections import Counter
-        weak_topics_count = Counter(weak_topics)
-        strong_topics_count = Counter(strong_topics)
+        # Weak/strong topics were counted from the attempts at completion
+        snapshot = get_result_snapshot(quiz)
+        weak_topics = [tuple(topic) for topic in snapshot['weak_topics']]
+        strong_topics = [tuple(topic) for topic in snapshot['strong_topics']]
         
         # Generate recommendations
         recommendations = []
-        for topic, count in weak_topics_count.most_common(5):
+        for topic, count in weak_topics[:5]:
             recommendations.append({
                 'topic': topic,
                 'reason': f'You got {count} question(s) wrong in this area',
@@ -389,12 +393,12 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
             })
         
         return Response({
-            'quiz': AdaptiveQuizSerializer(quiz).data,
+            'quiz': snapshot['quiz'],
             'performance_summary': {
-                'accuracy': quiz.calculate_accuracy(),
-                'score_percentage': quiz.calculate_score_percentage(),
-                'weak_areas': list(weak_topics_count.most_common(5)),
-                'strong_areas': list(strong_topics_count.most_common(3))
+                'accuracy': snapshot['performance_summary']['accuracy'],
+                'score_percentage': snapshot['performance_summary']['score_percentage'],
+                'weak_areas': weak_topics[:5],
+                'strong_areas': strong_topics[:3]
             },
             'recommendations': recommendations,
             'next_steps': [
@@ -405,28 +409,22 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
             ]
         })
     
-    def _get_next_question(self, quiz, exclude_ids=None):
+    def _get_next_question(self, quiz, exclude_ids=None, state=None):
         """Get the next question based on adaptive algorithm"""
         if exclude_ids is None:
             exclude_ids = []
-        
-        # Get available questions from the category
-        available_questions = quiz.category.questions.filter(
-            is_active=True
-        ).exclude(id__in=exclude_ids)
-        
-        if not available_questions.exists():
-            return None
+        if state is None:
+            state = QuizRuntimeState.load(quiz)
         
         # Adaptive algorithm: adjust difficulty based on performance
         difficulty_order = ['easy', 'medium', 'hard', 'expert']
         current_difficulty_index = difficulty_order.index(quiz.current_difficulty)
         
-        # Calculate recent performance (last 5 questions)
-        recent_attempts = list(quiz.attempts.order_by('-answered_at')[:5])
-        if len(recent_attempts) >= 3:
-            recent_correct = sum(1 for attempt in recent_attempts if attempt.is_correct)
-            recent_accuracy = (recent_correct / len(recent_attempts)) * 100
+        # Calculate recent performance (last 5 questions, from the state's ring buffer)
+        recent_results = state.recent_results()
+        if len(recent_results) >= 3:
+            recent_correct = sum(recent_results)
+            recent_accuracy = (recent_correct / len(recent_results)) * 100
             
             # Adjust difficulty dynamically
             if recent_accuracy >= 80 and current_difficulty_index < len(difficulty_order) - 1:
@@ -440,23 +438,31 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
         else:
             target_difficulty = quiz.current_difficulty
         
-        # Try to get question at target difficulty level
-        question = available_questions.filter(difficulty=target_difficulty).order_by('?').first()
-        
-        # If no question at target difficulty, try adjacent levels
-        if not question:
-            for offset in [1, -1, 2, -2]:
-                idx = current_difficulty_index + offset
-                if 0 <= idx < len(difficulty_order):
-                    question = available_questions.filter(
-                        difficulty=difficulty_order[idx]
-                    ).order_by('?').first()
-                    if question:
-                        break
+        # Serve one of the questions most informative at the target level's
+        # ability, scored with the calibrated item parameters where known
+        ability = Question.DIFFICULTY_THETA[target_difficulty]
+        question_id = question_pools.select(quiz.category_id, ability, exclude_ids)
+        if question_id is None:
+            return None
         
-        # Fallback to any available question (randomized)
-        if not question:
-            question = available_questions.order_by('?').first()
+        questions = Question.objects.select_related('category').prefetch_related('options')
+        question = questions.filter(
+            id=question_id, category_id=quiz.category_id, is_active=True
+        ).first()
+        if question is None:
+            # Pool is stale (question moved or changed without signals, e.g. a bulk update)
+            question_pools.invalidate(quiz.category_id)
+            question_id = question_pools.select(quiz.category_id, ability, exclude_ids)
+            if question_id is not None:
+                question = questions.filter(
+                    id=question_id, category_id=quiz.category_id, is_active=True
+                ).first()
+        
+        if question is not None:
+            # Options are prefetched for serialization; remember the correct one
+            correct_option_id = next((option.id for option in question.options.all() if option.is_correct), None)
+            state.serve(question.id, correct_option_id)
+            state.save()
         
         return question
     
@@ -483,41 +489,31 @@ class AdaptiveQuizViewSet(viewsets.ModelViewSet):
     
     def _update_skill_profile(self, quiz, question, is_correct):
         """Update user skill profile based on question performance"""
-        profile, created = UserSkillProfile.objects.get_or_create(
-            user=quiz.user
-        )
-        
-        # Update skills based on question tags
-        if question.skill_tags:
-            performance = 100 if is_correct else 0
-            for skill_tag in question.skill_tags:
-                if isinstance(skill_tag, str):
-                    profile.update_skill(skill_tag, performance)
+        performance = 100 if is_correct else 0
+        
+        # Update skills based on question tags (one locked write for all tags)
+        UserSkillProfile.apply_skill_updates(quiz.user_id, [
+            (skill_tag, performance)
+            for skill_tag in question.skill_tags or []
+            if isinstance(skill_tag, str)
+        ])
     
     def _update_user_quiz_stats(self, quiz):
         """Update user's overall quiz statistics"""
-        profile, created = UserSkillProfile.objects.get_or_create(
-            user=quiz.user
-        )
-        
-        # Update total quizzes taken
-        profile.total_quizzes_taken = AdaptiveQuiz.objects.filter(
-            user=quiz.user,
-            is_completed=True
-        ).count()
-        
-        # Update average score
-        completed_quizzes = AdaptiveQuiz.objects.filter(
-            user=quiz.user,
-            is_completed=True
+        record_quiz_completed(quiz)
+        total_quizzes, average_score = user_totals(quiz.user_id)
+        
+        # Only the statistics; skill_data may have changed concurrently
+        updated = UserSkillProfile.objects.filter(user_id=quiz.user_id).update(
+            total_quizzes_taken=total_quizzes,
+            average_score=average_score,
+            last_updated=timezone.now()
         )
-        if completed_quizzes.exists():
-            avg_score = completed_quizzes.aggregate(
-                avg=Avg('total_score')
-            )['avg'] or 0
-            profile.average_score = round(avg_score, 2)
-        
-        profile.save()
+        if not updated:
+            UserSkillProfile.objects.get_or_create(user_id=quiz.user_id, defaults={
+                'total_quizzes_taken': total_quizzes,
+                'average_score': average_score
+            })
 
 
 class UserSkillProfileViewSet(viewsets.ReadOnlyModelViewSet):
@@ -540,13 +536,13 @@ class UserSkillProfileViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """Return skill profile for the authenticated user or test user"""
         user = self.request.user if self.request.user.is_authenticated else self._get_or_create_test_user()
-        return UserSkillProfile.objects.filter(user=user)
+        return UserSkillProfile.objects.filter(user=user).select_related('user')
     
     @action(detail=False, methods=['get'])
     def my_profile(self, request):
         """Get current user's skill profile"""
         user = request.user if request.user.is_authenticated else self._get_or_create_test_user()
-        profile, created = UserSkillProfile.objects.get_or_create(
+        profile, created = UserSkillProfile.objects.select_related('user').get_or_create(
             user=user
         )
         serializer = self.get_serializer(profile)
@@ -556,28 +552,28 @@ class UserSkillProfileViewSet(viewsets.ReadOnlyModelViewSet):
     def progress(self, request):
         """Get user's quiz progress and statistics"""
         user = request.user if request.user.is_authenticated else self._get_or_create_test_user()
-        profile, created = UserSkillProfile.objects.get_or_create(user=user)
-        
-        # Get quiz statistics
-        total_quizzes = AdaptiveQuiz.objects.filter(user=user, is_completed=True).count()
-        in_progress_quizzes = AdaptiveQuiz.objects.filter(user=user, is_completed=False).count()
-        
-        # Get category-wise statistics
-        category_stats = AdaptiveQuiz.objects.filter(
-            user=user, is_completed=True
-        ).values('category__name').annotate(
-            count=Count('id'),
-            avg_score=Avg('total_score'),
-            avg_accuracy=Avg('correct_answers')
+        profile, created = UserSkillProfile.objects.select_related('user').get_or_create(user=user)
+        
+        # Get quiz statistics (one stats row per category the user has taken)
+        category_stats = list(
+            UserQuizStats.objects.filter(user=user).select_related('category').order_by('category__name')
         )
         
         return Response({
             'profile': UserSkillProfileSerializer(profile).data,
             'statistics': {
-                'total_quizzes_completed': total_quizzes,
-                'quizzes_in_progress': in_progress_quizzes,
+                'total_quizzes_completed': sum(stats.quizzes_completed for stats in category_stats),
+                'quizzes_in_progress': sum(stats.quizzes_in_progress for stats in category_stats),
                 'average_score': profile.average_score,
-                'category_breakdown': list(category_stats)
+                'category_breakdown': [
+                    {
+                        'category__name': stats.category.name,
+                        'count': stats.quizzes_completed,
+                        'avg_score': stats.average_score,
+                        'avg_accuracy': stats.average_correct_answers
+                    }
+                    for stats in category_stats if stats.quizzes_completed
+                ]
             }
         })
 
@@ -6,6 +6,7 @@ Generated by 'django-admin startproject' using Django 4.2.13.
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import shlex
 
 # Load environment variables from .env
 load_dotenv()
@@ -171,6 +172,84 @@ CORS_ALLOW_HEADERS = [
 CORS_ALLOW_ALL_ORIGINS = True
 
 
+# -----------------------------
+# Cache configuration
+# -----------------------------
+# Redis when REDIS_URL is set, otherwise per-process local memory
+REDIS_URL = os.getenv("REDIS_URL")
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+# Whether every worker process sees the same cache. Cache-backed state that
+# other workers must observe (sessions, guards, versions) only relies on the
+# cache alone when this is set; otherwise it is also kept in the database.
+CACHE_IS_SHARED = bool(REDIS_URL)
+
+# Per-category question ID pools for the adaptive quiz app (invalidated by signals)
+QUESTION_POOL_CACHE_TIMEOUT = 60 * 60  # seconds
+QUIZ_STATE_CACHE_TIMEOUT = 60 * 60  # per-quiz answered IDs / recent results
+
+# Adaptive quiz (IRT/CAT) session state kept in the cache between answers
+ADAPTIVE_SESSION_CACHE_TIMEOUT = 60 * 60  # seconds
+ADAPTIVE_SESSION_PERSIST_EVERY = 5  # write back to QuizSession every N answers (shared cache only)
+
+# A/B question variants: in-process counters flushed to ABTestVariant rows
+AB_TEST_REFRESH_INTERVAL = 5 * 60  # seconds between reloads of variant rows
+AB_TEST_FLUSH_EVERY = 50  # flush after this many impressions/outcomes
+AB_TEST_FLUSH_INTERVAL = 60  # ...or after this many seconds
+
+# Coding assessment answers run in pre-warmed sandbox processes
+# (utils/code_sandbox.py); verdicts are cached by question and code.
+# Off by default: submissions are untrusted code, so only enable the grader
+# with CODE_GRADER_USER (a separate unprivileged account) and/or
+# CODE_GRADER_WRAPPER (e.g. "nsjail --config /etc/nsjail/grader.cfg --")
+# set up. While it is off, coding answers are stored ungraded.
+CODE_GRADER_ENABLED = os.getenv("CODE_GRADER_ENABLED", "False") == "True"
+CODE_GRADER = {
+    'workers': int(os.getenv("CODE_GRADER_WORKERS", "4")),
+    'time_limit': int(os.getenv("CODE_GRADER_TIME_LIMIT", "5")),  # CPU seconds per submission
+    'memory_mb': int(os.getenv("CODE_GRADER_MEMORY_MB", "256")),
+    'output_limit': 64 * 1024,  # characters of captured output
+    'user': os.getenv("CODE_GRADER_USER") or None,
+    'group': os.getenv("CODE_GRADER_GROUP") or None,
+    'wrapper': shlex.split(os.getenv("CODE_GRADER_WRAPPER", "")),
+}
+CODE_VERDICT_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
+
+# Labor market insight payloads, keyed by a data version that market data
+# writes bump (labor_market/insight_cache.py); the version is kept in the
+# database unless CACHE_IS_SHARED
+LABOR_MARKET_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
+
+
+# -----------------------------
+# LLM model routing (chat & voice)
+# -----------------------------
+# Short/simple queries and voice use the fast model, complex planning
+# questions use the large model; each falls back to the other on timeout.
+LLM_ROUTING = {
+    'routes': {
+        'fast': {
+            'model': os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant"),
+            'fallback': os.getenv("GROQ_LARGE_MODEL", "llama-3.3-70b-versatile"),
+            'timeout': float(os.getenv("GROQ_FAST_TIMEOUT", "8")),
+        },
+        'large': {
+            'model': os.getenv("GROQ_LARGE_MODEL", "llama-3.3-70b-versatile"),
+            'fallback': os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant"),
+            'timeout': float(os.getenv("GROQ_LARGE_TIMEOUT", "20")),
+        },
+    },
+    'short_query_words': int(os.getenv("LLM_SHORT_QUERY_WORDS", "15")),
+    'complex_query_words': int(os.getenv("LLM_COMPLEX_QUERY_WORDS", "60")),
+}
+
+
 # -----------------------------
 # Static and Media files
 # -----------------------------
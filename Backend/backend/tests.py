@@ -0,0 +1,528 @@
+# backend/tests.py
+from collections import namedtuple
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from adaptive_quiz.models import QuizCategory, Question, QuestionOption, AdaptiveQuiz, QuizAttempt
+from adaptive_quiz.quiz_stats import rebuild_quiz_stats
+from labor_market.models import (
+    Industry, JobRole, SalaryData, JobMarketTrend, SkillDemand,
+    CompanyInsight, EmergingRole, CareerPathRecommendation, CanonicalSkill, SkillAlias
+)
+from portfolio.models import (
+    PortfolioTemplate, Portfolio, PersonalInfo, SocialLink, Project, ProjectImage,
+    Experience, Education, Skill, Certification, Testimonial, PortfolioAnalytics
+)
+from prediction.ab_testing import ab_variant_selector
+from prediction.models import UserModel, UserProfile, LearningPath, LearningMilestone, MilestoneProgress, UserReminder
+from skill_assessments.models import (
+    SkillCategory, SkillSet, AssessmentQuestion, AssessmentOption, SkillAssessment,
+    AssessmentAnswer, UserSkillBadge, SkillGap, LearningResource, PeerComparison, ScoreHistogram
+)
+from utils.skill_vocabulary import normalize_skill
+
+# Rows in every collection at the first and the second measurement: a
+# partial page, then several pages (list endpoints page at PAGE_SIZE 20)
+SMALL_VOLUME = 10
+LARGE_VOLUME = 60
+
+# name, HTTP method, path, query budget, request data. Paths and data are
+# formatted with the seeded object IDs.
+Endpoint = namedtuple('Endpoint', 'name method path budget data', defaults=(None,))
+
+ENDPOINTS = [
+    # adaptive_quiz
+    Endpoint('quiz categories', 'get', '/api/adaptive-quiz/categories/', 2),
+    Endpoint('quiz category', 'get', '/api/adaptive-quiz/categories/{quiz_category}/', 1),
+    Endpoint('quiz category questions', 'get', '/api/adaptive-quiz/categories/{quiz_category}/questions/', 3),
+    Endpoint('quiz category stats', 'get', '/api/adaptive-quiz/categories/{quiz_category}/stats/', 2),
+    Endpoint('quizzes', 'get', '/api/adaptive-quiz/quizzes/', 2),
+    Endpoint('quiz', 'get', '/api/adaptive-quiz/quizzes/{completed_quiz}/', 2),
+    # First quiz in the category: also creates its category and user stats rows
+    Endpoint('quiz start', 'post', '/api/adaptive-quiz/quizzes/start/', 17, {'category_id': '{start_category}'}),
+    Endpoint('quiz get_question', 'get', '/api/adaptive-quiz/quizzes/{active_quiz}/get_question/', 5),
+    # Includes the savepoint and release around the attempt insert (test transaction only)
+    Endpoint('quiz submit_answer', 'post', '/api/adaptive-quiz/quizzes/{active_quiz}/submit_answer/', 13, {
+        'question_id': '{unanswered_question}', 'selected_option_id': '{unanswered_option}', 'time_taken': 5
+    }),
+    Endpoint('quiz complete', 'post', '/api/adaptive-quiz/quizzes/{active_quiz}/complete/', 11),
+    Endpoint('quiz results', 'get', '/api/adaptive-quiz/quizzes/{completed_quiz}/results/', 5),
+    Endpoint('quiz review', 'get', '/api/adaptive-quiz/quizzes/{completed_quiz}/review/', 5),
+    Endpoint('quiz learning_resources', 'get', '/api/adaptive-quiz/quizzes/{completed_quiz}/learning_resources/', 5),
+    Endpoint('skill profiles', 'get', '/api/adaptive-quiz/skill-profiles/', 2),
+    Endpoint('skill profile my_profile', 'get', '/api/adaptive-quiz/skill-profiles/my_profile/', 1),
+    Endpoint('skill profile progress', 'get', '/api/adaptive-quiz/skill-profiles/progress/', 2),
+
+    # labor_market. Cached insights, skill resolution and recommendations
+    # also read the data version row (the test cache is per-process)
+    Endpoint('industries', 'get', '/api/labor-market/industries/', 2),
+    Endpoint('industry', 'get', '/api/labor-market/industries/{industry}/', 1),
+    Endpoint('industry job_roles', 'get', '/api/labor-market/industries/{industry}/job_roles/', 2),
+    Endpoint('industry trending', 'get', '/api/labor-market/industries/trending/', 2),
+    Endpoint('industry sub_industries', 'get', '/api/labor-market/industries/{industry}/sub_industries/', 2),
+    Endpoint('job roles', 'get', '/api/labor-market/job-roles/', 2),
+    Endpoint('job role', 'get', '/api/labor-market/job-roles/{job_role}/', 1),
+    Endpoint('job roles search', 'get', '/api/labor-market/job-roles/?search=role', 3),
+    Endpoint('job role salary_insights', 'get', '/api/labor-market/job-roles/{job_role}/salary_insights/', 2),
+    Endpoint('job role salary_insights filtered', 'get',
+             '/api/labor-market/job-roles/{job_role}/salary_insights/?location=City%201&experience=mid', 2),
+    Endpoint('job role market_trends', 'get', '/api/labor-market/job-roles/{job_role}/market_trends/', 2),
+    Endpoint('job role trend_analytics', 'get', '/api/labor-market/job-roles/trend_analytics/?trend_type=demand', 2),
+    Endpoint('job role required_skills', 'get', '/api/labor-market/job-roles/{job_role}/required_skills/', 1),
+    Endpoint('job role popular_roles', 'get', '/api/labor-market/job-roles/popular_roles/', 1),
+    Endpoint('skill demand', 'get', '/api/labor-market/skill-demand/', 3),
+    Endpoint('skill demand detail', 'get', '/api/labor-market/skill-demand/{skill_demand}/', 2),
+    Endpoint('skill demand trending_skills', 'get', '/api/labor-market/skill-demand/trending_skills/', 3),
+    Endpoint('skill demand fastest_growing', 'get', '/api/labor-market/skill-demand/fastest_growing/', 3),
+    Endpoint('skill demand high_paying', 'get', '/api/labor-market/skill-demand/high_paying/', 3),
+    Endpoint('skill demand by_category', 'get', '/api/labor-market/skill-demand/by_category/', 2),
+    Endpoint('skills', 'get', '/api/labor-market/skills/', 3),
+    Endpoint('skills resolve', 'get', '/api/labor-market/skills/resolve/?q=Pyhton', 3),
+    Endpoint('companies', 'get', '/api/labor-market/companies/', 2),
+    Endpoint('company', 'get', '/api/labor-market/companies/{company}/', 1),
+    Endpoint('companies top_hiring', 'get', '/api/labor-market/companies/top_hiring/', 2),
+    Endpoint('companies by_location', 'get', '/api/labor-market/companies/by_location/?location=Pune', 1),
+    Endpoint('emerging roles', 'get', '/api/labor-market/emerging-roles/', 3),
+    Endpoint('emerging roles search', 'get', '/api/labor-market/emerging-roles/?search=emerg', 4),
+    Endpoint('emerging role', 'get', '/api/labor-market/emerging-roles/{emerging_role}/', 2),
+    Endpoint('emerging roles top_emerging', 'get', '/api/labor-market/emerging-roles/top_emerging/', 3),
+    Endpoint('emerging roles highest_growth', 'get', '/api/labor-market/emerging-roles/highest_growth/', 3),
+    Endpoint('recommendations', 'get', '/api/labor-market/recommendations/', 2),
+    # Cold cache: includes loading the skill vocabulary (2) and the role match matrix (1)
+    Endpoint('recommendations generate', 'post', '/api/labor-market/recommendations/generate_recommendations/', 8, {
+        'current_role_id': '{job_role}', 'skills': ['Python', 'SQL']
+    }),
+    Endpoint('recommendations generate by location', 'post',
+             '/api/labor-market/recommendations/generate_recommendations/', 7, {
+                 'skills': ['Python'], 'preferred_location': 'City 1'
+             }),
+    Endpoint('recommendations market_insights', 'get', '/api/labor-market/recommendations/market_insights/', 7),
+    Endpoint('recommendations skill_gap_analysis', 'post', '/api/labor-market/recommendations/skill_gap_analysis/', 3, {
+        'target_role_id': '{job_role}', 'current_skills': ['python', 'Djnago']
+    }),
+
+    # skill_assessments
+    Endpoint('skill categories', 'get', '/api/assessments/categories/', 2),
+    Endpoint('skill category', 'get', '/api/assessments/categories/{skill_category}/', 1),
+    Endpoint('skill category subcategories', 'get', '/api/assessments/categories/{skill_category}/subcategories/', 2),
+    Endpoint('skill sets', 'get', '/api/assessments/skill-sets/', 3),
+    Endpoint('skill set', 'get', '/api/assessments/skill-sets/{skill_set}/', 2),
+    Endpoint('skill set resources', 'get', '/api/assessments/skill-sets/{skill_set}/resources/', 3),
+    Endpoint('assessments', 'get', '/api/assessments/assessments/', 2),
+    Endpoint('assessment', 'get', '/api/assessments/assessments/{completed_assessment}/', 1),
+    Endpoint('assessment start', 'post', '/api/assessments/assessments/start_assessment/', 4, {
+        'skill_set_id': '{skill_set}'
+    }),
+    # Includes the answered-questions lookup, so answers given out of order are skipped
+    Endpoint('assessment get_question', 'get', '/api/assessments/assessments/{active_assessment}/get_question/', 4),
+    # Includes the assessment row lock and the already-answered check
+    Endpoint('assessment submit_answer', 'post', '/api/assessments/assessments/{active_assessment}/submit_answer/', 10, {
+        'question_id': '{unanswered_assessment_question}', 'selected_option_id': '{unanswered_assessment_option}',
+        'time_taken': 5
+    }),
+    # Includes the assessment row lock and the pending-answers check before completing
+    Endpoint('assessment submit_answers', 'post', '/api/assessments/assessments/{active_assessment}/submit_answers/', 20, {
+        'answers': [{'question_id': '{unanswered_assessment_question}', 'selected_option_id': '{unanswered_assessment_option}'}],
+        'complete': True
+    }),
+    Endpoint('assessment answers', 'get', '/api/assessments/assessments/{completed_assessment}/answers/', 2),
+    Endpoint('assessment complete', 'post', '/api/assessments/assessments/{active_assessment}/complete_assessment/', 13),
+    Endpoint('assessment detailed_report', 'get', '/api/assessments/assessments/{completed_assessment}/detailed_report/', 4),
+    Endpoint('badges', 'get', '/api/assessments/badges/', 2),
+    Endpoint('badge', 'get', '/api/assessments/badges/{badge}/', 1),
+    # Signature and expiry need no query; the badge must still exist and be public
+    Endpoint('badge public verify', 'get', '/api/assessments/badges/verify/?code={badge_code}', 1),
+    Endpoint('badge verify', 'get', '/api/assessments/badges/{badge}/verify/', 1),
+
+    # portfolio
+    Endpoint('portfolio templates', 'get', '/api/portfolio/templates/', 2),
+    Endpoint('portfolio template', 'get', '/api/portfolio/templates/{template}/', 1),
+    Endpoint('portfolios', 'get', '/api/portfolio/portfolios/', 2),
+    Endpoint('portfolio', 'get', '/api/portfolio/portfolios/{portfolio}/', 9),
+    Endpoint('portfolio public_view', 'get', '/api/portfolio/portfolios/public_view/?slug={portfolio_slug}', 15),
+    Endpoint('portfolio analytics', 'get', '/api/portfolio/portfolios/{portfolio}/analytics/', 2),
+    Endpoint('portfolio duplicate', 'post', '/api/portfolio/portfolios/{portfolio}/duplicate/', 3),
+    Endpoint('portfolio update_personal_info', 'patch', '/api/portfolio/portfolios/{portfolio}/update_personal_info/', 3, {
+        'headline': 'Backend engineer'
+    }),
+    Endpoint('portfolio add_social_link', 'post', '/api/portfolio/portfolios/{portfolio}/add_social_link/', 2, {
+        'portfolio': '{portfolio}', 'platform': 'github', 'url': 'https://github.com/example'
+    }),
+    Endpoint('portfolio add_skill', 'post', '/api/portfolio/portfolios/{portfolio}/add_skill/', 3, {
+        'portfolio': '{portfolio}', 'name': 'Django', 'proficiency': 'advanced', 'category': 'Backend'
+    }),
+    Endpoint('portfolio contact', 'post', '/api/portfolio/portfolios/{portfolio_slug}/contact/', 2, {
+        'name': 'Recruiter', 'email': 'recruiter@example.com', 'subject': 'Hello', 'message': 'Hi there'
+    }),
+
+    # prediction.urls
+    Endpoint('signup', 'post', '/api/auth/signup/', 2, {
+        'name': 'New User', 'age': 30, 'email': 'new.user@example.com', 'password': 'secret'
+    }),
+    Endpoint('signin', 'post', '/api/auth/signin/', 1, {'email': 'learner@example.com', 'password': 'secret'}),
+    Endpoint('adaptive quiz session', 'post', '/api/adaptive-quiz/', 2, {'user_id': '{learner}'}),
+    Endpoint('learning paths', 'get', '/api/learning-path/?user_id={learner}', 3),
+    Endpoint('milestone progress', 'get', '/api/milestone-progress/?user_id={learner}&milestone_id={milestone}', 3),
+    Endpoint('learning path progress', 'get',
+             '/api/milestone-progress/?user_id={learner}&learning_path_id={learning_path}', 5),
+    Endpoint('milestone progress update', 'post', '/api/milestone-progress/', 8, {
+        'user_id': '{learner}', 'milestone_id': '{milestone}', 'progress_percentage': 50, 'time_spent_minutes': 30
+    }),
+    Endpoint('user profile', 'get', '/api/user-profile/?user_id={learner}', 2),
+    Endpoint('user profile update', 'post', '/api/user-profile/', 3, {
+        'user_id': '{learner}', 'experience_level': 'junior'
+    }),
+    Endpoint('reminders', 'get', '/api/reminders/?user_id={learner}', 2),
+    Endpoint('reminder create', 'post', '/api/reminders/', 2, {
+        'user_id': '{learner}', 'reminder_type': 'skill_practice', 'title': 'Practice',
+        'message': 'Time to practice', 'scheduled_for': '2030-01-01T09:00:00'
+    }),
+]
+
+
+class EndpointQueryBudgetTest(TestCase):
+    """
+    SQL query budgets per endpoint.
+
+    Every endpoint is requested against a small seed and again after the seed
+    has grown. A request fails the test if it runs more queries than its
+    budget, or if its query count changed with the volume of data (an N+1).
+    Each request runs in a rolled-back savepoint with an empty cache, so
+    writes and cache warm-up do not leak into the next request.
+
+    get/quiz, get/sentiment and get/user are not covered: the first two run
+    the ML models and get/user serializes prediction users from request.user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='budget_user', email='budget@example.com', password='secret')
+        cls.other_user = User.objects.create_user(username='peer_user', password='secret')
+        cls.ids = {}
+        cls._seed_base()
+        cls._seed(0, SMALL_VOLUME)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    # ------------------------------------------------------------------
+    # Seed data
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def _seed_base(cls):
+        """Objects the endpoint paths point at"""
+        ids = cls.ids
+
+        # adaptive_quiz: a category with a quiz in progress and a completed one
+        cls.quiz_category = QuizCategory.objects.create(name='Python', description='Python')
+        cls.quiz_questions = [cls._create_question(cls.quiz_category, i) for i in range(12 + 2 * LARGE_VOLUME)]
+        start_category = QuizCategory.objects.create(name='SQL', description='SQL')
+        for i in range(4):
+            cls._create_question(start_category, i)
+
+        active_quiz = AdaptiveQuiz.objects.create(user=cls.user, category=cls.quiz_category)
+        for question in cls.quiz_questions[:2]:
+            cls._answer(active_quiz, question)
+        cls.completed_quiz = AdaptiveQuiz.objects.create(
+            user=cls.user, category=cls.quiz_category, is_completed=True, completed_at=timezone.now()
+        )
+        unanswered = cls.quiz_questions[-1]
+        ids.update(
+            quiz_category=cls.quiz_category.id, start_category=start_category.id,
+            active_quiz=active_quiz.id, completed_quiz=cls.completed_quiz.id,
+            unanswered_question=unanswered.id, unanswered_option=unanswered.options.first().id
+        )
+
+        # labor_market
+        cls.industry = Industry.objects.create(name='Technology', description='Tech', growth_rate=5)
+        cls.job_role = JobRole.objects.create(
+            title='Backend Developer', industry=cls.industry, description='APIs', experience_level='mid',
+            required_skills=['Python', 'SQL', 'Django']
+        )
+        ids.update(industry=cls.industry.id, job_role=cls.job_role.id)
+
+        # skill_assessments: an assessment in progress and a completed one
+        cls.skill_category = SkillCategory.objects.create(name='Programming', description='Programming')
+        cls.skill_set = SkillSet.objects.create(
+            name='Python Basics', category=cls.skill_category, description='Python',
+            difficulty_level='beginner', estimated_time=30
+        )
+        cls.active_assessment = SkillAssessment.objects.create(
+            user=cls.user, skill_set=cls.skill_set, status='in-progress', max_score=100, attempt_number=1
+        )
+        cls.completed_assessment = SkillAssessment.objects.create(
+            user=cls.user, skill_set=cls.skill_set, status='completed', max_score=100, attempt_number=2,
+            total_score=80, percentage=80, passed=True
+        )
+        badge = UserSkillBadge.objects.create(
+            user=cls.user, skill_set=cls.skill_set, assessment=cls.completed_assessment
+        )
+        SkillAssessment.objects.create(
+            user=cls.other_user, skill_set=cls.skill_set, status='completed', max_score=100, attempt_number=1,
+            percentage=60
+        )
+        PeerComparison.objects.create(
+            user=cls.user, skill_set=cls.skill_set, user_score=80, peer_average=60, percentile=75, total_peers=1
+        )
+        unanswered = cls._create_assessment_question(cls.skill_set, LARGE_VOLUME)
+        ids.update(
+            skill_category=cls.skill_category.id, skill_set=cls.skill_set.id,
+            active_assessment=cls.active_assessment.id, completed_assessment=cls.completed_assessment.id,
+            badge=badge.id, badge_code=badge.verification_code, unanswered_assessment_question=unanswered.id,
+            unanswered_assessment_option=unanswered.options.first().id
+        )
+
+        # portfolio
+        template = PortfolioTemplate.objects.create(
+            name='Clean', template_type='minimal', description='Clean', html_template='<div></div>',
+            css_template=''
+        )
+        cls.portfolio = Portfolio.objects.create(user=cls.user, template=template, title='My Work')
+        PersonalInfo.objects.create(
+            portfolio=cls.portfolio, full_name='Budget User', headline='Developer', bio='Bio',
+            email='budget@example.com', location='Pune'
+        )
+        ids.update(template=template.id, portfolio=cls.portfolio.id, portfolio_slug=cls.portfolio.slug)
+
+        # prediction
+        cls.learner = UserModel.objects.create(name='Learner', age=25, email='learner@example.com', password='secret')
+        UserProfile.objects.create(user=cls.learner)
+        cls.learning_path = LearningPath.objects.create(
+            user=cls.learner, target_role='Data Scientist', difficulty_level='beginner', estimated_duration_weeks=12
+        )
+        cls.milestones = []
+        ids.update(learner=cls.learner.id, learning_path=cls.learning_path.id)
+
+    @classmethod
+    def _seed(cls, start, stop):
+        """Add rows start..stop-1 to every collection an endpoint returns"""
+        today = date.today()
+        for i in range(start, stop):
+            # adaptive_quiz
+            category = QuizCategory.objects.create(name=f'Category {i}', description='Generated')
+            cls._create_question(category, i)
+            quiz = AdaptiveQuiz.objects.create(
+                user=cls.user, category=category, is_completed=True, completed_at=timezone.now()
+            )
+            cls._answer(quiz, category.questions.first())
+            cls._answer(cls.completed_quiz, cls.quiz_questions[2 + i])
+
+            # labor_market
+            sub_industry = Industry.objects.create(
+                name=f'Sub-industry {i}', description='Generated', parent_industry=cls.industry
+            )
+            role = JobRole.objects.create(
+                title=f'Role {i}', industry=cls.industry, description='Generated', experience_level='junior'
+            )
+            SalaryData.objects.create(
+                job_role=cls.job_role, country='India', city=f'City {i}', min_salary=1000 + i, max_salary=5000 + i,
+                median_salary=3000, avg_salary=3000, experience_level='mid', data_source='survey',
+                last_updated=today
+            )
+            JobMarketTrend.objects.create(
+                job_role=cls.job_role, trend_type='demand', period_start=today - timedelta(days=30 * (i + 1)),
+                period_end=today - timedelta(days=30 * i), trend_value=i, growth_rate=1.5,
+                trend_direction='up', confidence_score=0.8, insights='Generated'
+            )
+            JobMarketTrend.objects.create(
+                job_role=role, trend_type='demand', period_start=today - timedelta(days=365), period_end=today,
+                trend_value=i, growth_rate=1.5, trend_direction='up', confidence_score=0.8, insights='Generated',
+                data_points=[[(today - timedelta(days=30 * month)).isoformat(), i + month] for month in range(12)]
+            )
+            skill = SkillDemand.objects.create(
+                skill_name=f'Skill {i}', category='Programming', trending_rank=i, last_updated=today
+            )
+            skill.related_jobs.add(cls.job_role, role)
+            canonical = CanonicalSkill.objects.create(name=f'Skill {i}', normalized_name=normalize_skill(f'Skill {i}'))
+            SkillAlias.objects.create(skill=canonical, alias=f'S{i}', normalized_alias=normalize_skill(f'S{i}'))
+            company = CompanyInsight.objects.create(
+                company_name=f'Company {i}', industry=sub_industry, company_size='small', location='Pune',
+                hiring_trend='growing', active_job_openings=i
+            )
+            emerging = EmergingRole.objects.create(
+                title=f'Emerging {i}', industry=sub_industry, description='Generated', emergence_score=i,
+                growth_projection=i, avg_salary_range='10-20 LPA'
+            )
+            emerging.related_roles.add(cls.job_role, role)
+            CareerPathRecommendation.objects.create(
+                user=cls.user, current_role=cls.job_role, recommended_role=role, match_score=i,
+                estimated_transition_time='3-6 months', salary_potential='N/A', market_demand_score=50,
+                reasoning='Generated'
+            )
+
+            # skill_assessments
+            SkillCategory.objects.create(name=f'Root {i}', description='Generated')
+            SkillCategory.objects.create(
+                name=f'Subcategory {i}', description='Generated', parent_category=cls.skill_category
+            )
+            skill_set = SkillSet.objects.create(
+                name=f'Skill set {i}', category=cls.skill_category, description='Generated',
+                difficulty_level='intermediate', estimated_time=30
+            )
+            skill_set.prerequisites.add(cls.skill_set)
+            cls._create_assessment_question(skill_set, i)
+            question = cls._create_assessment_question(cls.skill_set, i)
+            cls._answer_assessment(cls.completed_assessment, question)
+            cls._answer_assessment(cls.active_assessment, question)
+            LearningResource.objects.create(
+                skill_set=cls.skill_set, title=f'Resource {i}', resource_type='article',
+                url='https://example.com', description='Generated', provider='Example',
+                difficulty_level='beginner', estimated_duration='1h'
+            )
+            SkillGap.objects.create(
+                user=cls.user, skill_set=cls.skill_set, assessment=cls.completed_assessment,
+                identified_weaknesses=[f'Topic {i}']
+            )
+            assessment = SkillAssessment.objects.create(
+                user=cls.user, skill_set=skill_set, status='completed', max_score=10, attempt_number=1
+            )
+            UserSkillBadge.objects.create(user=cls.user, skill_set=skill_set, assessment=assessment)
+
+            # portfolio
+            PortfolioTemplate.objects.create(
+                name=f'Template {i}', template_type='modern', description='Generated', html_template='',
+                css_template=''
+            )
+            Portfolio.objects.create(user=cls.user, title=f'Portfolio {i}')
+            SocialLink.objects.create(portfolio=cls.portfolio, platform='github', url='https://github.com/example')
+            project = Project.objects.create(
+                portfolio=cls.portfolio, title=f'Project {i}', description='Generated', start_date=today
+            )
+            for order in range(2):
+                ProjectImage.objects.create(project=project, image=f'project_images/{i}_{order}.png', order=order)
+            Experience.objects.create(
+                portfolio=cls.portfolio, company=f'Company {i}', position='Engineer', employment_type='full-time',
+                location='Pune', start_date=today, description='Generated'
+            )
+            Education.objects.create(
+                portfolio=cls.portfolio, institution=f'University {i}', degree='bachelor',
+                field_of_study='Computer Science', start_date=today
+            )
+            Skill.objects.create(portfolio=cls.portfolio, name=f'Skill {i}', proficiency='advanced', category='Backend')
+            Certification.objects.create(
+                portfolio=cls.portfolio, name=f'Certification {i}', issuing_organization='Example', issue_date=today
+            )
+            Testimonial.objects.create(
+                portfolio=cls.portfolio, author_name=f'Author {i}', author_position='Lead', content='Generated'
+            )
+            PortfolioAnalytics.objects.create(portfolio=cls.portfolio, date=today - timedelta(days=i + 1))
+
+            # prediction
+            LearningPath.objects.create(
+                user=cls.learner, target_role=f'Role {i}', difficulty_level='beginner', estimated_duration_weeks=4
+            )
+            milestone = LearningMilestone.objects.create(
+                learning_path=cls.learning_path, title=f'Milestone {i}', description='Generated',
+                milestone_type='course', order=i, estimated_hours=10
+            )
+            cls.milestones.append(milestone)
+            for milestone_log in (cls.milestones[0], milestone):
+                MilestoneProgress.objects.create(milestone=milestone_log, user=cls.learner, completion_percentage=10)
+            UserReminder.objects.create(
+                user=cls.learner, reminder_type='skill_practice', title=f'Reminder {i}', message='Generated',
+                scheduled_for=timezone.now() + timedelta(days=i + 1)
+            )
+
+        # Quizzes and assessments above are created directly, not through the API
+        rebuild_quiz_stats()
+        ScoreHistogram.rebuild()
+        answered = list(cls.active_assessment.answers.values_list('question_id', flat=True))
+        SkillAssessment.objects.filter(pk=cls.active_assessment.pk).update(
+            question_order=answered + [cls.ids['unanswered_assessment_question']], question_cursor=len(answered)
+        )
+        cls.ids.setdefault('skill_demand', skill.id)
+        cls.ids.setdefault('company', company.id)
+        cls.ids.setdefault('emerging_role', emerging.id)
+        cls.ids['milestone'] = cls.milestones[0].id
+
+    @staticmethod
+    def _create_question(category, index):
+        question = Question.objects.create(
+            category=category, question_text=f'Question {index}',
+            difficulty=['easy', 'medium', 'hard', 'expert'][index % 4],
+            skill_tags=['python', f'topic_{index}']
+        )
+        QuestionOption.objects.create(question=question, option_text='Right', is_correct=True, order=0)
+        QuestionOption.objects.create(question=question, option_text='Wrong', order=1)
+        return question
+
+    @staticmethod
+    def _answer(quiz, question):
+        option = question.options.order_by('order').first()
+        QuizAttempt.objects.create(
+            quiz=quiz, question=question, selected_option=option, is_correct=option.is_correct,
+            points_earned=question.points, time_taken=5
+        )
+
+    @staticmethod
+    def _create_assessment_question(skill_set, index):
+        question = AssessmentQuestion.objects.create(
+            skill_set=skill_set, question_type='mcq', question_text=f'Assessment question {index}'
+        )
+        AssessmentOption.objects.create(question=question, option_text='Right', is_correct=True, order=0)
+        AssessmentOption.objects.create(question=question, option_text='Wrong', order=1)
+        return question
+
+    @staticmethod
+    def _answer_assessment(assessment, question):
+        AssessmentAnswer.objects.create(assessment=assessment, question=question, is_correct=False)
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def _fill(self, value):
+        """Format the seeded IDs into request data, including nested lists and dicts"""
+        if isinstance(value, str):
+            return value.format(**self.ids)
+        if isinstance(value, list):
+            return [self._fill(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._fill(item) for key, item in value.items()}
+        return value
+
+    def _request(self, endpoint):
+        path = endpoint.path.format(**self.ids)
+        data = self._fill(endpoint.data or {})
+        if endpoint.method == 'get':
+            return self.client.get(path)
+        return getattr(self.client, endpoint.method)(path, data, format='json')
+
+    def _measure(self, endpoint):
+        """(status code, query count) of one request, rolled back afterwards"""
+        cache.clear()
+        ab_variant_selector.load()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                response = self._request(endpoint)
+            transaction.set_rollback(True)
+        return response.status_code, len(queries)
+
+    def test_endpoint_query_budgets(self):
+        small = {endpoint.name: self._measure(endpoint) for endpoint in ENDPOINTS}
+        self._seed(SMALL_VOLUME, LARGE_VOLUME)
+        large = {endpoint.name: self._measure(endpoint) for endpoint in ENDPOINTS}
+
+        failures = []
+        for endpoint in ENDPOINTS:
+            small_status, small_queries = small[endpoint.name]
+            large_status, large_queries = large[endpoint.name]
+
+            if small_status >= 400 or large_status >= 400:
+                failures.append(f'{endpoint.name}: HTTP {small_status}/{large_status}')
+            elif large_queries > endpoint.budget:
+                failures.append(f'{endpoint.name}: {large_queries} queries (budget {endpoint.budget})')
+            elif large_queries != small_queries:
+                failures.append(f'{endpoint.name}: {small_queries} queries with {SMALL_VOLUME} rows, '
+                                f'{large_queries} with {LARGE_VOLUME}')
+
+        self.assertFalse(failures, 'Query budget violations:\n' + '\n'.join(failures))
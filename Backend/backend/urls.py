@@ -13,7 +13,7 @@ from skill_assessments.views import (
     SkillAssessmentViewSet, UserSkillBadgeViewSet
 )
 from labor_market.views import (
-    IndustryViewSet, JobRoleViewSet, SkillDemandViewSet,
+    IndustryViewSet, JobRoleViewSet, SkillDemandViewSet, CanonicalSkillViewSet,
     CompanyInsightViewSet, 
     EmergingRoleViewSet, CareerRecommendationViewSet
 )
@@ -40,6 +40,7 @@ router.register(r'assessments/badges', UserSkillBadgeViewSet, basename='skill-ba
 router.register(r'labor-market/industries', IndustryViewSet, basename='industry')
 router.register(r'labor-market/job-roles', JobRoleViewSet, basename='job-role')
 router.register(r'labor-market/skill-demand', SkillDemandViewSet, basename='skill-demand')
+router.register(r'labor-market/skills', CanonicalSkillViewSet, basename='canonical-skill')
 router.register(r'labor-market/companies', CompanyInsightViewSet, basename='company-insight')
 #router.register(r'labor-market/reports', JobMarketReportViewSet, basename='market-report')
 router.register(r'labor-market/emerging-roles', EmergingRoleViewSet, basename='emerging-role')
@@ -1,3 +1,110 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from utils.model_router import ModelRouter
+
+
+class FakeGroqClient:
+    """Stands in for groq.Groq: answers from `replies` per model, raising exceptions as given"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, model, timeout=None, **params):
+        self.calls.append((model, timeout))
+        reply = self.replies[model]
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+
+
+class ModelRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ModelRouter()
+        self.fast = self.router.policy['routes']['fast']
+        self.large = self.router.policy['routes']['large']
+
+    def test_route_selection(self):
+        self.assertEqual(self.router.select_route('What does a QA tester do?'), 'fast')
+        self.assertEqual(self.router.select_route('Give me a roadmap to become a data engineer'), 'large')
+        self.assertEqual(self.router.select_route('Help me plan my switch to DevOps'), 'large')
+        self.assertEqual(self.router.select_route('Compare frontend and backend salaries'), 'large')
+        # Keywords match whole words only
+        self.assertEqual(self.router.select_route('Which planet has the most developers?'), 'fast')
+        self.assertEqual(self.router.select_route('Is comparative literature useful?'), 'fast')
+        self.assertEqual(self.router.select_route('word ' * 60), 'large')
+        self.assertEqual(self.router.select_route('word ' * 30), 'large')  # default route
+        self.assertEqual(self.router.select_route('Give me a detailed roadmap', channel='voice'), 'fast')
+
+    def test_policy_overrides(self):
+        router = ModelRouter({'routes': {'fast': {'timeout': 1.5}}, 'complex_keywords': ['kubernetes']})
+        self.assertEqual(router.policy['routes']['fast']['timeout'], 1.5)
+        self.assertEqual(router.policy['routes']['fast']['model'], self.fast['model'])
+        self.assertEqual(router.select_route('Should I learn Kubernetes?'), 'large')
+        self.assertEqual(router.select_route('Give me a roadmap'), 'fast')
+        with self.assertRaises(ValueError):
+            ModelRouter({'simple_route': 'tiny'})
+
+    def test_completion_on_routed_model(self):
+        client = FakeGroqClient({self.fast['model']: 'Hi!'})
+        result = self.router.complete(client, [{'role': 'user', 'content': 'Hello'}])
+
+        self.assertEqual(result['content'], 'Hi!')
+        self.assertEqual((result['route'], result['model'], result['fallback']), ('fast', self.fast['model'], False))
+        self.assertEqual(client.calls, [(self.fast['model'], self.fast['timeout'])])
+
+    def test_timeout_falls_back(self):
+        client = FakeGroqClient({self.fast['model']: TimeoutError(), self.large['model']: 'Slow but sure'})
+        result = self.router.complete(client, [{'role': 'user', 'content': 'Hello'}])
+
+        self.assertEqual((result['content'], result['model'], result['fallback']),
+                         ('Slow but sure', self.large['model'], True))
+        self.assertEqual([model for model, _ in client.calls], [self.fast['model'], self.large['model']])
+
+        stats = self.router.get_stats()['fast']
+        self.assertEqual((stats['requests'], stats['successes'], stats['timeouts'], stats['fallbacks']), (1, 1, 1, 1))
+        self.assertEqual(stats['models'], {self.large['model']: 1})
+
+    def test_both_models_time_out(self):
+        client = FakeGroqClient({self.fast['model']: TimeoutError(), self.large['model']: TimeoutError()})
+        with self.assertRaises(TimeoutError):
+            self.router.complete(client, [{'role': 'user', 'content': 'Hello'}])
+
+        stats = self.router.get_stats()['fast']
+        self.assertEqual((stats['timeouts'], stats['errors'], stats['successes']), (2, 1, 0))
+
+    def test_other_errors_are_not_retried(self):
+        client = FakeGroqClient({self.large['model']: RuntimeError('bad request')})
+        with self.assertRaises(RuntimeError):
+            self.router.complete(client, [{'role': 'user', 'content': 'Hello'}], route='large')
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(self.router.get_stats()['large']['errors'], 1)
+
+    def test_latency_stats(self):
+        for latency in range(1, 101):
+            self.router._record('fast', model=self.fast['model'], latency_ms=float(latency), requests=1, successes=1)
+
+        stats = self.router.get_stats()
+        self.assertEqual(stats['fast']['latency_ms']['samples'], 100)
+        self.assertEqual(stats['fast']['latency_ms']['p50'], 50.5)
+        self.assertEqual(stats['fast']['latency_ms']['max'], 100.0)
+        self.assertEqual(stats['large']['latency_ms'], {'samples': 0})
+
+
+class ModelRoutingStatsViewTest(TestCase):
+    def test_admins_only(self):
+        client = APIClient()
+        self.assertIn(client.get('/api/chat/routing-stats/').status_code, (401, 403))
+
+        client.force_authenticate(User.objects.create_user('user', password='pass'))
+        self.assertEqual(client.get('/api/chat/routing-stats/').status_code, 403)
+
+        client.force_authenticate(User.objects.create_user('admin', password='pass', is_staff=True))
+        response = client.get('/api/chat/routing-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('fast', response.data['routes'])
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import ChatbotView
+from .views import ChatbotView, ModelRoutingStatsView
 
 urlpatterns = [
-    path('chat/',ChatbotView.as_view(),name="chatbot")
+    path('chat/',ChatbotView.as_view(),name="chatbot"),
+    path('chat/routing-stats/', ModelRoutingStatsView.as_view(), name="chat-routing-stats")
 ]
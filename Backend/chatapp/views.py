@@ -4,11 +4,13 @@ import os
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 
 from groq import Groq
 from dotenv import load_dotenv
 
+from utils.model_router import get_model_router
+
 
 # Load environment variables
 load_dotenv()
@@ -82,8 +84,9 @@ class ChatbotResponse:
             Provide practical advice, industry insights, learning resources, and career guidance. Be conversational, friendly, and encouraging.
             If asked about non-IT topics, politely redirect to IT career-related questions."""
 
-            # Call Groq API
-            chat_completion = groq_client.chat.completions.create(
+            # Call Groq API (model picked by the latency-aware router)
+            result = get_model_router().complete(
+                groq_client,
                 messages=[
                     {
                         "role": "system",
@@ -94,14 +97,30 @@ class ChatbotResponse:
                         "content": user_message
                     }
                 ],
-                model="llama-3.3-70b-versatile",  # Latest fast model
+                channel="chat",
                 temperature=0.7,
                 max_tokens=1024,
                 top_p=0.95,
             )
             
-            return chat_completion.choices[0].message.content
+            return result["content"]
 
         except Exception as e:
             print(f"❌ Error generating AI response: {str(e)}")
-            return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question or contact support if the issue persists."
\ No newline at end of file
+            return f"I apologize, but I encountered an error: {str(e)}. Please try rephrasing your question or contact support if the issue persists."
+
+
+# ---------------- MODEL ROUTING STATS ----------------
+class ModelRoutingStatsView(APIView):
+    """
+    Per-route request counters and latency percentiles for the
+    chat/voice model router (in-process, since last restart); admins only
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        router = get_model_router()
+        return Response({
+            "routes": router.get_stats(),
+            "channel_routes": router.policy["channel_routes"],
+        })
@@ -0,0 +1,11 @@
+# labor_market/apps.py
+from django.apps import AppConfig
+
+
+class LaborMarketConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'labor_market'
+    verbose_name = 'Labor Market Insights'
+
+    def ready(self):
+        import labor_market.signals
@@ -0,0 +1,97 @@
+# labor_market/insight_cache.py
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .models import MarketDataVersion
+
+
+class InsightCache:
+    """
+    Cached payloads of the read-only labor market insight endpoints.
+
+    Every key embeds a global labor market data version. Writes to the
+    market data bump the version (see signals.py), which orphans every
+    cached payload at once, so payloads are served from the cache until
+    the data actually changes and then expire on their own. Writes that
+    bypass signals (queryset.update(), bulk_create()) must call bump().
+
+    The process-wide role matcher and skill vocabulary reload on the same
+    version, so a bump from any worker or management command must reach
+    every worker: with a shared cache (settings.CACHE_IS_SHARED) the
+    version lives in the cache, otherwise in a MarketDataVersion row.
+    """
+
+    KEY_PREFIX = 'labor_market_insight'
+    VERSION_KEY = 'labor_market_data_version'
+
+    def __init__(self, timeout=None, shared=None):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'LABOR_MARKET_CACHE_TIMEOUT', 24 * 60 * 60
+        )
+        self.shared = shared if shared is not None else getattr(settings, 'CACHE_IS_SHARED', False)
+
+    def version(self):
+        if not self.shared:
+            version = MarketDataVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+            if version is None:
+                row, created = MarketDataVersion.objects.get_or_create(pk=1, defaults={'version': uuid.uuid4().hex})
+                version = row.version
+            return version
+
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            # First use, or evicted: start a fresh version (never an old one)
+            cache.add(self.VERSION_KEY, uuid.uuid4().hex, None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def bump(self):
+        """Invalidate every cached insight"""
+        if not self.shared:
+            if not MarketDataVersion.objects.filter(pk=1).update(version=uuid.uuid4().hex):
+                MarketDataVersion.objects.get_or_create(pk=1, defaults={'version': uuid.uuid4().hex})
+            return
+        cache.set(self.VERSION_KEY, uuid.uuid4().hex, None)
+
+    def key(self, name, params):
+        """
+        Cache key of an insight at the current version. Take it before
+        reading the data, so a payload built from data that changed
+        meanwhile lands under the old version.
+        """
+        query = '&'.join(f'{param}={value}' for param, value in sorted(params.items()))
+        return f'{self.KEY_PREFIX}:{self.version()}:{name}:{query}'
+
+    def get(self, key):
+        return cache.get(key)
+
+    def set(self, key, payload):
+        cache.set(key, payload, self.timeout)
+
+
+insight_cache = InsightCache()
+
+
+def cached_insight(name, params=()):
+    """
+    Cache a viewset action's successful responses under the data version,
+    keyed by the given query parameters
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            key = insight_cache.key(name, {param: request.query_params.get(param, '') for param in params})
+            payload = insight_cache.get(key)
+            if payload is not None:
+                return Response(payload)
+
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                insight_cache.set(key, response.data)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,23 @@
+# labor_market/management/commands/rebuild_role_search.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from labor_market.models import JobRole, EmergingRole
+from labor_market.search import role_search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job and emerging role search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Roles per index write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding role search index...')
+        started = time.perf_counter()
+
+        indexed = role_search.rebuild([JobRole, EmergingRole], batch_size=options['batch_size'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} roles in {elapsed:.2f}s'))
@@ -0,0 +1,24 @@
+# labor_market/management/commands/rebuild_salary_rollups.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from labor_market.salary_rollups import rebuild_salary_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-role salary rollups from the salary data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding salary rollups...')
+        started = time.perf_counter()
+
+        roles, rollups = rebuild_salary_rollups(batch_size=options['batch_size'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rollups} rollups for {roles} roles in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,22 @@
+# labor_market/management/commands/rebuild_trend_series.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from labor_market.trend_series import rebuild_trend_series
+
+
+class Command(BaseCommand):
+    help = 'Repack the per-role trend series from the job market trends'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding trend series...')
+        started = time.perf_counter()
+
+        series = rebuild_trend_series(batch_size=options['batch_size'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {series} trend series in {elapsed:.2f}s'))
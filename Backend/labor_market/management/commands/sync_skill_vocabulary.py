@@ -0,0 +1,45 @@
+# labor_market/management/commands/sync_skill_vocabulary.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from adaptive_quiz.models import Question
+from labor_market.skill_vocabulary import labor_market_skill_strings, sync_skill_vocabulary
+from portfolio.models import Skill
+from prediction.models import UserProfile
+from utils.learning_path_generator import LearningPathGenerator
+
+
+def skill_strings():
+    """Every free-form skill string across the apps"""
+    yield from labor_market_skill_strings()
+    for skill_tags in Question.objects.values_list('skill_tags', flat=True).iterator():
+        yield from skill_tags or []
+    yield from Skill.objects.values_list('name', flat=True).iterator()
+    for skills in UserProfile.objects.values_list('skills', flat=True).iterator():
+        # Ratings keyed by skill, or a plain list
+        yield from skills or []
+    for curriculum in LearningPathGenerator().role_curricula.values():
+        for group in ('core_skills', 'advanced_skills', 'tools'):
+            yield from curriculum.get(group, [])
+
+
+class Command(BaseCommand):
+    help = 'Add the skills used across the apps to the canonical skill vocabulary'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List the new skills without adding them')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Syncing skill vocabulary...')
+        started = time.perf_counter()
+
+        names = sync_skill_vocabulary(skill_strings(), dry_run=options['dry_run'])
+
+        elapsed = time.perf_counter() - started
+        if options['dry_run']:
+            for name in names:
+                self.stdout.write(f'  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Found' if options['dry_run'] else 'Added'} {len(names)} new skills in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from labor_market import search
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if not search.supports(connection):
+        return
+    statements = search.SQLITE_CREATE if connection.vendor == 'sqlite' else search.POSTGRES_CREATE
+    for statement in statements:
+        schema_editor.execute(statement)
+    search.role_search.rebuild(
+        [apps.get_model('labor_market', 'JobRole'), apps.get_model('labor_market', 'EmergingRole')],
+        connection=connection
+    )
+
+
+def drop_index(apps, schema_editor):
+    if search.supports(schema_editor.connection):
+        for statement in search.DROP:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labor_market', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
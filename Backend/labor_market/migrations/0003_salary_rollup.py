@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from labor_market.salary_rollups import SALARY_FIELDS, rollup_fields
+
+
+def backfill_salary_rollups(apps, schema_editor):
+    SalaryData = apps.get_model('labor_market', 'SalaryData')
+    SalaryRollup = apps.get_model('labor_market', 'SalaryRollup')
+
+    by_role = {}
+    for row in SalaryData.objects.order_by().values('job_role_id', *SALARY_FIELDS):
+        by_role.setdefault(row['job_role_id'], []).append(row)
+
+    SalaryRollup.objects.bulk_create(
+        (
+            SalaryRollup(job_role_id=job_role_id, **fields)
+            for job_role_id, rows in by_role.items()
+            for fields in rollup_fields(rows)
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labor_market', '0002_role_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalaryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'All locations'), ('state', 'State'), ('city', 'City')], max_length=10)),
+                ('location', models.CharField(blank=True, help_text='Lowercased city or state name; blank for all locations', max_length=100)),
+                ('experience_level', models.CharField(blank=True, help_text='Blank for every experience level', max_length=50)),
+                ('country', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('sample_count', models.IntegerField(default=0, help_text='SalaryData rows covered')),
+                ('sample_size', models.IntegerField(default=0, help_text='Sum of their sample sizes')),
+                ('min_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('p25_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('median_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('p75_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('max_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('avg_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('avg_median', models.DecimalField(decimal_places=2, help_text='Unweighted mean of the median salaries', max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='salary_rollups', to='labor_market.jobrole')),
+            ],
+            options={
+                'ordering': ['scope', 'country', 'state', 'city', 'experience_level'],
+                'indexes': [models.Index(fields=['job_role', 'location', 'experience_level'], name='labor_marke_job_rol_88687a_idx')],
+                'unique_together': {('job_role', 'scope', 'country', 'state', 'city', 'experience_level')},
+            },
+        ),
+        migrations.RunPython(backfill_salary_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from labor_market.skill_vocabulary import COMMON_ALIASES, alias_rows, new_skill_names
+from utils.skill_vocabulary import normalize_skill
+
+
+def seed_skill_vocabulary(apps, schema_editor):
+    JobRole = apps.get_model('labor_market', 'JobRole')
+    SkillDemand = apps.get_model('labor_market', 'SkillDemand')
+    CanonicalSkill = apps.get_model('labor_market', 'CanonicalSkill')
+    SkillAlias = apps.get_model('labor_market', 'SkillAlias')
+
+    strings = list(COMMON_ALIASES)
+    for required, preferred in JobRole.objects.values_list('required_skills', 'preferred_skills'):
+        strings.extend(required or [])
+        strings.extend(preferred or [])
+    strings.extend(SkillDemand.objects.values_list('skill_name', flat=True))
+
+    common_aliases = {normalize_skill(alias) for aliases in COMMON_ALIASES.values() for alias in aliases}
+    CanonicalSkill.objects.bulk_create(
+        [CanonicalSkill(name=name, normalized_name=normalized) for name, normalized in new_skill_names(strings, common_aliases)],
+        batch_size=1000
+    )
+    skill_ids = dict(CanonicalSkill.objects.values_list('normalized_name', 'id'))
+    SkillAlias.objects.bulk_create(
+        SkillAlias(skill_id=skill_id, alias=alias, normalized_alias=normalized)
+        for skill_id, alias, normalized in alias_rows(skill_ids, set(skill_ids))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labor_market', '0003_salary_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CanonicalSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('normalized_name', models.CharField(help_text='Name with case and separators folded away', max_length=200, unique=True)),
+                ('category', models.CharField(blank=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=200)),
+                ('normalized_alias', models.CharField(max_length=200, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='labor_market.canonicalskill')),
+            ],
+            options={
+                'verbose_name_plural': 'Skill Aliases',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.RunPython(seed_skill_vocabulary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from labor_market.trend_series import TREND_FIELDS, series_fields
+
+
+def backfill_trend_series(apps, schema_editor):
+    JobMarketTrend = apps.get_model('labor_market', 'JobMarketTrend')
+    TrendSeries = apps.get_model('labor_market', 'TrendSeries')
+
+    by_role = {}
+    for trend in JobMarketTrend.objects.order_by('period_end', 'id').values('job_role_id', *TREND_FIELDS):
+        by_role.setdefault(trend['job_role_id'], []).append(trend)
+
+    TrendSeries.objects.bulk_create(
+        (
+            TrendSeries(job_role_id=job_role_id, trend_type=trend_type, **values)
+            for job_role_id, trends in by_role.items()
+            for trend_type, values in series_fields(trends).items()
+        ),
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labor_market', '0004_canonical_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trend_type', models.CharField(choices=[('demand', 'Job Demand'), ('salary', 'Salary Trend'), ('skill', 'Skill Demand'), ('automation', 'Automation Risk')], max_length=20)),
+                ('days', models.BinaryField(help_text='Little-endian int32 days since 1970-01-01')),
+                ('values', models.BinaryField(help_text='Little-endian float64 values')),
+                ('point_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trend_series', to='labor_market.jobrole')),
+            ],
+            options={
+                'verbose_name_plural': 'Trend Series',
+                'unique_together': {('job_role', 'trend_type')},
+            },
+        ),
+        migrations.RunPython(backfill_trend_series, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labor_market', '0005_trend_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=32)),
+            ],
+        ),
+    ]
@@ -64,6 +64,44 @@ class SalaryData(models.Model):
     def __str__(self):
         return f"{self.job_role.title} - {self.city} - {self.median_salary} {self.currency}"
 
+class SalaryRollup(models.Model):
+    """
+    Salary percentiles for a role over one location scope and experience
+    level, weighted by the sample_size of the SalaryData rows they cover.
+    Maintained by labor_market.salary_rollups.
+    """
+    SCOPES = [
+        ('all', 'All locations'),
+        ('state', 'State'),
+        ('city', 'City')
+    ]
+    
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name='salary_rollups')
+    scope = models.CharField(max_length=10, choices=SCOPES)
+    location = models.CharField(max_length=100, blank=True, help_text="Lowercased city or state name; blank for all locations")
+    experience_level = models.CharField(max_length=50, blank=True, help_text="Blank for every experience level")
+    country = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    sample_count = models.IntegerField(default=0, help_text="SalaryData rows covered")
+    sample_size = models.IntegerField(default=0, help_text="Sum of their sample sizes")
+    min_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    p25_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    median_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    p75_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    max_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    avg_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    avg_median = models.DecimalField(max_digits=12, decimal_places=2, help_text="Unweighted mean of the median salaries")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['job_role', 'scope', 'country', 'state', 'city', 'experience_level']
+        indexes = [models.Index(fields=['job_role', 'location', 'experience_level'])]
+        ordering = ['scope', 'country', 'state', 'city', 'experience_level']
+    
+    def __str__(self):
+        return f"{self.job_role.title} - {self.location or 'all'} - {self.experience_level or 'all'}"
+
 class JobMarketTrend(models.Model):
     TREND_TYPES = [
         ('demand', 'Job Demand'),
@@ -89,6 +127,26 @@ class JobMarketTrend(models.Model):
     def __str__(self):
         return f"{self.job_role.title} - {self.trend_type}"
 
+class TrendSeries(models.Model):
+    """
+    A role's trend points of one type as packed arrays: each trend's
+    period end and value plus its data_points, sorted by date.
+    Maintained by labor_market.trend_series.
+    """
+    job_role = models.ForeignKey(JobRole, on_delete=models.CASCADE, related_name='trend_series')
+    trend_type = models.CharField(max_length=20, choices=JobMarketTrend.TREND_TYPES)
+    days = models.BinaryField(help_text="Little-endian int32 days since 1970-01-01")
+    values = models.BinaryField(help_text="Little-endian float64 values")
+    point_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['job_role', 'trend_type']
+        verbose_name_plural = "Trend Series"
+    
+    def __str__(self):
+        return f"{self.job_role.title} - {self.trend_type} ({self.point_count} points)"
+
 class SkillDemand(models.Model):
     skill_name = models.CharField(max_length=200)
     category = models.CharField(max_length=100)
@@ -106,6 +164,33 @@ class SkillDemand(models.Model):
     def __str__(self):
         return f"{self.skill_name} - Rank {self.trending_rank}"
 
+class CanonicalSkill(models.Model):
+    """
+    One skill under its canonical name; free-form skill strings across the
+    apps resolve to it by name or alias (see labor_market.skill_vocabulary)
+    """
+    name = models.CharField(max_length=200)
+    normalized_name = models.CharField(max_length=200, unique=True, help_text="Name with case and separators folded away")
+    category = models.CharField(max_length=100, blank=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+class SkillAlias(models.Model):
+    skill = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=200)
+    normalized_alias = models.CharField(max_length=200, unique=True)
+    
+    class Meta:
+        verbose_name_plural = "Skill Aliases"
+        ordering = ['alias']
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
 class CompanyInsight(models.Model):
     COMPANY_SIZES = [
         ('startup', '1-50'),
@@ -177,4 +262,14 @@ class CareerPathRecommendation(models.Model):
         ordering = ['-match_score']
     
     def __str__(self):
-        return f"{self.user.username} -> {self.recommended_role.title}"
\ No newline at end of file
+        return f"{self.user.username} -> {self.recommended_role.title}"
+
+class MarketDataVersion(models.Model):
+    """
+    Labor market data version shared by every worker process when the
+    cache is per-process (see insight_cache.py); a single row
+    """
+    version = models.CharField(max_length=32)
+    
+    def __str__(self):
+        return self.version
@@ -0,0 +1,64 @@
+# labor_market/role_matching.py
+import threading
+
+import numpy as np
+
+from utils.skill_matching import SkillMatchMatrix
+from .insight_cache import insight_cache
+from .models import JobRole
+from .skill_vocabulary import skill_vocabulary
+
+
+class RoleMatcher:
+    """
+    Process-wide skill match matrix over every job role, with skills
+    interned as canonical skill IDs (see skill_vocabulary.py), so
+    'Javascript' in a role matches 'JavaScript' from a user.
+
+    Built with one query and kept until the labor market data version
+    changes (see insight_cache.py), so checking it costs one cache read
+    (one primary key lookup when the cache is per-process).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._matrix = None
+        self._industry_ids = None
+        self._vocabulary = None
+
+    def load(self, vocabulary):
+        rows = list(JobRole.objects.order_by('id').values_list('id', 'industry_id', 'required_skills'))
+        matrix = SkillMatchMatrix(
+            [role_id for role_id, _, _ in rows],
+            [vocabulary.keys(skills or []) for _, _, skills in rows]
+        )
+        industry_ids = np.array([industry_id for _, industry_id, _ in rows], dtype=np.int64)
+        return matrix, industry_ids
+
+    def _current(self):
+        version = insight_cache.version()
+        with self._lock:
+            if self._version != version:
+                self._vocabulary = skill_vocabulary.current()
+                self._matrix, self._industry_ids = self.load(self._vocabulary)
+                self._version = version
+            return self._matrix, self._industry_ids, self._vocabulary
+
+    def top_k(self, skills, k, industry_id=None, exclude_id=None, role_ids=None):
+        """
+        (role ID, match score) of the k roles best matching the skills,
+        optionally only in an industry, without a role, or among some roles
+        """
+        matrix, industry_ids, vocabulary = self._current()
+        candidates = np.ones(len(matrix), dtype=bool)
+        if industry_id is not None:
+            candidates &= industry_ids == industry_id
+        if exclude_id is not None:
+            candidates &= matrix.role_ids != exclude_id
+        if role_ids is not None:
+            candidates &= np.isin(matrix.role_ids, list(role_ids))
+        return matrix.top_k(vocabulary.keys(skills, fuzzy=True), k, candidates)
+
+
+role_matcher = RoleMatcher()
@@ -0,0 +1,159 @@
+# labor_market/salary_rollups.py
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import SalaryData, SalaryRollup
+
+CENTS = Decimal('0.01')
+
+SALARY_FIELDS = ('country', 'state', 'city', 'experience_level', 'min_salary', 'max_salary',
+                 'median_salary', 'avg_salary', 'sample_size')
+
+
+def weighted_percentile(points, fraction):
+    """The value at a fraction of the total weight; points are (value, weight) sorted by value"""
+    target = fraction * sum(weight for _, weight in points)
+    covered = 0
+    for value, weight in points:
+        covered += weight
+        if covered >= target:
+            return value
+    return points[-1][0]
+
+
+def summarize(rows):
+    """Rollup figures for some SalaryData rows (dicts with SALARY_FIELDS)"""
+    # Rows without a sample size still count, as one sample
+    weights = [max(row['sample_size'], 1) for row in rows]
+    medians = sorted(zip((row['median_salary'] for row in rows), weights))
+    total_weight = sum(weights)
+    return {
+        'sample_count': len(rows),
+        'sample_size': sum(row['sample_size'] for row in rows),
+        'min_salary': min(row['min_salary'] for row in rows),
+        'p25_salary': weighted_percentile(medians, 0.25),
+        'median_salary': weighted_percentile(medians, 0.5),
+        'p75_salary': weighted_percentile(medians, 0.75),
+        'max_salary': max(row['max_salary'] for row in rows),
+        'avg_salary': (
+            sum(row['avg_salary'] * weight for row, weight in zip(rows, weights)) / total_weight
+        ).quantize(CENTS),
+        'avg_median': (sum(row['median_salary'] for row in rows) / len(rows)).quantize(CENTS),
+    }
+
+
+def rollup_fields(rows):
+    """
+    Field values of every rollup for one role's SalaryData rows: all
+    locations, each state and each city, each both per experience level
+    and across levels
+    """
+    groups = defaultdict(list)
+    for row in rows:
+        places = [('all', '', '', '', '')]
+        if row['state']:
+            places.append(('state', row['state'].lower(), row['country'], row['state'], ''))
+        if row['city']:
+            places.append(('city', row['city'].lower(), row['country'], row['state'], row['city']))
+        for place in places:
+            groups[place + ('',)].append(row)
+            groups[place + (row['experience_level'],)].append(row)
+
+    return [
+        dict(
+            scope=scope, location=location, country=country, state=state, city=city,
+            experience_level=experience_level, **summarize(group)
+        )
+        for (scope, location, country, state, city, experience_level), group in groups.items()
+    ]
+
+
+def refresh_salary_rollups(job_role_id):
+    """Recompute one role's rollups, after its salary data changed"""
+    rows = list(SalaryData.objects.filter(job_role_id=job_role_id).order_by().values(*SALARY_FIELDS))
+    with transaction.atomic():
+        SalaryRollup.objects.filter(job_role_id=job_role_id).delete()
+        SalaryRollup.objects.bulk_create(
+            SalaryRollup(job_role_id=job_role_id, **fields) for fields in rollup_fields(rows)
+        )
+
+
+def rebuild_salary_rollups(batch_size=1000):
+    """Recompute every role's rollups; returns (roles, rollup rows) written"""
+    by_role = defaultdict(list)
+    rows = SalaryData.objects.order_by().values('job_role_id', *SALARY_FIELDS)
+    for row in rows.iterator(chunk_size=2000):
+        by_role[row['job_role_id']].append(row)
+
+    rollups = [
+        SalaryRollup(job_role_id=job_role_id, **fields)
+        for job_role_id, role_rows in by_role.items()
+        for fields in rollup_fields(role_rows)
+    ]
+    with transaction.atomic():
+        SalaryRollup.objects.all().delete()
+        SalaryRollup.objects.bulk_create(rollups, batch_size=batch_size)
+    return len(by_role), len(rollups)
+
+
+def salary_summary(job_role_id, location='', experience='', breakdown=True):
+    """
+    The rollup covering a role at a location (city or state name, matched
+    case-insensitively) and experience level, and (with breakdown) the
+    per-city, per-level rollups under it, from a single lookup. The
+    summary is None when there's no matching data.
+    """
+    location, experience = location.strip().lower(), experience.strip()
+    if location:
+        summary_match = Q(location=location) & ~Q(scope='all')
+    else:
+        summary_match = Q(scope='all')
+    match = summary_match & Q(experience_level=experience)
+    if breakdown:
+        match |= Q(scope='city') & (Q(experience_level=experience) if experience else ~Q(experience_level=''))
+
+    summary, cities = None, []
+    for rollup in SalaryRollup.objects.filter(Q(job_role_id=job_role_id) & match):
+        if breakdown and rollup.scope == 'city' and rollup.experience_level and (
+                not location or location in (rollup.location, rollup.state.lower())):
+            cities.append(rollup)
+        if rollup.experience_level == experience and (rollup.location == location or not location) and (
+                (rollup.scope == 'all') != bool(location)):
+            # A name can be both a city and a state; the broader rollup wins
+            if summary is None or (rollup.sample_size, rollup.sample_count) > (summary.sample_size, summary.sample_count):
+                summary = rollup
+    return summary, cities
+
+
+def role_salary_summaries(job_role_ids, location=''):
+    """
+    {role ID: (rollup at the location or None, rollup over all locations)}
+    across experience levels, for several roles in one lookup
+    """
+    location = location.strip().lower()
+    match = Q(scope='all')
+    if location:
+        match |= Q(location=location) & ~Q(scope='all')
+
+    summaries = {}
+    for rollup in SalaryRollup.objects.filter(match, job_role_id__in=job_role_ids, experience_level=''):
+        local, overall = summaries.get(rollup.job_role_id, (None, None))
+        if rollup.scope == 'all':
+            overall = rollup
+        elif local is None or (rollup.sample_size, rollup.sample_count) > (local.sample_size, local.sample_count):
+            local = rollup
+        summaries[rollup.job_role_id] = (local, overall)
+    if not location:
+        summaries = {role_id: (overall, overall) for role_id, (_, overall) in summaries.items()}
+    return summaries
+
+
+def roles_with_salaries(location):
+    """IDs of the roles with salary data in a city or state"""
+    return set(
+        SalaryRollup.objects.filter(location=location.strip().lower(), experience_level='')
+        .exclude(scope='all').values_list('job_role_id', flat=True)
+    )
@@ -0,0 +1,172 @@
+# labor_market/search.py
+import re
+
+from django.db import connection as default_connection
+from django.db.models import Case, IntegerField, Value, When
+
+TABLE = 'labor_market_role_search'
+
+# Role kinds share one index; a row's key is role_id * 2 + kind
+KINDS = {'jobrole': 0, 'emergingrole': 1}
+
+# Field weights: title and alternate titles count most, description least
+SQLITE_WEIGHTS = (10.0, 8.0, 4.0, 1.0)  # bm25() column weights, in column order
+POSTGRES_WEIGHTS = ('A', 'A', 'B', 'C')
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {TABLE} USING fts5(
+        title, alternate_titles, skills, description,
+        tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3'
+    )"""
+]
+POSTGRES_CREATE = [
+    f"""CREATE TABLE {TABLE} (
+        key bigint PRIMARY KEY,
+        kind smallint NOT NULL,
+        document tsvector NOT NULL
+    )""",
+    f"CREATE INDEX {TABLE}_document ON {TABLE} USING GIN (document)",
+]
+DROP = [f"DROP TABLE IF EXISTS {TABLE}"]
+
+TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def supports(connection):
+    """Whether the database has a role search index (SQLite FTS5 or Postgres)"""
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def role_document(role):
+    """The indexed fields of a JobRole or EmergingRole"""
+    # EmergingRole has no alternate titles or preferred skills
+    skills = list(role.required_skills or []) + list(getattr(role, 'preferred_skills', None) or [])
+    return (
+        role.title,
+        ' '.join(str(title) for title in getattr(role, 'alternate_titles', None) or []),
+        ' '.join(str(skill) for skill in skills),
+        role.description or '',
+    )
+
+
+def _key(model, pk):
+    return pk * 2 + KINDS[model._meta.model_name]
+
+
+class RoleSearchIndex:
+    """
+    Ranked full-text search over job and emerging roles.
+
+    On SQLite the index is an FTS5 table ranked with bm25(); on Postgres
+    (backend/deployment.py) a tsvector column with a GIN index ranked with
+    ts_rank_cd(). Both weight title and alternate titles above skills and
+    skills above description, and match every query term as a prefix.
+    Rows are kept in step by the post_save/post_delete signals; bulk
+    writes that bypass signals need `rebuild_role_search`.
+    """
+
+    def __init__(self, result_limit=500):
+        self.result_limit = result_limit
+
+    def index(self, roles, connection=None):
+        """Add or replace the index entries of some roles (of one model)"""
+        connection = connection or default_connection
+        roles = list(roles)
+        if not roles or not supports(connection):
+            return
+        model = type(roles[0])
+        keys = [_key(model, role.pk) for role in roles]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(key,) for key in keys])
+                cursor.executemany(
+                    f"INSERT INTO {TABLE} (rowid, title, alternate_titles, skills, description) "
+                    f"VALUES (%s, %s, %s, %s, %s)",
+                    [(key, *role_document(role)) for key, role in zip(keys, roles)]
+                )
+            else:
+                document = ' || '.join(
+                    f"setweight(to_tsvector('english', %s), '{weight}')" for weight in POSTGRES_WEIGHTS
+                )
+                cursor.executemany(
+                    f"INSERT INTO {TABLE} (key, kind, document) VALUES (%s, %s, {document}) "
+                    f"ON CONFLICT (key) DO UPDATE SET document = EXCLUDED.document",
+                    [(key, KINDS[model._meta.model_name], *role_document(role)) for key, role in zip(keys, roles)]
+                )
+
+    def remove(self, model, pk, connection=None):
+        connection = connection or default_connection
+        if not supports(connection):
+            return
+        key_column = 'rowid' if connection.vendor == 'sqlite' else 'key'
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE {key_column} = %s", [_key(model, pk)])
+
+    def rebuild(self, models, batch_size=1000, connection=None):
+        """Re-index every row of the given models; returns the number indexed"""
+        connection = connection or default_connection
+        if not supports(connection):
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+
+        indexed = 0
+        for model in models:
+            batch = []
+            for role in model.objects.order_by('pk').iterator(chunk_size=batch_size):
+                batch.append(role)
+                if len(batch) >= batch_size:
+                    self.index(batch, connection)
+                    indexed += len(batch)
+                    batch = []
+            self.index(batch, connection)
+            indexed += len(batch)
+        return indexed
+
+    def search(self, model, query, limit=None, connection=None):
+        """
+        IDs of the model's rows matching every term of the query (as a
+        prefix), best match first. None if the query has no terms or the
+        database has no index.
+        """
+        connection = connection or default_connection
+        terms = TERM.findall(query.lower())
+        if not terms or not supports(connection):
+            return None
+        kind = KINDS[model._meta.model_name]
+        limit = limit or self.result_limit
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+                cursor.execute(
+                    f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s AND rowid %% 2 = %s "
+                    f"ORDER BY bm25({TABLE}, {weights}) LIMIT %s",
+                    [' '.join(f'"{term}"*' for term in terms), kind, limit]
+                )
+            else:
+                tsquery = ' & '.join(f'{term}:*' for term in terms)
+                cursor.execute(
+                    f"SELECT key FROM {TABLE} WHERE kind = %s AND document @@ to_tsquery('english', %s) "
+                    f"ORDER BY ts_rank_cd(document, to_tsquery('english', %s), 32) DESC LIMIT %s",
+                    [kind, tsquery, tsquery, limit]
+                )
+            return [key // 2 for key, in cursor.fetchall()]
+
+    def filter(self, queryset, query):
+        """
+        The queryset narrowed to the search results in rank order, or None
+        if the index can't answer (no terms, unsupported database)
+        """
+        ids = self.search(queryset.model, query)
+        if ids is None:
+            return None
+        ranking = Case(
+            *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+            output_field=IntegerField()
+        )
+        return queryset.filter(pk__in=ids).order_by(ranking) if ids else queryset.none()
+
+
+role_search = RoleSearchIndex()
@@ -10,6 +10,9 @@ class IndustrySerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_sub_industries_count(self, obj):
+        # Annotated by IndustryViewSet querysets
+        if hasattr(obj, 'sub_industries_count'):
+            return obj.sub_industries_count
         return obj.sub_industries.count()
 
 class JobRoleSerializer(serializers.ModelSerializer):
@@ -31,6 +34,14 @@ class SalaryDataSerializer(serializers.ModelSerializer):
         location_parts = [obj.city, obj.state, obj.country]
         return ', '.join([part for part in location_parts if part])
 
+class SalaryRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SalaryRollup
+        fields = [
+            'country', 'state', 'city', 'experience_level', 'sample_count', 'sample_size', 'min_salary',
+            'p25_salary', 'median_salary', 'p75_salary', 'max_salary', 'avg_salary'
+        ]
+
 class JobMarketTrendSerializer(serializers.ModelSerializer):
     job_title = serializers.CharField(source='job_role.title', read_only=True)
     
@@ -45,6 +56,13 @@ class SkillDemandSerializer(serializers.ModelSerializer):
         model = SkillDemand
         fields = '__all__'
 
+class CanonicalSkillSerializer(serializers.ModelSerializer):
+    aliases = serializers.SlugRelatedField(many=True, read_only=True, slug_field='alias')
+    
+    class Meta:
+        model = CanonicalSkill
+        fields = ['id', 'name', 'category', 'aliases']
+
 class CompanyInsightSerializer(serializers.ModelSerializer):
     industry_name = serializers.CharField(source='industry.name', read_only=True)
     
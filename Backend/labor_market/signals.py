@@ -1,3 +1,64 @@
-from django.db.models.signals import post_save
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.contrib.auth.models import User
\ No newline at end of file
+
+from .models import JobRole, EmergingRole, SalaryData, JobMarketTrend
+from .insight_cache import insight_cache
+from .salary_rollups import refresh_salary_rollups
+from .search import role_search
+from .trend_series import refresh_trend_series
+
+
+@receiver(post_save, sender=JobRole)
+@receiver(post_save, sender=EmergingRole)
+def index_role(sender, instance, raw=False, **kwargs):
+    """Keep the role search index in step with role edits"""
+    if not raw:
+        role_search.index([instance])
+
+
+@receiver(post_delete, sender=JobRole)
+@receiver(post_delete, sender=EmergingRole)
+def unindex_role(sender, instance, **kwargs):
+    role_search.remove(sender, instance.pk)
+
+
+@receiver(post_save, sender=SalaryData)
+@receiver(post_delete, sender=SalaryData)
+def refresh_role_salaries(sender, instance, raw=False, **kwargs):
+    """Recompute the salary rollups of the row's role"""
+    if not raw:
+        refresh_salary_rollups(instance.job_role_id)
+
+
+@receiver(post_save, sender=JobMarketTrend)
+@receiver(post_delete, sender=JobMarketTrend)
+def refresh_role_trends(sender, instance, raw=False, **kwargs):
+    """Repack the trend series of the trend's role"""
+    if not raw:
+        refresh_trend_series(instance.job_role_id)
+
+
+# Per-user and derived tables and the version row itself; their writes
+# don't change the market data
+UNVERSIONED_MODELS = ('careerpathrecommendation', 'salaryrollup', 'trendseries', 'marketdataversion')
+
+
+def bump_data_version(sender, raw=False, **kwargs):
+    """
+    Invalidate the cached insights now and again on commit, dropping
+    anything cached from the old data while the write was in flight
+    """
+    insight_cache.bump()
+    transaction.on_commit(insight_cache.bump)
+
+
+for model in apps.get_app_config('labor_market').get_models(include_auto_created=True):
+    if model._meta.model_name in UNVERSIONED_MODELS:
+        continue
+    if model._meta.auto_created:
+        m2m_changed.connect(bump_data_version, sender=model, dispatch_uid=f'insight_version_{model._meta.model_name}')
+    else:
+        post_save.connect(bump_data_version, sender=model, dispatch_uid=f'insight_version_save_{model._meta.model_name}')
+        post_delete.connect(bump_data_version, sender=model, dispatch_uid=f'insight_version_delete_{model._meta.model_name}')
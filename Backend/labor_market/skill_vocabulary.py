@@ -0,0 +1,145 @@
+# labor_market/skill_vocabulary.py
+import threading
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from utils.skill_vocabulary import SkillVocabulary, normalize_skill
+from .insight_cache import insight_cache
+from .models import CanonicalSkill, SkillAlias, JobRole, SkillDemand
+
+# Seeded with the vocabulary; more can be added as SkillAlias rows
+COMMON_ALIASES = {
+    'JavaScript': ['JS', 'ECMAScript'],
+    'TypeScript': ['TS'],
+    'Python': ['Python3', 'Py'],
+    'PostgreSQL': ['Postgres'],
+    'Kubernetes': ['K8s'],
+    'Machine Learning': ['ML'],
+    'Deep Learning': ['DL'],
+    'Artificial Intelligence': ['AI'],
+    'Natural Language Processing': ['NLP'],
+    'Amazon Web Services': ['AWS'],
+    'Google Cloud Platform': ['GCP'],
+    'User Experience Design': ['UX', 'UX Design'],
+}
+
+
+def new_skill_names(strings, known):
+    """
+    (name, normalized name) for each distinct skill among some strings that
+    isn't in `known` (normalized names and aliases); spellings that
+    normalize alike are one skill, named by their most common spelling
+    """
+    spellings = defaultdict(Counter)
+    for text in strings:
+        text = str(text).strip()
+        normalized = normalize_skill(text)
+        if normalized and normalized not in known:
+            spellings[normalized][text] += 1
+    return [
+        (counts.most_common(1)[0][0], normalized)
+        for normalized, counts in sorted(spellings.items())
+    ]
+
+
+def alias_rows(skill_ids_by_name, known):
+    """(skill ID, alias, normalized alias) of the COMMON_ALIASES not yet known"""
+    rows = []
+    for name, aliases in COMMON_ALIASES.items():
+        skill_id = skill_ids_by_name.get(normalize_skill(name))
+        for alias in aliases:
+            normalized = normalize_skill(alias)
+            if skill_id is not None and normalized not in known:
+                known.add(normalized)
+                rows.append((skill_id, alias, normalized))
+    return rows
+
+
+def labor_market_skill_strings():
+    for required, preferred in JobRole.objects.values_list('required_skills', 'preferred_skills').iterator():
+        yield from required or []
+        yield from preferred or []
+    yield from SkillDemand.objects.values_list('skill_name', flat=True).iterator()
+
+
+def sync_skill_vocabulary(strings, dry_run=False):
+    """
+    Add the skills among some strings that the vocabulary lacks (and the
+    common aliases of the skills it has). Returns the new skill names.
+    """
+    known = set(CanonicalSkill.objects.values_list('normalized_name', flat=True))
+    known.update(SkillAlias.objects.values_list('normalized_alias', flat=True))
+    # Strings spelled like a common alias resolve through the alias
+    common_aliases = {normalize_skill(alias) for aliases in COMMON_ALIASES.values() for alias in aliases}
+    names = new_skill_names([*strings, *COMMON_ALIASES], known | common_aliases)
+    if dry_run:
+        return [name for name, _ in names]
+
+    with transaction.atomic():
+        CanonicalSkill.objects.bulk_create(
+            [CanonicalSkill(name=name, normalized_name=normalized) for name, normalized in names],
+            batch_size=1000
+        )
+        skill_ids = dict(CanonicalSkill.objects.values_list('normalized_name', 'id'))
+        SkillAlias.objects.bulk_create(
+            [
+                SkillAlias(skill_id=skill_id, alias=alias, normalized_alias=normalized)
+                for skill_id, alias, normalized in alias_rows(skill_ids, known | set(skill_ids))
+            ],
+            ignore_conflicts=True
+        )
+    # bulk_create() sends no signals
+    insight_cache.bump()
+    transaction.on_commit(insight_cache.bump)
+    return [name for name, _ in names]
+
+
+class SkillVocabularyCache:
+    """
+    Process-wide canonical skill vocabulary, loaded with two queries and
+    kept until the labor market data version changes
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._vocabulary = None
+
+    def load(self):
+        aliases = defaultdict(list)
+        for skill_id, alias in SkillAlias.objects.values_list('skill_id', 'alias'):
+            aliases[skill_id].append(alias)
+        return SkillVocabulary(
+            (skill_id, name, aliases[skill_id])
+            for skill_id, name in CanonicalSkill.objects.order_by('id').values_list('id', 'name')
+        )
+
+    def current(self):
+        version = insight_cache.version()
+        with self._lock:
+            if self._version != version:
+                self._vocabulary = self.load()
+                self._version = version
+            return self._vocabulary
+
+
+skill_vocabulary = SkillVocabularyCache()
+
+
+def compare_skills(required_skills, user_skills, vocabulary=None):
+    """
+    (matching, missing) required skills against a user's, compared by
+    canonical skill; user input is resolved fuzzily. Pass the vocabulary
+    when comparing against many roles, to check the data version once.
+    """
+    if vocabulary is None:
+        vocabulary = skill_vocabulary.current()
+    have = vocabulary.keys(user_skills, fuzzy=True)
+    matching, missing, seen = [], [], set()
+    for skill in required_skills:
+        key = vocabulary.key(skill)
+        if key not in seen:
+            seen.add(key)
+            (matching if key in have else missing).append(skill)
+    return matching, missing
@@ -0,0 +1,515 @@
+from datetime import date, timedelta
+from decimal import Decimal
+import random
+
+import numpy as np
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from utils.skill_matching import SkillMatchMatrix
+from utils.skill_vocabulary import SkillVocabulary, normalize_skill
+from utils.trend_analytics import TrendAnalyzer, pack_series, unpack_series
+
+from .insight_cache import insight_cache
+from .models import (
+    Industry, JobRole, EmergingRole, SalaryData, SalaryRollup, SkillDemand, CareerPathRecommendation,
+    CanonicalSkill, SkillAlias, JobMarketTrend, TrendSeries, MarketDataVersion
+)
+from .salary_rollups import rebuild_salary_rollups, salary_summary
+from .trend_series import rebuild_trend_series
+from .search import role_search
+
+
+class RoleSearchTest(TestCase):
+    """Role search ranks matches, matches prefixes and follows role edits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        industry = Industry.objects.create(name='Technology', description='Tech')
+        cls.engineer = JobRole.objects.create(
+            title='Machine Learning Engineer', industry=industry, experience_level='mid',
+            description='Builds and ships models', required_skills=['Python', 'PyTorch']
+        )
+        cls.analyst = JobRole.objects.create(
+            title='Data Analyst', industry=industry, experience_level='junior',
+            description='Reports for machine learning teams', required_skills=['SQL']
+        )
+        cls.scientist = JobRole.objects.create(
+            title='Research Scientist', industry=industry, experience_level='senior',
+            description='Publishes papers', alternate_titles=['ML Researcher', 'Applied Scientist'],
+            preferred_skills=['Statistics']
+        )
+        cls.emerging = EmergingRole.objects.create(
+            title='Machine Learning Ops Lead', industry=industry, description='Runs model pipelines',
+            emergence_score=80, growth_projection=30, avg_salary_range='20-30 LPA'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _titles(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return [role['title'] for role in response.data['results']]
+
+    def test_title_matches_rank_above_description_matches(self):
+        titles = self._titles('/api/labor-market/job-roles/?search=machine learning')
+        self.assertEqual(titles, ['Machine Learning Engineer', 'Data Analyst'])
+
+    def test_prefix_alternate_title_and_skill_matches(self):
+        self.assertEqual(self._titles('/api/labor-market/job-roles/?search=research'), ['Research Scientist'])
+        self.assertEqual(self._titles('/api/labor-market/job-roles/?search=applied sci'), ['Research Scientist'])
+        self.assertEqual(self._titles('/api/labor-market/job-roles/?search=pytor'), ['Machine Learning Engineer'])
+        self.assertEqual(self._titles('/api/labor-market/job-roles/?search=statistics'), ['Research Scientist'])
+
+    def test_job_and_emerging_roles_are_searched_separately(self):
+        self.assertEqual(
+            self._titles('/api/labor-market/emerging-roles/?search=machine'), ['Machine Learning Ops Lead']
+        )
+        self.assertEqual(self._titles('/api/labor-market/job-roles/?search=pipelines'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.analyst.title = 'Quantitative Analyst'
+        self.analyst.save()
+        self.assertEqual(role_search.search(JobRole, 'quantitative'), [self.analyst.id])
+        self.assertEqual(role_search.search(JobRole, 'data'), [])
+
+        self.analyst.delete()
+        self.assertEqual(role_search.search(JobRole, 'quantitative'), [])
+
+    def test_rebuild_restores_a_wiped_index(self):
+        JobRole.objects.filter(pk=self.engineer.pk).update(title='Robotics Engineer')
+        self.assertEqual(role_search.search(JobRole, 'robotics'), [])
+
+        call_command('rebuild_role_search', stdout=StringIO())
+        self.assertEqual(role_search.search(JobRole, 'robotics'), [self.engineer.id])
+        self.assertEqual(role_search.search(EmergingRole, 'ops'), [self.emerging.id])
+
+
+class SalaryRollupTest(TestCase):
+    """Salary rollups weight by sample size and follow salary data edits"""
+
+    # (state, city, experience, median, sample size)
+    SALARIES = [
+        ('Maharashtra', 'Pune', 'junior', 40000, 10),
+        ('Maharashtra', 'Pune', 'senior', 90000, 30),
+        ('Maharashtra', 'Mumbai', 'junior', 50000, 50),
+        ('Karnataka', 'Bengaluru', 'senior', 120000, 0),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        industry = Industry.objects.create(name='Technology', description='Tech')
+        cls.role = JobRole.objects.create(
+            title='Backend Developer', industry=industry, description='APIs', experience_level='mid'
+        )
+        for state, city, experience, median, sample_size in cls.SALARIES:
+            SalaryData.objects.create(
+                job_role=cls.role, country='India', state=state, city=city, experience_level=experience,
+                min_salary=median - 10000, max_salary=median + 10000, median_salary=median, avg_salary=median,
+                data_source='survey', last_updated=date.today(), sample_size=sample_size
+            )
+
+    def test_percentiles_are_weighted_by_sample_size(self):
+        summary, _ = salary_summary(self.role.id)
+        self.assertEqual(summary.sample_count, 4)
+        self.assertEqual(summary.sample_size, 90)
+        # Weights 10, 50, 30 and 1 over medians 40k, 50k, 90k and 120k
+        self.assertEqual(summary.p25_salary, Decimal('50000'))
+        self.assertEqual(summary.median_salary, Decimal('50000'))
+        self.assertEqual(summary.p75_salary, Decimal('90000'))
+        self.assertEqual(summary.min_salary, Decimal('30000'))
+        self.assertEqual(summary.max_salary, Decimal('130000'))
+        self.assertEqual(summary.avg_median, Decimal('75000'))
+
+    def test_location_and_experience_lookup(self):
+        summary, cities = salary_summary(self.role.id, location='maharashtra', experience='junior')
+        self.assertEqual((summary.scope, summary.sample_count), ('state', 2))
+        self.assertEqual(sorted(rollup.city for rollup in cities), ['Mumbai', 'Pune'])
+
+        summary, cities = salary_summary(self.role.id, location='Pune')
+        self.assertEqual((summary.scope, summary.median_salary), ('city', Decimal('90000')))
+        self.assertEqual(sorted(rollup.experience_level for rollup in cities), ['junior', 'senior'])
+
+        self.assertEqual(salary_summary(self.role.id, location='Delhi'), (None, []))
+
+    def test_rollups_follow_salary_data_writes(self):
+        bengaluru = SalaryData.objects.get(city='Bengaluru')
+        bengaluru.sample_size = 200
+        bengaluru.save()
+        self.assertEqual(salary_summary(self.role.id)[0].median_salary, Decimal('120000'))
+
+        bengaluru.delete()
+        summary, _ = salary_summary(self.role.id, breakdown=False)
+        self.assertEqual((summary.sample_count, summary.max_salary), (3, Decimal('100000')))
+        self.assertEqual(salary_summary(self.role.id, location='Karnataka'), (None, []))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        fields = ['scope', 'location', 'experience_level', 'sample_count', 'median_salary', 'p75_salary']
+        incremental = list(SalaryRollup.objects.order_by('pk').values_list(*fields))
+
+        SalaryRollup.objects.all().delete()
+        self.assertEqual(rebuild_salary_rollups(), (1, len(incremental)))
+        self.assertCountEqual(SalaryRollup.objects.values_list(*fields), incremental)
+
+    def test_salary_insights_endpoint(self):
+        response = APIClient().get(
+            f'/api/labor-market/job-roles/{self.role.id}/salary_insights/?location=Maharashtra&experience=senior'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['median_salary'], 90000.0)
+        self.assertEqual(response.data['sample_size'], 30)
+        self.assertEqual([row['city'] for row in response.data['data']], ['Pune'])
+
+
+class InsightCacheTest(TestCase):
+    """Insight endpoints are served from the cache until market data changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.industry = Industry.objects.create(name='Technology', description='Tech', growth_rate=5)
+        cls.role = JobRole.objects.create(
+            title='Backend Developer', industry=cls.industry, description='APIs', experience_level='mid'
+        )
+        cls.skill = SkillDemand.objects.create(
+            skill_name='Python', category='Programming', trending_rank=1, last_updated=date.today()
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _get(self, path):
+        """Response data and the number of queries other than the data version read"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        version_table = MarketDataVersion._meta.db_table
+        return response.data, sum(1 for query in queries.captured_queries if version_table not in query['sql'])
+
+    def test_repeat_requests_skip_the_database(self):
+        first, queries = self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.assertGreater(queries, 0)
+        second, queries = self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.assertEqual((second, queries), (first, 0))
+
+        # Query parameters that change the result get their own entry
+        filtered, queries = self._get('/api/labor-market/skill-demand/trending_skills/?region=EU')
+        self.assertEqual((filtered, bool(queries)), ([], True))
+
+    def test_market_data_writes_invalidate(self):
+        self._get('/api/labor-market/skill-demand/trending_skills/')
+        SkillDemand.objects.create(skill_name='Rust', category='Programming', trending_rank=2, last_updated=date.today())
+        skills, queries = self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.assertGreater(queries, 0)
+        self.assertEqual([skill['skill_name'] for skill in skills], ['Python', 'Rust'])
+
+        self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.skill.related_jobs.add(self.role)
+        skills, _ = self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.assertEqual(skills[0]['related_jobs'], [self.role.id])
+
+    def test_version_bumps_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.industry.save()
+        version = insight_cache.version()
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(insight_cache.version(), version)
+
+    def test_bump_from_another_process_is_seen(self):
+        # What a bump in another worker or a management command writes; their
+        # local memory caches are invisible to this process
+        self.assertFalse(insight_cache.shared)
+        self._get('/api/labor-market/skill-demand/trending_skills/')
+        SkillDemand.objects.filter(pk=self.skill.pk).update(skill_name='Python 3')
+        MarketDataVersion.objects.filter(pk=1).update(version='another-process')
+
+        skills, queries = self._get('/api/labor-market/skill-demand/trending_skills/')
+        self.assertGreater(queries, 0)
+        self.assertEqual(skills[0]['skill_name'], 'Python 3')
+
+    def test_user_recommendations_do_not_invalidate(self):
+        user = User.objects.create_user(username='learner', password='pass')
+        version = insight_cache.version()
+        CareerPathRecommendation.objects.create(
+            user=user, recommended_role=self.role, match_score=50, estimated_transition_time='3-6 months',
+            salary_potential='N/A', market_demand_score=50, reasoning='Generated'
+        )
+        self.assertEqual(insight_cache.version(), version)
+
+
+class SkillMatchMatrixTest(SimpleTestCase):
+    """Vectorized match scores agree with the per-role set arithmetic"""
+
+    def test_scores_match_set_intersection(self):
+        rng = random.Random(7)
+        vocabulary = [f'skill{i}' for i in range(40)]
+        role_skills = [rng.sample(vocabulary, rng.randint(0, 8)) for _ in range(200)]
+        matrix = SkillMatchMatrix(range(1, 201), role_skills)
+
+        user_skills = rng.sample(vocabulary, 10) + ['unknown']
+        for score, skills in zip(matrix.scores(user_skills), role_skills):
+            required = set(skills)
+            expected = round(len(required & set(user_skills)) / len(required) * 100, 2) if required else 50.0
+            self.assertEqual(score, expected)
+
+    def test_top_k_orders_by_score_then_role_id(self):
+        matrix = SkillMatchMatrix(
+            [5, 3, 9, 4],
+            [['Python', 'SQL'], ['Python'], ['Go'], ['Python', 'Go', 'SQL', 'Rust']]
+        )
+        self.assertEqual(matrix.top_k(['Python', 'SQL'], 3), [(3, 100.0), (5, 100.0), (4, 50.0)])
+        candidates = [False, True, True, False]
+        self.assertEqual(matrix.top_k(['Go'], 5, candidates), [(9, 100.0), (3, 0.0)])
+
+
+class RecommendationGenerationTest(TestCase):
+    """generate_recommendations keeps only the best matches"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='learner', password='pass')
+        cls.industry = Industry.objects.create(name='Technology', description='Tech')
+        cls.current = JobRole.objects.create(
+            title='Junior Developer', industry=cls.industry, description='Code', experience_level='junior',
+            required_skills=['Python']
+        )
+        cls.roles = [
+            JobRole.objects.create(
+                title=f'Role {i}', industry=cls.industry, description='Generated', experience_level='mid',
+                required_skills=['Python', 'SQL', f'Tool {i}'][:1 + i % 3]
+            )
+            for i in range(15)
+        ]
+        SalaryData.objects.create(
+            job_role=cls.roles[0], country='India', state='Maharashtra', city='Pune', experience_level='mid',
+            min_salary=1000, max_salary=3000, median_salary=2000, avg_salary=2000, data_source='survey',
+            last_updated=date.today(), sample_size=5
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _generate(self, **data):
+        response = self.client.post(
+            '/api/labor-market/recommendations/generate_recommendations/', data, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_only_the_top_matches_are_saved(self):
+        recommendations = self._generate(current_role_id=self.current.id, skills=['Python', 'SQL'])
+        self.assertEqual(len(recommendations), 10)
+        self.assertEqual(CareerPathRecommendation.objects.filter(user=self.user).count(), 10)
+
+        scores = [recommendation['match_score'] for recommendation in recommendations]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(scores[:10], [100.0] * 10)
+        self.assertNotIn(self.current.id, [recommendation['recommended_role'] for recommendation in recommendations])
+
+    def test_preferred_location_and_salary_potential(self):
+        recommendations = self._generate(skills=['Python'], preferred_location='pune')
+        self.assertEqual([recommendation['recommended_role'] for recommendation in recommendations], [self.roles[0].id])
+        self.assertEqual(recommendations[0]['salary_potential'], '$2,000 average')
+        self.assertEqual(recommendations[0]['market_demand_score'], 5)
+
+    def test_role_edits_reach_the_matcher(self):
+        self._generate(skills=['Kotlin'])
+        self.roles[4].required_skills = ['Kotlin']
+        self.roles[4].save()
+        recommendations = self._generate(skills=['Kotlin'])
+        self.assertEqual(recommendations[0]['recommended_role'], self.roles[4].id)
+        self.assertEqual(recommendations[0]['match_score'], 100.0)
+
+
+class SkillVocabularyTest(SimpleTestCase):
+    """Skill strings resolve to canonical IDs exactly, by alias or fuzzily"""
+
+    def setUp(self):
+        self.vocabulary = SkillVocabulary([
+            (1, 'JavaScript', ['JS', 'ECMAScript']),
+            (2, 'Java', []),
+            (3, 'Node.js', []),
+            (4, 'PostgreSQL', ['Postgres']),
+            (5, 'C++', []),
+            (6, 'C#', []),
+        ])
+
+    def test_exact_and_alias_resolution(self):
+        self.assertEqual(normalize_skill(' Node JS '), 'nodejs')
+        for text, skill_id in [('javascript', 1), ('Javascript', 1), ('js', 1), ('NodeJS', 3),
+                               ('node js', 3), ('postgres', 4), ('c++', 5), ('C#', 6)]:
+            self.assertEqual(self.vocabulary.resolve(text, fuzzy=False), skill_id, text)
+        self.assertIsNone(self.vocabulary.resolve('c', fuzzy=False))
+
+    def test_fuzzy_resolution(self):
+        self.assertEqual(self.vocabulary.resolve('Javscript'), 1)
+        self.assertEqual(self.vocabulary.resolve('PostgreSQl db'), 4)
+        self.assertIsNone(self.vocabulary.resolve('Rust'))
+        matches = self.vocabulary.search('javascrip', limit=3)
+        self.assertEqual(matches[0][0], 1)
+        self.assertNotIn(2, [skill_id for skill_id, _ in matches])
+
+    def test_unknown_skills_key_by_normalized_text(self):
+        self.assertEqual(self.vocabulary.keys(['JavaScript', 'js', 'Rust', 'rust']), {1, 'rust'})
+
+
+class CanonicalSkillTest(TestCase):
+    """Skill comparisons go through the canonical vocabulary"""
+
+    @classmethod
+    def setUpTestData(cls):
+        industry = Industry.objects.create(name='Technology', description='Tech')
+        cls.role = JobRole.objects.create(
+            title='Frontend Developer', industry=industry, description='UI', experience_level='mid',
+            required_skills=['Javascript', 'React', 'HTML/CSS', 'Kubernetes']
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_skill_gap_matches_spelling_variants_and_aliases(self):
+        response = self.client.post('/api/labor-market/recommendations/skill_gap_analysis/', {
+            'target_role_id': self.role.id, 'current_skills': ['JavaScript', 'html css', 'k8s', 'Reakt']
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['matching_skills'], ['Javascript', 'HTML/CSS', 'Kubernetes'])
+        self.assertEqual(response.data['missing_skills'], ['React'])
+        self.assertEqual(response.data['gap_percentage'], 25.0)
+
+    def test_sync_adds_skills_and_resolve_finds_them(self):
+        call_command('sync_skill_vocabulary', stdout=StringIO())
+        names = set(CanonicalSkill.objects.values_list('name', flat=True))
+        self.assertTrue({'React', 'HTML/CSS', 'Kubernetes', 'JavaScript'} <= names)
+        self.assertFalse(CanonicalSkill.objects.filter(normalized_name='javascript').count() > 1)
+        self.assertTrue(SkillAlias.objects.filter(alias='K8s', skill__name='Kubernetes').exists())
+
+        response = self.client.get('/api/labor-market/skills/resolve/?q=Reactjs')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['name'], 'React')
+
+        # A second run finds nothing new
+        output = StringIO()
+        call_command('sync_skill_vocabulary', '--dry-run', stdout=output)
+        self.assertIn('Found 0 new skills', output.getvalue())
+
+
+def _monthly(start, values):
+    """Series with one point on the 15th of each month from (year, month)"""
+    year, month = start
+    days = []
+    for offset in range(len(values)):
+        days.append((date(year + (month - 1 + offset) // 12, (month - 1 + offset) % 12 + 1, 15) - date(1970, 1, 1)).days)
+    return unpack_series(*pack_series(days, values))
+
+
+class TrendAnalyzerTest(SimpleTestCase):
+    """Matrix analytics agree with straightforward per-series arithmetic"""
+
+    def test_downsampling_rolling_average_and_growth(self):
+        first = _monthly((2024, 1), [10, 20, 30, 40, 50, 60])
+        # Two points in March 2024 average out; February and April are missing
+        days = np.array([(date(2024, 1, 5) - date(1970, 1, 1)).days, (date(2024, 3, 1) - date(1970, 1, 1)).days,
+                         (date(2024, 3, 31) - date(1970, 1, 1)).days, (date(2024, 5, 2) - date(1970, 1, 1)).days])
+        second = (days.astype('<i4'), np.array([4.0, 6.0, 10.0, 16.0]))
+
+        result = TrendAnalyzer(months=6, window=2, horizon=2).analyze([first, second])
+        self.assertEqual(result['months'], ['2024-01', '2024-02', '2024-03', '2024-04', '2024-05', '2024-06'])
+        self.assertEqual(result['forecast_months'], ['2024-07', '2024-08'])
+        np.testing.assert_allclose(result['values'][1], [4, np.nan, 8, np.nan, 16, np.nan])
+        np.testing.assert_allclose(result['rolling_average'][0], [10, 15, 25, 35, 45, 55])
+        np.testing.assert_allclose(result['rolling_average'][1], [4, 4, 8, 8, 16, 16])
+        # Growth is taken over the forward-filled values
+        np.testing.assert_allclose(result['growth_rate'][1], [np.nan, 0, 100, 0, 100, 0])
+
+        np.testing.assert_allclose(result['slope'], [10, np.polyfit([0, 2, 4], [4, 8, 16], 1)[0]])
+        np.testing.assert_allclose(result['forecast'][0], [70, 80])
+
+    def test_seasonal_forecast(self):
+        seasonal = [5, -3, 0, 2, -4, 1, 3, -2, 0, -1, 4, -5]
+        values = [100 + 2 * t + seasonal[t % 12] for t in range(36)]
+        result = TrendAnalyzer(months=36, window=3, horizon=12).analyze([_monthly((2022, 1), values)])
+        expected = [100 + 2 * t + seasonal[t % 12] for t in range(36, 48)]
+        np.testing.assert_allclose(result['forecast'][0], expected, atol=1e-6)
+
+    def test_empty_and_sparse_series(self):
+        result = TrendAnalyzer(months=4, horizon=2).analyze([_monthly((2024, 1), [7]), _monthly((2024, 1), [])])
+        self.assertEqual(result['slope'][0], 0)
+        np.testing.assert_allclose(result['forecast'][0], [7, 7])
+        self.assertTrue(np.isnan(result['forecast'][1]).all())
+
+
+class TrendSeriesTest(TestCase):
+    """Trend series follow trend writes and feed the analytics endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        industry = Industry.objects.create(name='Technology', description='Tech')
+        cls.roles = [
+            JobRole.objects.create(title=f'Role {i}', industry=industry, description='Generated', experience_level='mid')
+            for i in range(2)
+        ]
+        for i, role in enumerate(cls.roles):
+            JobMarketTrend.objects.create(
+                job_role=role, trend_type='demand', period_start=date(2024, 1, 1), period_end=date(2024, 12, 15),
+                trend_value=100 + i, growth_rate=0, trend_direction='up', confidence_score=0.9, insights='Generated',
+                data_points=[{'date': f'2024-{month:02d}-15', 'value': month * (i + 1)} for month in range(1, 12)]
+                + [['not a date', 1], {'value': 3}]
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_series_are_packed_in_date_order(self):
+        series = TrendSeries.objects.get(job_role=self.roles[0], trend_type='demand')
+        days, values = unpack_series(series.days, series.values)
+        self.assertEqual(series.point_count, 12)
+        self.assertTrue((np.diff(days) > 0).all())
+        self.assertEqual(values.tolist(), [float(month) for month in range(1, 12)] + [100.0])
+
+    def test_analytics_endpoint(self):
+        response = APIClient().get('/api/labor-market/job-roles/trend_analytics/?months=12&window=2&horizon=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['months'][0], '2024-01')
+        self.assertEqual(response.data['forecast_months'], ['2025-01', '2025-02', '2025-03'])
+        self.assertEqual([series['job_role'] for series in response.data['series']], [role.id for role in self.roles])
+        self.assertEqual(response.data['series'][1]['values'][:3], [2.0, 4.0, 6.0])
+        self.assertEqual(response.data['series'][0]['rolling_average'][1], 1.5)
+
+        invalid = APIClient().get('/api/labor-market/job-roles/trend_analytics/?trend_type=weather')
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_trend_writes_refresh_the_series_and_the_cached_analytics(self):
+        client = APIClient()
+        path = f'/api/labor-market/job-roles/trend_analytics/?job_role={self.roles[0].id}&months=13'
+        response = client.get(path)
+        self.assertEqual(response.data['months'][-1], '2024-12')
+        self.assertEqual(response.data['series'][0]['values'][-1], 100.0)
+
+        JobMarketTrend.objects.create(
+            job_role=self.roles[0], trend_type='demand', period_start=date(2024, 12, 16),
+            period_end=date(2025, 1, 15), trend_value=50, growth_rate=0, trend_direction='down',
+            confidence_score=0.9, insights='Generated'
+        )
+        response = client.get(path)
+        self.assertEqual(response.data['months'][-1], '2025-01')
+        self.assertEqual(response.data['series'][0]['values'][-1], 50.0)
+
+        JobMarketTrend.objects.filter(job_role=self.roles[0]).delete()
+        self.assertEqual(client.get(path).data['series'], [])
+
+    def test_rebuild(self):
+        TrendSeries.objects.all().delete()
+        self.assertEqual(rebuild_trend_series(), 2)
+        self.assertEqual(TrendSeries.objects.get(job_role=self.roles[1]).point_count, 12)
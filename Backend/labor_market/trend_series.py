@@ -0,0 +1,119 @@
+# labor_market/trend_series.py
+import math
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+
+from utils.trend_analytics import TrendAnalyzer, pack_series, unpack_series
+from .models import JobMarketTrend, TrendSeries
+
+EPOCH = date(1970, 1, 1)
+
+TREND_FIELDS = ('trend_type', 'period_end', 'trend_value', 'data_points')
+
+
+def _day(value):
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return (value - EPOCH).days
+
+
+def trend_points(trend):
+    """
+    (day, value) points of a trend (a dict with TREND_FIELDS): its value at
+    the period end, and its data_points given as {'date': ..., 'value': ...}
+    or [date, value]; malformed points are skipped
+    """
+    points = [(_day(trend['period_end']), trend['trend_value'])]
+    for point in trend['data_points'] or []:
+        try:
+            if isinstance(point, dict):
+                day, value = _day(point['date']), float(point['value'])
+            else:
+                day, value = _day(point[0]), float(point[1])
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if math.isfinite(value):
+            points.append((day, value))
+    return points
+
+
+def series_fields(trends):
+    """TrendSeries field values per trend type for one role's trends"""
+    by_type = defaultdict(dict)
+    for trend in trends:
+        # Later points on the same day replace earlier ones
+        by_type[trend['trend_type']].update(trend_points(trend))
+
+    fields = {}
+    for trend_type, points in by_type.items():
+        days = sorted(points)
+        packed_days, packed_values = pack_series(days, [points[day] for day in days])
+        fields[trend_type] = {'days': packed_days, 'values': packed_values, 'point_count': len(days)}
+    return fields
+
+
+def refresh_trend_series(job_role_id):
+    """Repack one role's series, after its trends changed"""
+    trends = JobMarketTrend.objects.filter(job_role_id=job_role_id).order_by('period_end', 'id')
+    fields = series_fields(trends.values(*TREND_FIELDS))
+    with transaction.atomic():
+        TrendSeries.objects.filter(job_role_id=job_role_id).delete()
+        TrendSeries.objects.bulk_create(
+            TrendSeries(job_role_id=job_role_id, trend_type=trend_type, **values)
+            for trend_type, values in fields.items()
+        )
+
+
+def rebuild_trend_series(batch_size=1000):
+    """Repack every role's series; returns the number of series written"""
+    by_role = defaultdict(list)
+    trends = JobMarketTrend.objects.order_by('period_end', 'id').values('job_role_id', *TREND_FIELDS)
+    for trend in trends.iterator(chunk_size=2000):
+        by_role[trend['job_role_id']].append(trend)
+
+    series = [
+        TrendSeries(job_role_id=job_role_id, trend_type=trend_type, **values)
+        for job_role_id, role_trends in by_role.items()
+        for trend_type, values in series_fields(role_trends).items()
+    ]
+    with transaction.atomic():
+        TrendSeries.objects.all().delete()
+        TrendSeries.objects.bulk_create(series, batch_size=batch_size)
+    return len(series)
+
+
+def _floats(values, places=4):
+    return [None if math.isnan(value) else round(value, places) for value in values.tolist()]
+
+
+def trend_analytics(trend_type, months=24, window=3, horizon=6, job_role_id=None):
+    """
+    Monthly analytics and forecasts of every role's series of a trend
+    type (or one role's), from one query and one TrendAnalyzer pass
+    """
+    rows = TrendSeries.objects.filter(trend_type=trend_type, point_count__gt=0).order_by('job_role_id')
+    if job_role_id is not None:
+        rows = rows.filter(job_role_id=job_role_id)
+    rows = list(rows.values_list('job_role_id', 'job_role__title', 'days', 'values'))
+
+    analyzer = TrendAnalyzer(months=months, window=window, horizon=horizon)
+    result = analyzer.analyze([unpack_series(days, values) for _, _, days, values in rows])
+    return {
+        'trend_type': trend_type,
+        'months': result['months'],
+        'forecast_months': result['forecast_months'],
+        'series': [
+            {
+                'job_role': job_role_id,
+                'job_title': title,
+                'values': _floats(result['values'][i]),
+                'rolling_average': _floats(result['rolling_average'][i]),
+                'growth_rate': _floats(result['growth_rate'][i], places=2),
+                'slope': _floats(result['slope'][i:i + 1])[0],
+                'forecast': _floats(result['forecast'][i]),
+            }
+            for i, (job_role_id, title, _, _) in enumerate(rows)
+        ]
+    }
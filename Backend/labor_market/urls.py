@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import (IndustryViewSet, JobRoleViewSet, SkillDemandViewSet,
+from .views import (IndustryViewSet, JobRoleViewSet, SkillDemandViewSet, CanonicalSkillViewSet,
                     CompanyInsightViewSet, 
                     EmergingRoleViewSet, CareerRecommendationViewSet)
 
@@ -8,6 +8,7 @@ router = DefaultRouter()
 router.register(r'industries', IndustryViewSet, basename='industry')
 router.register(r'job-roles', JobRoleViewSet, basename='job-role')
 router.register(r'skill-demand', SkillDemandViewSet, basename='skill-demand')
+router.register(r'skills', CanonicalSkillViewSet, basename='canonical-skill')
 router.register(r'companies', CompanyInsightViewSet, basename='company-insight')
 #router.register(r'reports', JobMarketReportViewSet, basename='market-report')
 router.register(r'emerging-roles', EmergingRoleViewSet, basename='emerging-role')
@@ -3,23 +3,38 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Q, Avg, Count
+from django.db.models import Q, Avg, Count, Max, Min
 from .models import *
 from .serializers import *
+from .insight_cache import cached_insight
+from .role_matching import role_matcher
+from .salary_rollups import role_salary_summaries, roles_with_salaries, salary_summary
+from .search import role_search
+from .skill_vocabulary import compare_skills, skill_vocabulary
+from .trend_series import trend_analytics
+
+
+def search_roles(queryset, search):
+    """Ranked index search, or a substring match where the database has no index"""
+    ranked = role_search.filter(queryset, search)
+    if ranked is not None:
+        return ranked
+    return queryset.filter(Q(title__icontains=search) | Q(description__icontains=search))
 
 class IndustryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Industry.objects.all()
+    queryset = Industry.objects.annotate(sub_industries_count=Count('sub_industries')).order_by('name')
     serializer_class = IndustrySerializer
     permission_classes = [AllowAny]
     
     @action(detail=True, methods=['get'])
     def job_roles(self, request, pk=None):
         industry = self.get_object()
-        roles = industry.job_roles.all()
+        roles = industry.job_roles.select_related('industry')
         serializer = JobRoleSerializer(roles, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('industries_trending')
     def trending(self, request):
         industries = self.queryset.order_by('-growth_rate')[:10]
         serializer = self.get_serializer(industries, many=True)
@@ -28,17 +43,20 @@ class IndustryViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'])
     def sub_industries(self, request, pk=None):
         industry = self.get_object()
-        subs = industry.sub_industries.all()
+        subs = industry.sub_industries.annotate(sub_industries_count=Count('sub_industries')).order_by('name')
         serializer = self.get_serializer(subs, many=True)
         return Response(serializer.data)
 
 class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = JobRole.objects.all()
+    queryset = JobRole.objects.select_related('industry')
     serializer_class = JobRoleSerializer
     permission_classes = [AllowAny]
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.action != 'list':
+            # salary_insights reads ?location= and ?experience= itself
+            return queryset
         industry = self.request.query_params.get('industry')
         search = self.request.query_params.get('search')
         experience = self.request.query_params.get('experience')
@@ -46,40 +64,35 @@ class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
         
         if industry:
             queryset = queryset.filter(industry_id=industry)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(description__icontains=search)
-            )
         if experience:
             queryset = queryset.filter(experience_level=experience)
         if remote == 'true':
             queryset = queryset.filter(remote_friendly=True)
+        if search:
+            queryset = search_roles(queryset, search)
         
         return queryset
     
     @action(detail=True, methods=['get'])
     def salary_insights(self, request, pk=None):
         job_role = self.get_object()
-        location = request.query_params.get('location')
-        experience = request.query_params.get('experience')
-        
-        salary_query = job_role.salary_data.all()
-        
-        if location:
-            salary_query = salary_query.filter(
-                Q(city__icontains=location) | 
-                Q(state__icontains=location)
-            )
-        if experience:
-            salary_query = salary_query.filter(experience_level=experience)
+        summary, breakdown = salary_summary(
+            job_role.id,
+            location=request.query_params.get('location', ''),
+            experience=request.query_params.get('experience', '')
+        )
         
-        if salary_query.exists():
+        if summary is not None:
             stats = {
-                'min_salary': float(salary_query.order_by('min_salary').first().min_salary),
-                'max_salary': float(salary_query.order_by('-max_salary').first().max_salary),
-                'avg_median': float(salary_query.aggregate(avg=Avg('median_salary'))['avg']),
-                'data': SalaryDataSerializer(salary_query, many=True).data
+                'min_salary': float(summary.min_salary),
+                'max_salary': float(summary.max_salary),
+                'avg_median': float(summary.avg_median),
+                'p25_salary': float(summary.p25_salary),
+                'median_salary': float(summary.median_salary),
+                'p75_salary': float(summary.p75_salary),
+                'sample_count': summary.sample_count,
+                'sample_size': summary.sample_size,
+                'data': SalaryRollupSerializer(breakdown, many=True).data
             }
         else:
             stats = {'message': 'No salary data available', 'data': []}
@@ -89,10 +102,29 @@ class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'])
     def market_trends(self, request, pk=None):
         job_role = self.get_object()
-        trends = job_role.market_trends.all()[:12]
+        trends = job_role.market_trends.select_related('job_role')[:12]
         serializer = JobMarketTrendSerializer(trends, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    @cached_insight('trend_analytics', params=('trend_type', 'job_role', 'months', 'window', 'horizon'))
+    def trend_analytics(self, request):
+        trend_type = request.query_params.get('trend_type', 'demand')
+        if trend_type not in dict(JobMarketTrend.TREND_TYPES):
+            return Response({'error': 'Unknown trend_type'}, status=400)
+        try:
+            job_role = request.query_params.get('job_role')
+            job_role = int(job_role) if job_role else None
+            months = min(max(int(request.query_params.get('months', 24)), 2), 120)
+            window = min(max(int(request.query_params.get('window', 3)), 1), 24)
+            horizon = min(max(int(request.query_params.get('horizon', 6)), 0), 24)
+        except ValueError:
+            return Response({'error': 'job_role, months, window and horizon must be integers'}, status=400)
+        
+        return Response(trend_analytics(
+            trend_type, months=months, window=window, horizon=horizon, job_role_id=job_role
+        ))
+    
     @action(detail=True, methods=['get'])
     def required_skills(self, request, pk=None):
         job_role = self.get_object()
@@ -105,7 +137,7 @@ class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def popular_roles(self, request):
         # Get roles with most salary data entries (indicator of popularity)
-        roles = JobRole.objects.annotate(
+        roles = self.queryset.annotate(
             salary_count=Count('salary_data')
         ).order_by('-salary_count')[:20]
         
@@ -113,11 +145,12 @@ class JobRoleViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 class SkillDemandViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SkillDemand.objects.all()
+    queryset = SkillDemand.objects.prefetch_related('related_jobs')
     serializer_class = SkillDemandSerializer
     permission_classes = [AllowAny]
     
     @action(detail=False, methods=['get'])
+    @cached_insight('trending_skills', params=('region', 'category'))
     def trending_skills(self, request):
         region = request.query_params.get('region')
         category = request.query_params.get('category')
@@ -133,28 +166,51 @@ class SkillDemandViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('fastest_growing_skills')
     def fastest_growing(self, request):
         skills = self.queryset.order_by('-growth_rate')[:15]
         serializer = self.get_serializer(skills, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('high_paying_skills')
     def high_paying(self, request):
         skills = self.queryset.order_by('-avg_salary_premium')[:15]
         serializer = self.get_serializer(skills, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('skills_by_category')
     def by_category(self, request):
-        categories = self.queryset.values('category').annotate(
+        categories = SkillDemand.objects.values('category').annotate(
             skill_count=Count('id'),
             avg_growth=Avg('growth_rate')
         ).order_by('-skill_count')
         
         return Response(list(categories))
 
+class CanonicalSkillViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = CanonicalSkill.objects.prefetch_related('aliases')
+    serializer_class = CanonicalSkillSerializer
+    permission_classes = [AllowAny]
+    
+    @action(detail=False, methods=['get'])
+    def resolve(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), 20)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=400)
+        
+        vocabulary = skill_vocabulary.current()
+        matches = vocabulary.search(query, limit=limit)
+        return Response([
+            {'id': skill_id, 'name': vocabulary.names[skill_id], 'similarity': round(similarity, 3)}
+            for skill_id, similarity in matches
+        ])
+
 class CompanyInsightViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = CompanyInsight.objects.all()
+    queryset = CompanyInsight.objects.select_related('industry')
     serializer_class = CompanyInsightSerializer
     permission_classes = [AllowAny]
     
@@ -177,6 +233,7 @@ class CompanyInsightViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
     
     @action(detail=False, methods=['get'])
+    @cached_insight('top_hiring_companies')
     def top_hiring(self, request):
         companies = self.queryset.order_by('-active_job_openings')[:20]
         serializer = self.get_serializer(companies, many=True)
@@ -193,11 +250,21 @@ class CompanyInsightViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 class EmergingRoleViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = EmergingRole.objects.all()
+    queryset = EmergingRole.objects.select_related('industry').prefetch_related('related_roles')
     serializer_class = EmergingRoleSerializer
     permission_classes = [AllowAny]
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search = self.request.query_params.get('search')
+        
+        if search:
+            queryset = search_roles(queryset, search)
+        
+        return queryset
+    
     @action(detail=False, methods=['get'])
+    @cached_insight('top_emerging_roles', params=('industry',))
     def top_emerging(self, request):
         industry = request.query_params.get('industry')
         
@@ -210,6 +277,7 @@ class EmergingRoleViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('highest_growth_roles')
     def highest_growth(self, request):
         roles = self.queryset.order_by('-growth_projection')[:15]
         serializer = self.get_serializer(roles, many=True)
@@ -219,6 +287,9 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
     serializer_class = CareerPathRecommendationSerializer
     permission_classes = [IsAuthenticated]
     
+    # Recommendations kept per generate_recommendations call
+    RECOMMENDATION_COUNT = 10
+    
     def get_permissions(self):
         """
         Allow unauthenticated access to market_insights and skill_gap_analysis
@@ -228,7 +299,9 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
     
     def get_queryset(self):
-        return CareerPathRecommendation.objects.filter(user=self.request.user)
+        return CareerPathRecommendation.objects.filter(user=self.request.user).select_related(
+            'user', 'current_role', 'recommended_role'
+        )
     
     @action(detail=False, methods=['post'])
     def generate_recommendations(self, request):
@@ -251,11 +324,12 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cached_insight('market_insights')
     def market_insights(self, request):
-        trending_skills = SkillDemand.objects.order_by('trending_rank')[:10]
-        emerging_roles = EmergingRole.objects.order_by('-emergence_score')[:10]
-        growing_industries = Industry.objects.order_by('-growth_rate')[:10]
-        top_companies = CompanyInsight.objects.order_by('-active_job_openings')[:10]
+        trending_skills = SkillDemandViewSet.queryset.order_by('trending_rank')[:10]
+        emerging_roles = EmergingRoleViewSet.queryset.order_by('-emergence_score')[:10]
+        growing_industries = IndustryViewSet.queryset.order_by('-growth_rate')[:10]
+        top_companies = CompanyInsightViewSet.queryset.order_by('-active_job_openings')[:10]
         
         return Response({
             'trending_skills': SkillDemandSerializer(trending_skills, many=True).data,
@@ -274,13 +348,10 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
         except JobRole.DoesNotExist:
             return Response({'error': 'Target role not found'}, status=404)
         
-        required_skills = set(target_role.required_skills)
-        user_skill_set = set(user_skills)
+        matching_skills, missing_skills = compare_skills(target_role.required_skills, user_skills)
+        required_count = len(matching_skills) + len(missing_skills)
         
-        missing_skills = list(required_skills - user_skill_set)
-        matching_skills = list(required_skills.intersection(user_skill_set))
-        
-        gap_percentage = (len(missing_skills) / len(required_skills)) * 100 if required_skills else 0
+        gap_percentage = (len(missing_skills) / required_count) * 100 if required_count else 0
         
         return Response({
             'target_role': target_role.title,
@@ -292,27 +363,27 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
         })
     
     def _generate_recommendations(self, user, current_role, user_skills, target_salary, location):
-        recommendations = []
-        
-        if current_role:
-            similar_roles = JobRole.objects.filter(
-                industry=current_role.industry
-            ).exclude(id=current_role.id)
-        else:
-            similar_roles = JobRole.objects.all()
-        
-        if location:
-            # Filter by roles available in preferred location
-            similar_roles = similar_roles.filter(
-                Q(salary_data__city__icontains=location) |
-                Q(salary_data__state__icontains=location)
-            ).distinct()
+        # Only roles with salary data in the preferred location
+        role_ids = roles_with_salaries(location) if location else None
+        matches = role_matcher.top_k(
+            user_skills, self.RECOMMENDATION_COUNT,
+            industry_id=current_role.industry_id if current_role else None,
+            exclude_id=current_role.id if current_role else None,
+            role_ids=role_ids
+        )
+        roles = JobRole.objects.in_bulk([role_id for role_id, _ in matches])
+        salaries = role_salary_summaries(list(roles), location or '')
+        vocabulary = skill_vocabulary.current()
         
-        for role in similar_roles[:20]:
-            match_score = self._calculate_match_score(role, user_skills)
-            skill_gap = self._calculate_skill_gap(role, user_skills)
+        recommendations = []
+        for role_id, match_score in matches:
+            role = roles.get(role_id)
+            if role is None:
+                continue
+            skill_gap = self._calculate_skill_gap(role, user_skills, vocabulary)
+            local_salary, overall_salary = salaries.get(role_id, (None, None))
             
-            recommendation = CareerPathRecommendation.objects.create(
+            recommendations.append(CareerPathRecommendation(
                 user=user,
                 current_role=current_role,
                 recommended_role=role,
@@ -321,35 +392,19 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
                 estimated_transition_time=self._estimate_transition_time(
                     skill_gap.get('gap_percentage', 0)
                 ),
-                salary_potential=self._get_salary_potential(role, location),
-                market_demand_score=self._calculate_demand_score(role),
+                salary_potential=self._get_salary_potential(local_salary),
+                market_demand_score=self._calculate_demand_score(overall_salary),
                 reasoning=self._generate_reasoning(match_score, skill_gap, role),
                 recommended_courses=self._get_recommended_courses(skill_gap)
-            )
-            recommendations.append(recommendation)
-        
-        return sorted(recommendations, key=lambda x: x.match_score, reverse=True)[:10]
-    
-    def _calculate_match_score(self, role, user_skills):
-        required_skills = set(role.required_skills)
-        user_skill_set = set(user_skills)
+            ))
         
-        if not required_skills:
-            return 50.0
-        
-        matching_skills = required_skills.intersection(user_skill_set)
-        match_percentage = (len(matching_skills) / len(required_skills)) * 100
-        
-        return round(match_percentage, 2)
+        return CareerPathRecommendation.objects.bulk_create(recommendations)
     
-    def _calculate_skill_gap(self, role, user_skills):
-        required_skills = set(role.required_skills)
-        user_skill_set = set(user_skills)
-        
-        missing_skills = list(required_skills - user_skill_set)
-        matching_skills = list(required_skills.intersection(user_skill_set))
+    def _calculate_skill_gap(self, role, user_skills, vocabulary=None):
+        matching_skills, missing_skills = compare_skills(role.required_skills, user_skills, vocabulary)
+        required_count = len(matching_skills) + len(missing_skills)
         
-        gap_percentage = (len(missing_skills) / len(required_skills)) * 100 if required_skills else 0
+        gap_percentage = (len(missing_skills) / required_count) * 100 if required_count else 0
         
         return {
             'missing_skills': missing_skills,
@@ -367,21 +422,14 @@ class CareerRecommendationViewSet(viewsets.ModelViewSet):
         else:
             return "12+ months"
     
-    def _get_salary_potential(self, role, location):
-        salary_data = role.salary_data.all()
-        if location:
-            salary_data = salary_data.filter(
-                Q(city__icontains=location) | Q(state__icontains=location)
-            )
-        
-        if salary_data.exists():
-            avg_salary = salary_data.aggregate(avg=Avg('median_salary'))['avg']
-            return f"${avg_salary:,.0f} average"
+    def _get_salary_potential(self, salary_rollup):
+        if salary_rollup is not None:
+            return f"${salary_rollup.avg_median:,.0f} average"
         return "Data not available"
     
-    def _calculate_demand_score(self, role):
+    def _calculate_demand_score(self, salary_rollup):
         # Simple demand score based on salary data entries
-        salary_count = role.salary_data.count()
+        salary_count = salary_rollup.sample_count if salary_rollup is not None else 0
         return min(100, salary_count * 5)
     
     def _generate_reasoning(self, match_score, skill_gap, role):
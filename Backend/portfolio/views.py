@@ -27,8 +27,17 @@ class PortfolioViewSet(viewsets.ModelViewSet):
     serializer_class = PortfolioSerializer
     permission_classes = [IsAuthenticated]
     
+    # Relations rendered by PortfolioDetailSerializer
+    detail_prefetch = [
+        'social_links', 'projects__images', 'experiences', 'education',
+        'skills', 'certifications', 'testimonials'
+    ]
+    
     def get_queryset(self):
-        return Portfolio.objects.filter(user=self.request.user)
+        queryset = Portfolio.objects.filter(user=self.request.user).select_related('user', 'template')
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('personal_info').prefetch_related(*self.detail_prefetch)
+        return queryset
     
     def get_serializer_class(self):
         if self.action in ['retrieve', 'public_view']:
@@ -44,7 +53,10 @@ class PortfolioViewSet(viewsets.ModelViewSet):
         if not slug:
             return Response({'error': 'Slug required'}, status=400)
         
-        portfolio = get_object_or_404(Portfolio, slug=slug, is_public=True)
+        portfolio = get_object_or_404(
+            Portfolio.objects.select_related('template', 'personal_info').prefetch_related(*self.detail_prefetch),
+            slug=slug, is_public=True
+        )
         portfolio.view_count += 1
         portfolio.save()
         
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from .models import ABTestVariant
+
+logger = logging.getLogger(__name__)
+
+
+class ABVariantSelector:
+    """
+    Thompson-sampling selection of ABTestVariant rows for adaptive quiz questions.
+
+    Variants are loaded into memory (refreshed every `refresh_interval`
+    seconds). Each served variant counts an impression and each answered one
+    an outcome; counters accumulate in process and are flushed to the
+    database with F-expression updates in one transaction once
+    `flush_every` events are pending or `flush_interval` seconds have passed.
+    The lock only guards the in-memory state; loads and flushes query the
+    database after releasing it.
+    """
+
+    def __init__(self, refresh_interval=None, flush_every=None, flush_interval=None, seed=None):
+        self.refresh_interval = refresh_interval if refresh_interval is not None else getattr(
+            settings, 'AB_TEST_REFRESH_INTERVAL', 300
+        )
+        self.flush_every = flush_every if flush_every is not None else getattr(
+            settings, 'AB_TEST_FLUSH_EVERY', 50
+        )
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'AB_TEST_FLUSH_INTERVAL', 60
+        )
+        self.rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._variants = None  # question_id -> list of variant dicts
+        self._loaded_at = 0.0
+        self._pending = {}  # variant pk -> [impressions, successes]
+        self._pending_events = 0
+        self._last_flush = time.monotonic()
+
+    def load(self):
+        """(Re)load active variants from the database (the query runs without the lock)"""
+        variants = {}
+        rows = ABTestVariant.objects.filter(
+            question__active=True, weight__gt=0
+        ).select_related('question').order_by('question_id', 'variant_name')
+
+        for row in rows:
+            variants.setdefault(row.question.question_id, []).append({
+                'pk': row.pk,
+                'variant': row.variant_name,
+                'text': row.question_text,
+                'options': row.options,
+                'impressions': row.impressions,
+                'successes': row.successes,
+            })
+
+        with self._lock:
+            self._variants = variants
+            self._loaded_at = time.monotonic()
+        return variants
+
+    def _get_variants(self, question_id):
+        with self._lock:
+            variants = self._variants
+            stale = variants is None or time.monotonic() - self._loaded_at > self.refresh_interval
+            if stale and variants is not None:
+                # Claim the refresh; other threads keep sampling the current copy meanwhile
+                self._loaded_at = time.monotonic()
+        if stale:
+            variants = self.load()
+        return variants.get(question_id)
+
+    def select(self, question_id):
+        """
+        Pick a variant for a question by Thompson sampling on its Beta posterior
+        (flushed plus pending counts). Returns None if the question has no variants.
+        """
+        variants = self._get_variants(question_id)
+        if not variants:
+            return None
+
+        with self._lock:
+            impressions = np.empty(len(variants))
+            successes = np.empty(len(variants))
+            for i, variant in enumerate(variants):
+                pending = self._pending.get(variant['pk'], (0, 0))
+                impressions[i] = variant['impressions'] + pending[0]
+                successes[i] = variant['successes'] + pending[1]
+
+            failures = np.maximum(impressions - successes, 0)
+            chosen = variants[int(np.argmax(self.rng.beta(1 + successes, 1 + failures)))]
+
+            flush_due = self._count(chosen['pk'], impressions=1)
+
+        if flush_due:
+            self.flush()
+
+        return {
+            'id': chosen['pk'],
+            'variant': chosen['variant'],
+            'text': chosen['text'],
+            'options': chosen['options'],
+        }
+
+    def record_outcome(self, variant_id, success):
+        """Record the outcome of a served variant"""
+        if success:
+            with self._lock:
+                flush_due = self._count(variant_id, successes=1)
+            if flush_due:
+                self.flush()
+
+    def _count(self, variant_id, impressions=0, successes=0):
+        """Add to the pending counters (lock held); returns whether a flush is due"""
+        counters = self._pending.setdefault(variant_id, [0, 0])
+        counters[0] += impressions
+        counters[1] += successes
+        self._pending_events += 1
+
+        return (self._pending_events >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def flush(self):
+        """Write pending counters to the database in one transaction (without the lock held)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+            self._last_flush = time.monotonic()
+            variants = self._variants
+
+        if not pending:
+            return 0
+
+        try:
+            with transaction.atomic():
+                for variant_id, (impressions, successes) in pending.items():
+                    ABTestVariant.objects.filter(pk=variant_id).update(
+                        impressions=F('impressions') + impressions,
+                        successes=F('successes') + successes,
+                        performance_score=(
+                            Cast(F('successes') + successes + 1, FloatField())
+                            / Cast(F('impressions') + impressions + 2, FloatField())
+                        ),
+                    )
+        except Exception as e:
+            logger.error(f"Error flushing A/B test counters: {e}")
+            with self._lock:
+                for variant_id, (impressions, successes) in pending.items():
+                    counters = self._pending.setdefault(variant_id, [0, 0])
+                    counters[0] += impressions
+                    counters[1] += successes
+                    self._pending_events += 1
+            return 0
+
+        # Fold flushed counts into the in-memory copy so sampling stays current
+        # (unless it was reloaded meanwhile; the next reload picks them up)
+        with self._lock:
+            if self._variants is variants:
+                for question_variants in (variants or {}).values():
+                    for variant in question_variants:
+                        if variant['pk'] in pending:
+                            variant['impressions'] += pending[variant['pk']][0]
+                            variant['successes'] += pending[variant['pk']][1]
+
+        return len(pending)
+
+
+ab_variant_selector = ABVariantSelector()
@@ -0,0 +1,58 @@
+# prediction/management/commands/seed_ab_variants.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from prediction.models import AdaptiveQuizQuestion, ABTestVariant
+from utils.adaptive_quiz import AdaptiveQuizEngine
+
+
+class Command(BaseCommand):
+    help = 'Create AdaptiveQuizQuestion and ABTestVariant rows for the in-code adaptive quiz bank and its A/B variants'
+
+    def handle(self, *args, **options):
+        item_bank = AdaptiveQuizEngine().item_bank
+        general = dict(zip(item_bank.ids, item_bank.is_general))
+        levels = {
+            question['id']: level
+            for level, questions in item_bank.experience_questions.items()
+            for question in questions
+        }
+
+        questions_created = variants_created = 0
+        with transaction.atomic():
+            for item in item_bank.items:
+                _, created = AdaptiveQuizQuestion.objects.update_or_create(
+                    question_id=item['id'],
+                    defaults={
+                        'question_text': item['text'],
+                        'question_type': item['type'],
+                        'options': item.get('options', []),
+                        'difficulty_level': item['difficulty'],
+                        'discrimination': item['discrimination'],
+                        'experience_level': '' if general[item['id']] else levels[item['id']],
+                        'category': item.get('category', levels.get(item['id'], '')),
+                    }
+                )
+                questions_created += created
+
+            questions = AdaptiveQuizQuestion.objects.in_bulk(
+                list(item_bank.ab_test_variants), field_name='question_id'
+            )
+            for question_id, variants in item_bank.ab_test_variants.items():
+                for variant in variants:
+                    # Outcome counters are left untouched so running experiments keep their data
+                    _, created = ABTestVariant.objects.update_or_create(
+                        question=questions[question_id],
+                        variant_name=variant['variant'],
+                        defaults={
+                            'question_text': variant['text'],
+                            'options': variant.get('options', []),
+                            'weight': variant['weight'],
+                        }
+                    )
+                    variants_created += created
+
+        self.stdout.write(f"Questions: {len(item_bank)} synced ({questions_created} new)")
+        self.stdout.write(f"Variants: {sum(len(v) for v in item_bank.ab_test_variants.values())} synced "
+                          f"({variants_created} new)")
+        self.stdout.write(self.style.SUCCESS('A/B variants seeded'))
@@ -0,0 +1,65 @@
+# prediction/management/commands/simulate_cat.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.adaptive_quiz import EXPERIENCE_LEVELS
+from utils.cat_simulation import CATSimulator
+
+
+class Command(BaseCommand):
+    help = 'Simulate synthetic examinees through the adaptive quiz (CAT) engine and report convergence and throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--examinees', type=int, default=5000,
+                            help='Number of synthetic examinees simulated together (vectorized)')
+        parser.add_argument('--experience-level', choices=EXPERIENCE_LEVELS,
+                            help='Fix the experience branch (default: random per examinee)')
+        parser.add_argument('--sequential', type=int, default=200,
+                            help='Examinees to run one answer at a time to time the per-request path (0 to skip)')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        if options['examinees'] <= 0:
+            raise CommandError('--examinees must be positive')
+
+        simulator = CATSimulator(seed=options['seed'])
+        report = {
+            'vectorized': simulator.run(options['examinees'], options['experience_level'])
+        }
+        if options['sequential'] > 0:
+            report['sequential'] = simulator.benchmark_sequential(
+                options['sequential'], options['experience_level']
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        vectorized = report['vectorized']
+        questions = vectorized['questions_to_termination']
+        estimation = vectorized['estimation']
+        exposure = vectorized['exposure']
+        latency = vectorized['latency']
+
+        self.stdout.write(f"Simulated {vectorized['examinees']} examinees "
+                          f"({len(simulator.item_bank)} items in bank)")
+        self.stdout.write(f"  Questions to termination: mean {questions['mean']}, median {questions['median']}, "
+                          f"p90 {questions['p90']}, range {questions['min']}-{questions['max']}")
+        self.stdout.write(f"  Termination reasons: {vectorized['termination_reasons']}")
+        self.stdout.write(f"  Estimation: bias {estimation['bias']}, RMSE {estimation['rmse']}, "
+                          f"mean SE {estimation['mean_se']}, r {estimation['correlation']}")
+        self.stdout.write(f"  Exposure: max {exposure['max_rate']}, mean {exposure['mean_rate']}, "
+                          f"unused items {exposure['unused_items']}")
+        self.stdout.write(f"  Vectorized step latency: mean {latency['per_step_ms']['mean']} ms, "
+                          f"p95 {latency['per_step_ms']['p95']} ms "
+                          f"({latency['answers_per_second']} answers/sec)")
+
+        if 'sequential' in report:
+            sequential = report['sequential']
+            self.stdout.write(f"  Per-request path: {sequential['per_answer_ms']['mean']} ms/answer mean, "
+                              f"p95 {sequential['per_answer_ms']['p95']} ms "
+                              f"({sequential['answers_per_second']} answers/sec per worker)")
+
+        self.stdout.write(self.style.SUCCESS('Simulation complete'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0003_adaptivequizquestion_abtestvariant_learningpath_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizsession',
+            name='adaptive_state',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
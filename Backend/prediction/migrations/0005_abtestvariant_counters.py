@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0004_quizsession_adaptive_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='abtestvariant',
+            name='impressions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='abtestvariant',
+            name='successes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -45,6 +45,7 @@ class QuizSession(models.Model):
     feature_importance = models.JSONField(default=dict)  # Store feature importance scores
     counterfactual_tips = models.JSONField(default=list)  # Store counterfactual suggestions
     calibration_data = models.JSONField(default=dict)  # Store calibration plot data
+    adaptive_state = models.JSONField(default=dict, blank=True)  # Adaptive engine state (ability grid, current question)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -78,6 +79,8 @@ class ABTestVariant(models.Model):
     options = models.JSONField(default=list)
     weight = models.FloatField(default=1.0)  # For weighted random selection
     performance_score = models.FloatField(default=0.0)  # Track performance metrics
+    impressions = models.PositiveIntegerField(default=0)  # Times served
+    successes = models.PositiveIntegerField(default=0)  # Times answered with a valid response
     
     def __str__(self):
         return f"{self.question.question_id} - {self.variant_name}"
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class AdaptiveSessionStore:
+    """
+    Holds adaptive quiz engine state between requests, keyed by QuizSession ID.
+
+    State lives in the Django cache; if the cache backend is unavailable a
+    bounded process-local dict is used instead. With a cache shared by all
+    workers (settings.CACHE_IS_SHARED), QuizSession rows are only written
+    back on completion, every `persist_every` answers, or when the shared
+    cache could not be written. With a per-process cache another worker may
+    restore the row at any answer, so it is written back on every answer.
+    """
+
+    KEY_PREFIX = 'adaptive_session'
+
+    def __init__(self, timeout=None, persist_every=None, shared=None, local_max_entries=1000):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'ADAPTIVE_SESSION_CACHE_TIMEOUT', 60 * 60
+        )
+        self.persist_every = persist_every if persist_every is not None else getattr(
+            settings, 'ADAPTIVE_SESSION_PERSIST_EVERY', 5
+        )
+        self.shared = shared if shared is not None else getattr(settings, 'CACHE_IS_SHARED', False)
+        self.local_max_entries = local_max_entries
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, session_id):
+        return f'{self.KEY_PREFIX}:{session_id}'
+
+    def get(self, session_id):
+        """Get cached engine state for a session (None on a miss)"""
+        key = self._key(session_id)
+        try:
+            state = cache.get(key)
+            if state is not None:
+                return state
+        except Exception:
+            pass
+
+        with self._lock:
+            state = self._local.get(key)
+            if state is not None:
+                self._local.move_to_end(key)
+            return state
+
+    def set(self, session_id, state):
+        """
+        Store engine state for a session.
+        Returns False if only the local fallback could be written.
+        """
+        key = self._key(session_id)
+        try:
+            cache.set(key, state, self.timeout)
+            stored_shared = True
+        except Exception:
+            stored_shared = False
+
+        with self._lock:
+            if stored_shared:
+                self._local.pop(key, None)
+            else:
+                self._local[key] = state
+                self._local.move_to_end(key)
+                while len(self._local) > self.local_max_entries:
+                    self._local.popitem(last=False)
+
+        return stored_shared
+
+    def delete(self, session_id):
+        """Drop cached state for a session"""
+        key = self._key(session_id)
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+        with self._lock:
+            self._local.pop(key, None)
+
+    def should_persist(self, state, stored_shared=True):
+        """Whether the state should be written back to the QuizSession row now"""
+        if state.get('completed') or not stored_shared or not self.shared:
+            return True
+        return self.persist_every > 0 and state.get('question_count', 0) % self.persist_every == 0
+
+
+adaptive_session_store = AdaptiveSessionStore()
@@ -1,3 +1,370 @@
-from django.test import TestCase
+from io import StringIO
+import json
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+import numpy as np
+
+from utils.adaptive_quiz import AbilityEstimator, AdaptiveQuizEngine, CompiledItemBank, EXPERIENCE_LEVELS
+from utils.cat_simulation import CATSimulator
+
+from .ab_testing import ABVariantSelector
+from .models import ABTestVariant, AdaptiveQuizQuestion, QuizSession, UserModel
+from .session_store import AdaptiveSessionStore, adaptive_session_store
+
+
+def _item(question_id, difficulty, discrimination, question_type='boolean', **extra):
+    return dict(id=question_id, text=question_id, type=question_type,
+                difficulty=difficulty, discrimination=discrimination, **extra)
+
+
+class CompiledItemBankTest(SimpleTestCase):
+    """The compiled arrays select what a per-question loop over the bank would"""
+
+    def setUp(self):
+        self.bank = CompiledItemBank(
+            {
+                'skills': [
+                    _item('g1', -1.0, 1.2),
+                    _item('g2', 0.0, 0.8, 'rating', scale=[1, 5]),
+                    _item('g3', 1.5, 2.0, experience_levels=['mid', 'senior']),
+                ],
+            },
+            {'junior': [_item('j1', 0.2, 1.5)], 'senior': [_item('s1', 2.0, 1.1)]},
+            {'g2': [{'variant': 'A', 'text': 'A', 'weight': 1.0, 'performance_score': 0.5}]}
+        )
+
+    def brute_force_select(self, ability, level, asked):
+        def information(question):
+            p = 1 / (1 + np.exp(-question['discrimination'] * (ability - question['difficulty'])))
+            return question['discrimination'] ** 2 * p * (1 - p)
+
+        eligible = [
+            q for q in self.bank.question_bank['skills']
+            if level in q.get('experience_levels', EXPERIENCE_LEVELS) and q['id'] not in asked
+        ] + [q for q in self.bank.experience_questions.get(level, []) if q['id'] not in asked]
+        if not eligible:
+            eligible = [q for q in self.bank.question_bank['skills'] if q['id'] not in asked]
+        return max(eligible, key=information)['id'] if eligible else None
+
+    def test_compiled_arrays(self):
+        self.assertEqual(self.bank.ids, ['g1', 'g2', 'g3', 'j1', 's1'])
+        self.assertEqual(len(self.bank), 5)
+        self.assertEqual(self.bank.difficulty.tolist(), [-1.0, 0.0, 1.5, 0.2, 2.0])
+        self.assertEqual(self.bank.is_general.tolist(), [True, True, True, False, False])
+        self.assertEqual(self.bank.has_variants.tolist(), [False, True, False, False, False])
+        self.assertEqual(self.bank.eligible('junior').tolist(), [True, True, False, True, False])
+        self.assertEqual(self.bank.eligible('senior').tolist(), [True, True, True, False, True])
+        self.assertEqual(self.bank.asked_mask(['g2', 'unknown']).tolist(), [False, True, False, False, False])
+
+        p = self.bank.probability(0.5)
+        np.testing.assert_allclose(self.bank.information(0.5), self.bank.discrimination ** 2 * p * (1 - p))
+        np.testing.assert_allclose(np.exp(self.bank.grid_log_p[:, 40]), self.bank.probability(0.0))
+
+    def test_select_matches_brute_force(self):
+        for ability in np.linspace(-3, 3, 13):
+            for level in EXPERIENCE_LEVELS:
+                for asked in ([], ['g1'], ['j1', 'g2'], ['g1', 'g2', 'j1']):
+                    index = self.bank.select(ability, level, asked)
+                    selected = None if index is None else self.bank.ids[index]
+                    self.assertEqual(selected, self.brute_force_select(ability, level, asked),
+                                     (ability, level, asked))
+
+    def test_fallback_and_exhaustion(self):
+        # No junior item left: fall back to remaining general questions
+        self.assertEqual(self.bank.ids[self.bank.select(0.0, 'junior', ['g1', 'g2', 'j1'])], 'g3')
+        self.assertIsNone(self.bank.select(0.0, 'junior', self.bank.ids))
+
+    def test_select_many_matches_select(self):
+        abilities = np.array([-2.0, 0.0, 0.3, 2.5])
+        levels = ['student', 'junior', 'mid', 'senior']
+        asked_ids = [[], ['g2'], ['g1', 'g2', 'g3'], self.bank.ids]
+        eligible = np.array([self.bank.eligible(level) for level in levels])
+        asked = np.array([self.bank.asked_mask(ids) for ids in asked_ids])
+
+        choices = self.bank.select_many(abilities, eligible, asked)
+        expected = [self.bank.select(a, level, ids) for a, level, ids in zip(abilities, levels, asked_ids)]
+        self.assertEqual(choices.tolist(), [-1 if index is None else index for index in expected])
+
+    def test_engine_on_compiled_bank(self):
+        engine = AdaptiveQuizEngine(item_bank=self.bank)
+        session = engine.start_adaptive_session(1, 'junior')
+        self.assertEqual(session['current_question']['id'], self.brute_force_select(0.0, 'junior', []))
+
+        session = engine.process_response(session, True)
+        self.assertEqual(session['questions_asked'], [self.brute_force_select(0.0, 'junior', [])])
+        self.assertGreater(session['ability_estimate'], 0)
+
+    def test_empty_bank(self):
+        engine = AdaptiveQuizEngine(item_bank=CompiledItemBank({}, {}))
+        session = engine.start_adaptive_session(1, 'junior')
+        self.assertIsNone(session['current_question'])
+        self.assertTrue(session['completed'])
+        self.assertEqual(session['final_ability'], 0.0)
+
+
+class AbilityEstimatorTest(SimpleTestCase):
+    """Grid EAP/MLE against direct evaluation of the full response history"""
+
+    ITEMS = [(-1.0, 1.2, 1.0), (0.5, 0.8, 0.0), (0.0, 1.5, 0.75), (1.2, 1.0, 1.0), (-0.3, 2.0, 0.0)]
+
+    def accumulate(self, items):
+        log_likelihood = AbilityEstimator.initial_state()
+        for difficulty, discrimination, score in items:
+            log_p, log_q = AbilityEstimator.grid_log_probabilities(difficulty, discrimination)
+            log_likelihood = AbilityEstimator.update(log_likelihood, log_p, log_q, score)
+        return log_likelihood
+
+    def test_incremental_updates_match_full_history(self):
+        grid = AbilityEstimator.THETA_GRID
+        expected = np.zeros_like(grid)
+        for difficulty, discrimination, score in self.ITEMS:
+            p = 1 / (1 + np.exp(-discrimination * (grid - difficulty)))
+            expected += score * np.log(p) + (1 - score) * np.log(1 - p)
+        np.testing.assert_allclose(self.accumulate(self.ITEMS), expected)
+
+        # EAP and SE are the moments of likelihood x N(0, 1) prior
+        posterior = np.exp(expected) * np.exp(-grid ** 2 / 2)
+        posterior /= posterior.sum()
+        eap = posterior @ grid
+        estimate = AbilityEstimator.estimate(self.accumulate(self.ITEMS))
+        self.assertAlmostEqual(estimate['eap'], eap)
+        self.assertAlmostEqual(estimate['se'], np.sqrt(posterior @ (grid - eap) ** 2))
+
+    def test_symmetric_responses(self):
+        estimate = AbilityEstimator.estimate(self.accumulate([(-1.0, 1.0, 1.0), (1.0, 1.0, 0.0)]))
+        self.assertAlmostEqual(estimate['eap'], 0.0)
+        self.assertAlmostEqual(estimate['mle'], 0.0)
+
+    def test_mle_is_refined_between_grid_points(self):
+        # One item answered halfway has its likelihood peak at its difficulty
+        estimate = AbilityEstimator.estimate(self.accumulate([(0.37, 1.0, 0.5)] * 3))
+        self.assertAlmostEqual(estimate['mle'], 0.37, places=2)
+
+    def test_more_responses_shrink_the_standard_error(self):
+        se = [AbilityEstimator.estimate(self.accumulate(self.ITEMS[:n]))['se'] for n in range(len(self.ITEMS) + 1)]
+        self.assertAlmostEqual(se[0], 1.0, places=2)  # the prior
+        self.assertTrue(all(later < earlier for earlier, later in zip(se, se[1:])))
+
+    def test_encoding_round_trip_and_batch_estimates(self):
+        log_likelihood = self.accumulate(self.ITEMS)
+        decoded = AbilityEstimator.decode(AbilityEstimator.encode(log_likelihood))
+        np.testing.assert_allclose(decoded, log_likelihood, rtol=1e-6)
+        np.testing.assert_array_equal(AbilityEstimator.decode(None), AbilityEstimator.initial_state())
+
+        matrix = np.array([self.accumulate(self.ITEMS[:n]) for n in range(len(self.ITEMS))])
+        eap, se = AbilityEstimator.estimate_many(matrix)
+        for row, expected_eap, expected_se in zip(matrix, eap, se):
+            estimate = AbilityEstimator.estimate(row)
+            self.assertAlmostEqual(estimate['eap'], expected_eap)
+            self.assertAlmostEqual(estimate['se'], expected_se)
+
+
+def _answer(question):
+    """A valid (high) answer to a question as presented"""
+    if question['type'] == 'rating':
+        return question['scale'][1]
+    if question['type'] == 'multiple_choice':
+        return question['options'][-1]
+    return True
+
+
+class ABVariantSelectorTest(TestCase):
+    def setUp(self):
+        self.question = AdaptiveQuizQuestion.objects.create(
+            question_id='tech_001', question_text='Original', question_type='boolean', category='technical'
+        )
+        self.good = ABTestVariant.objects.create(question=self.question, variant_name='A', question_text='Good',
+                                                 impressions=1000, successes=900)
+        self.bad = ABTestVariant.objects.create(question=self.question, variant_name='B', question_text='Bad',
+                                                impressions=1000, successes=100)
+
+    def selector(self, **options):
+        options = dict(dict(refresh_interval=300, flush_every=1000, flush_interval=3600, seed=5), **options)
+        return ABVariantSelector(**options)
+
+    def test_thompson_sampling_favours_the_better_variant(self):
+        selector = self.selector()
+        chosen = [selector.select('tech_001')['variant'] for _ in range(100)]
+        self.assertGreater(chosen.count('A'), 95)
+        self.assertIsNone(selector.select('unknown'))
+
+        # Inactive questions and zero-weight variants are not served
+        self.question.active = False
+        self.question.save()
+        self.assertIsNone(self.selector().select('tech_001'))
+
+    def test_flush_writes_counters_in_one_transaction(self):
+        selector = self.selector(flush_every=4)
+        served = [selector.select('tech_001') for _ in range(3)]
+        for variant in served:
+            selector.record_outcome(variant['id'], True)  # the 4th event flushes
+
+        impressions = sum(ABTestVariant.objects.values_list('impressions', flat=True))
+        successes = sum(ABTestVariant.objects.values_list('successes', flat=True))
+        self.assertEqual((impressions, successes), (2003, 1001))
+        self.assertEqual(selector._pending_events, 2)
+
+        selector.flush()
+        good = ABTestVariant.objects.get(pk=self.good.pk)
+        self.assertAlmostEqual(good.performance_score, (good.successes + 1) / (good.impressions + 2))
+        # Flushed counts are folded into the loaded copy, not counted twice
+        loaded = {v['pk']: v for v in selector._get_variants('tech_001')}
+        self.assertEqual(loaded[self.good.pk]['impressions'], good.impressions)
+
+    def test_database_io_runs_without_the_lock(self):
+        selector = self.selector(flush_every=1)
+        locked_during_io = []
+        load, flush = selector.load, selector.flush
+
+        def checked_load():
+            locked_during_io.append(selector._lock.locked())
+            return load()
+
+        def checked_flush():
+            locked_during_io.append(selector._lock.locked())
+            return flush()
+
+        selector.load, selector.flush = checked_load, checked_flush
+        variant = selector.select('tech_001')
+        selector.record_outcome(variant['id'], True)
+        self.assertEqual(locked_during_io, [False, False, False])
+
+    def test_variants_are_reloaded_after_the_refresh_interval(self):
+        selector = self.selector(refresh_interval=0)
+        selector.select('tech_001')
+        ABTestVariant.objects.filter(pk=self.good.pk).update(question_text='Reworded')
+        self.assertEqual(selector.select('tech_001')['text'], 'Reworded')
+
+    def test_seed_ab_variants_command(self):
+        AdaptiveQuizQuestion.objects.all().delete()
+        item_bank = AdaptiveQuizEngine().item_bank
+        out = StringIO()
+        call_command('seed_ab_variants', stdout=out)
+
+        self.assertEqual(AdaptiveQuizQuestion.objects.count(), len(item_bank))
+        for question_id, variants in item_bank.ab_test_variants.items():
+            self.assertEqual(
+                list(ABTestVariant.objects.filter(question__question_id=question_id)
+                     .order_by('variant_name').values_list('variant_name', 'question_text')),
+                sorted((variant['variant'], variant['text']) for variant in variants)
+            )
+        self.assertIn('A/B variants seeded', out.getvalue())
+
+        # Re-running updates in place and keeps outcome counters
+        ABTestVariant.objects.update(impressions=7)
+        call_command('seed_ab_variants', stdout=StringIO())
+        self.assertEqual(AdaptiveQuizQuestion.objects.count(), len(item_bank))
+        self.assertEqual(ABTestVariant.objects.count(), sum(map(len, item_bank.ab_test_variants.values())))
+        self.assertFalse(ABTestVariant.objects.exclude(impressions=7).exists())
+
+
+class AdaptiveSessionStoreTest(SimpleTestCase):
+    def test_write_back_only_batched_with_a_shared_cache(self):
+        shared = AdaptiveSessionStore(persist_every=5, shared=True)
+        local = AdaptiveSessionStore(persist_every=5, shared=False)
+
+        self.assertEqual([n for n in range(1, 11) if shared.should_persist({'question_count': n})], [5, 10])
+        self.assertTrue(shared.should_persist({'question_count': 3, 'completed': True}))
+        self.assertTrue(shared.should_persist({'question_count': 3}, stored_shared=False))
+        self.assertTrue(all(local.should_persist({'question_count': n}) for n in range(1, 11)))
+
+
+class AdaptiveQuizViewTest(TestCase):
+    """Adaptive sessions resume from the database when the session store has no state"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('quizzer', password='pass'))
+        self.user = UserModel.objects.create(name='Quizzer', age=25, email='quizzer@example.com', password='x')
+
+    def start(self):
+        response = self.client.post('/api/adaptive-quiz/', {'user_id': self.user.id, 'experience_level': 'junior'},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['session']
+
+    def answer(self, session):
+        response = self.client.put('/api/adaptive-quiz/', {
+            'session_id': session['session_id'], 'response': _answer(session['current_question'])
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['session']
+
+    def test_state_is_restored_from_the_database(self):
+        uninterrupted = self.start()
+        interrupted = self.start()
+        answers = 4
+
+        for count in range(1, answers + 1):
+            uninterrupted = self.answer(uninterrupted)
+            interrupted = self.answer(interrupted)
+            if count == 2:
+                # e.g. the next answer lands on a worker whose cache lacks the session
+                adaptive_session_store.delete(interrupted['session_id'])
+                state = QuizSession.objects.get(id=interrupted['session_id']).adaptive_state
+                self.assertEqual(state['question_count'], count)
+
+        self.assertEqual(interrupted['question_count'], answers)
+        self.assertEqual(interrupted['questions_asked'], uninterrupted['questions_asked'])
+        self.assertEqual(interrupted['ability_history'], uninterrupted['ability_history'])
+        self.assertEqual(interrupted['ability_estimate'], uninterrupted['ability_estimate'])
+
+    def test_completed_and_missing_sessions(self):
+        session = self.start()
+        QuizSession.objects.filter(id=session['session_id']).update(completed=True)
+        adaptive_session_store.delete(session['session_id'])
+        response = self.client.put('/api/adaptive-quiz/', {'session_id': session['session_id'], 'response': True},
+                                   format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.put('/api/adaptive-quiz/', {'session_id': 999999, 'response': True}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class CATSimulationBenchmarkTest(SimpleTestCase):
+    """Benchmark the adaptive quiz engine with synthetic examinees"""
+
+    def test_vectorized_simulation(self):
+        simulator = CATSimulator(seed=7)
+        report = simulator.run(n_examinees=2000)
+        criteria = AdaptiveQuizEngine.TERMINATION_CRITERIA
+
+        self.assertEqual(report['examinees'], 2000)
+        self.assertLessEqual(report['questions_to_termination']['max'], criteria['max_questions'])
+        self.assertEqual(sum(report['termination_reasons'].values()), 2000)
+        self.assertLess(abs(report['estimation']['bias']), 0.1)
+        self.assertLess(report['estimation']['rmse'], 0.8)
+        self.assertLessEqual(report['exposure']['max_rate'], 1.0)
+        self.assertGreater(report['latency']['answers_per_second'], 0)
+
+    def test_known_ability_recovery(self):
+        simulator = CATSimulator(seed=11)
+        low = simulator.run(true_abilities=[-1.5] * 500, experience_level='junior')
+        high = simulator.run(true_abilities=[1.5] * 500, experience_level='junior')
+
+        mean_low_estimate = -1.5 + low['estimation']['bias']
+        mean_high_estimate = 1.5 + high['estimation']['bias']
+        self.assertLess(mean_low_estimate, -0.5)
+        self.assertGreater(mean_high_estimate, 0.5)
+
+    def test_sequential_matches_engine_termination(self):
+        simulator = CATSimulator(seed=3)
+        report = simulator.benchmark_sequential(n_examinees=50, experience_level='mid')
+
+        self.assertGreater(report['answers'], 0)
+        self.assertLessEqual(report['answers'], 50 * AdaptiveQuizEngine.TERMINATION_CRITERIA['max_questions'])
+        self.assertGreater(report['per_answer_ms']['mean'], 0)
+
+    def test_simulate_cat_command(self):
+        out = StringIO()
+        call_command('simulate_cat', examinees=200, sequential=10, seed=1, json=True, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report['vectorized']['examinees'], 200)
+        self.assertEqual(report['sequential']['examinees'], 10)
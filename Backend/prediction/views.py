@@ -25,6 +25,9 @@ from .models import (
     LearningPath, LearningMilestone, MilestoneProgress, UserReminder
 )
 
+from .session_store import adaptive_session_store
+from .ab_testing import ab_variant_selector
+
 from utils.utility import predict_sentiment
 from utils.explainable_ai import ExplainableAI
 from utils.adaptive_quiz import AdaptiveQuizEngine
@@ -270,20 +273,25 @@ class AdaptiveQuizView(APIView):
             user = UserModel.objects.get(id=user_id)
             
             # Initialize adaptive quiz engine
-            quiz_engine = AdaptiveQuizEngine()
+            quiz_engine = AdaptiveQuizEngine(variant_selector=ab_variant_selector)
             
             # Start new session
             session_data = quiz_engine.start_adaptive_session(user_id, experience_level)
+            if session_data['current_question'] is None:
+                return Response({'error': 'No questions available for this experience level'},
+                                status=status.HTTP_409_CONFLICT)
             
             # Create database session
             quiz_session = QuizSession.objects.create(
                 user=user,
                 session_type='adaptive',
                 responses=session_data['responses'],
+                adaptive_state=session_data,
                 completed=False
             )
             
             session_data['session_id'] = quiz_session.id
+            adaptive_session_store.set(quiz_session.id, session_data)
             
             return Response({
                 'session': session_data,
@@ -304,45 +312,47 @@ class AdaptiveQuizView(APIView):
             if not session_id or response is None:
                 return Response({'error': 'Session ID and response required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Get session from database
-            quiz_session = QuizSession.objects.get(id=session_id)
-            
-            # Initialize quiz engine and load session
-            quiz_engine = AdaptiveQuizEngine()
-            
-            # Reconstruct session data (in production, you might cache this)
-            session_data = {
-                'user_id': quiz_session.user.id,
-                'experience_level': quiz_session.user.profile.experience_level if hasattr(quiz_session.user, 'profile') else 'student',
-                'questions_asked': list(quiz_session.responses.keys()),
-                'responses': quiz_session.responses,
-                'ability_estimate': 0.0,  # Would be stored in session
-                'ability_se': 1.0,
-                'question_count': len(quiz_session.responses),
-                'max_questions': 15,
-                'termination_criteria': {'se_threshold': 0.3, 'min_questions': 5, 'max_questions': 15}
-            }
+            # Restore engine state from the session store (one cache read)
+            session_data = adaptive_session_store.get(session_id)
+            if session_data is None:
+                # Cache miss: fall back to the last state written to the database
+                quiz_session = QuizSession.objects.get(id=session_id)
+                session_data = quiz_session.adaptive_state
+                if quiz_session.completed:
+                    session_data = dict(session_data, completed=True)
+            
+            if session_data.get('completed'):
+                return Response({'error': 'Quiz session already completed'}, status=status.HTTP_400_BAD_REQUEST)
+            if 'current_question' not in session_data:
+                return Response({'error': 'Quiz session state not found'}, status=status.HTTP_409_CONFLICT)
             
             # Process the response
+            quiz_engine = AdaptiveQuizEngine(variant_selector=ab_variant_selector)
             updated_session = quiz_engine.process_response(session_data, response)
+            completed = updated_session.get('completed', False)
             
-            # Update database session
-            quiz_session.responses = updated_session['responses']
-            quiz_session.completed = updated_session.get('completed', False)
-            
-            if quiz_session.completed:
-                # Generate final prediction
-                explainable_ai = ExplainableAI()
-                # Convert responses to format expected by prediction model
-                # This would need to be implemented based on your specific model
-                quiz_session.predicted_role = "Predicted Role"  # Placeholder
-                quiz_session.confidence_score = updated_session.get('final_ability', 0.5)
+            # One cache write per answer; with a shared cache the row is written back only periodically
+            stored_shared = adaptive_session_store.set(session_id, updated_session)
             
-            quiz_session.save()
+            if adaptive_session_store.should_persist(updated_session, stored_shared):
+                fields = {
+                    'responses': updated_session['responses'],
+                    'adaptive_state': updated_session,
+                    'completed': completed,
+                }
+                if completed:
+                    # Convert responses to format expected by prediction model
+                    # This would need to be implemented based on your specific model
+                    fields['predicted_role'] = "Predicted Role"  # Placeholder
+                    fields['confidence_score'] = updated_session.get('final_ability', 0.5)
+                
+                if not QuizSession.objects.filter(id=session_id).update(**fields):
+                    adaptive_session_store.delete(session_id)
+                    raise QuizSession.DoesNotExist()
             
             return Response({
                 'session': updated_session,
-                'completed': quiz_session.completed
+                'completed': completed
             }, status=status.HTTP_200_OK)
             
         except QuizSession.DoesNotExist:
@@ -465,7 +475,9 @@ class LearningPathView(APIView):
             if not user_id:
                 return Response({'error': 'User ID required'}, status=status.HTTP_400_BAD_REQUEST)
             
-            learning_paths = LearningPath.objects.filter(user_id=user_id).prefetch_related('milestones').order_by('-created_at')
+            learning_paths = LearningPath.objects.filter(user_id=user_id).prefetch_related(
+                'milestones__progress_logs'
+            ).order_by('-created_at')
             serializer = LearningPathSerializer(learning_paths, many=True)
             
             return Response({
@@ -563,13 +575,18 @@ class MilestoneProgressView(APIView):
             
             elif learning_path_id:
                 learning_path = LearningPath.objects.get(id=learning_path_id, user=user)
-                milestones = learning_path.milestones.all()
+                milestones = learning_path.milestones.prefetch_related('progress_logs')
+                
+                # Latest log per milestone for this user, in one query
+                latest_logs = {}
+                for progress in MilestoneProgress.objects.filter(
+                    milestone__learning_path=learning_path, user=user
+                ).order_by('-created_at'):
+                    latest_logs.setdefault(progress.milestone_id, progress)
                 
                 progress_summary = []
                 for milestone in milestones:
-                    latest_progress = MilestoneProgress.objects.filter(
-                        milestone=milestone, user=user
-                    ).order_by('-created_at').first()
+                    latest_progress = latest_logs.get(milestone.id)
                     
                     progress_summary.append({
                         'milestone': LearningMilestoneSerializer(milestone).data,
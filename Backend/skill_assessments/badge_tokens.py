@@ -0,0 +1,43 @@
+# skill_assessments/badge_tokens.py
+from datetime import date, datetime
+
+from django.core import signing
+from django.utils import timezone
+
+SALT = 'skill_assessments.badge'
+
+
+def issue_badge_token(user_id, skill_set_id, assessment_id, issued_on, expires_at=None):
+    """
+    HMAC-signed badge claim (user, skill set, assessment, issue date and
+    expiry if the badge has one). Forged and expired codes can be rejected
+    against the secret key alone, without a database lookup.
+    """
+    claim = {
+        'u': user_id,
+        's': skill_set_id,
+        'a': assessment_id,
+        'd': issued_on.isoformat()
+    }
+    if expires_at is not None:
+        claim['e'] = expires_at.isoformat()
+    return signing.Signer(salt=SALT).sign_object(claim)
+
+
+def read_badge_token(token):
+    """The badge claim in a token, or None if the signature does not match"""
+    try:
+        claim = signing.Signer(salt=SALT).unsign_object(token)
+    except signing.BadSignature:
+        return None
+    return {
+        'user_id': claim['u'],
+        'skill_set_id': claim['s'],
+        'assessment_id': claim['a'],
+        'issued_on': date.fromisoformat(claim['d']),
+        'expires_at': datetime.fromisoformat(claim['e']) if 'e' in claim else None
+    }
+
+
+def claim_expired(claim, now=None):
+    return claim['expires_at'] is not None and claim['expires_at'] <= (now or timezone.now())
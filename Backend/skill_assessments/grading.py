@@ -0,0 +1,149 @@
+# skill_assessments/grading.py
+import atexit
+import builtins
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F
+
+from utils.code_sandbox import SandboxPool
+from .models import AssessmentAnswer, SkillAssessment
+
+logger = logging.getLogger(__name__)
+
+VERDICT_FEEDBACK = {
+    'accepted': 'Accepted: your output matches the expected output.',
+    'wrong_answer': 'Wrong answer: your output does not match the expected output.',
+    'runtime_error': 'Runtime error: your code raised an exception.',
+    'time_limit': 'Time limit exceeded.',
+    'memory_limit': 'Memory limit exceeded.',
+    'output_limit': 'Output limit exceeded.',
+}
+
+
+class CodeGrader:
+    """
+    Grades coding and practical answers against the question's expected
+    output, off the request thread.
+
+    The caller saves the answer as pending and calls submit(), which queues
+    the code on the sandbox pool once the transaction commits. When the
+    verdict arrives it is stored on the answer and the points are added to
+    the assessment with an F() update. Verdicts are
+    cached by a hash of the question's expected output and the code, so
+    resubmitting the same code is graded immediately.
+
+    Nothing is graded unless settings.CODE_GRADER_ENABLED is set (see the
+    isolation notes on SandboxPool); until then coding answers are stored
+    ungraded. The sandbox's output and error text are kept on the answer
+    row for debugging and are never sent to clients.
+    """
+
+    GRADED_TYPES = ('coding', 'practical')
+    KEY_PREFIX = 'code_verdict'
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = SandboxPool(**getattr(settings, 'CODE_GRADER', {}))
+                atexit.register(self._pool.shutdown)
+            return self._pool
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'CODE_GRADER_ENABLED', False)
+
+    def should_grade(self, question, code):
+        return (
+            self.enabled and question.question_type in self.GRADED_TYPES
+            and bool(code.strip()) and bool(question.expected_output)
+        )
+
+    def verdict_key(self, question, code):
+        digest = hashlib.sha256(
+            f'{question.id}\0{question.expected_output}\0{code}'.encode('utf-8')
+        ).hexdigest()
+        return f'{self.KEY_PREFIX}:{digest}'
+
+    def cached_verdict(self, question, code):
+        return cache.get(self.verdict_key(question, code))
+
+    def submit(self, answer):
+        """Queue a pending answer for grading once the current transaction commits"""
+        question = answer.question
+        key = self.verdict_key(question, answer.code_answer)
+        code, expected_output = answer.code_answer, question.expected_output
+
+        def queue_job():
+            future = self.pool.submit(code, expected_output)
+            future.add_done_callback(lambda done: self._finish(answer.id, key, done))
+
+        transaction.on_commit(queue_job)
+
+    def _finish(self, answer_id, key, future):
+        """Runs on a sandbox pool thread"""
+        try:
+            verdict = future.result()
+            cache.set(key, verdict, getattr(settings, 'CODE_VERDICT_CACHE_TIMEOUT', 24 * 60 * 60))
+        except Exception as e:
+            logger.exception('Grading answer %s failed', answer_id)
+            verdict = {'status': 'grader_error', 'passed': False, 'output': '', 'error': str(e)}
+        try:
+            apply_verdict(answer_id, verdict)
+        except Exception:
+            logger.exception('Saving the verdict for answer %s failed', answer_id)
+        finally:
+            connection.close()
+
+
+def verdict_feedback(question, verdict):
+    feedback = VERDICT_FEEDBACK.get(verdict['status'], 'The grader could not run your code. Please try again later.')
+    if verdict['status'] == 'runtime_error' and verdict.get('error'):
+        # Only a built-in exception's name: the message (and a custom class
+        # name) is text the submission chose, which could carry anything it read
+        name = verdict['error'].strip().splitlines()[-1].split(':')[0].strip()
+        exception = getattr(builtins, name, None)
+        if isinstance(exception, type) and issubclass(exception, BaseException):
+            feedback += f' ({name})'
+    if question.explanation:
+        feedback += '\n\n' + question.explanation
+    return feedback
+
+
+def apply_verdict(answer_id, verdict):
+    """
+    Store a sandbox verdict on a pending answer and credit its points.
+    Returns the updated answer, or None if it no longer awaits grading.
+    """
+    with transaction.atomic():
+        answer = AssessmentAnswer.objects.select_for_update().select_related('question').filter(
+            id=answer_id, grading_status='pending'
+        ).first()
+        if answer is None:
+            return None
+
+        question = answer.question
+        answer.is_correct = verdict['passed']
+        answer.points_earned = question.points if verdict['passed'] else 0
+        answer.feedback = verdict_feedback(question, verdict)
+        answer.verdict = verdict
+        answer.grading_status = 'failed' if verdict['status'] == 'grader_error' else 'graded'
+        answer.save(update_fields=['is_correct', 'points_earned', 'feedback', 'verdict', 'grading_status'])
+
+        if answer.points_earned:
+            SkillAssessment.objects.filter(id=answer.assessment_id).update(
+                total_score=F('total_score') + answer.points_earned
+            )
+    return answer
+
+
+code_grader = CodeGrader()
@@ -0,0 +1,26 @@
+# skill_assessments/management/commands/rebuild_score_histograms.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from skill_assessments.models import ScoreHistogram
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-skill-set score histograms used for peer comparison'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skill-set', type=int, action='append', dest='skill_set_ids',
+                            help='Only rebuild this skill set ID (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk write')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding score histograms...')
+        started = time.perf_counter()
+
+        written = ScoreHistogram.rebuild(
+            skill_set_ids=options['skill_set_ids'], batch_size=options['batch_size']
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} histograms in {elapsed:.2f}s'))
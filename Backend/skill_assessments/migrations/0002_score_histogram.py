@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_score_histograms(apps, schema_editor):
+    SkillAssessment = apps.get_model('skill_assessments', 'SkillAssessment')
+    ScoreHistogram = apps.get_model('skill_assessments', 'ScoreHistogram')
+
+    bins = 1001  # ScoreHistogram.BINS: 0.1% wide bins over 0-100%
+    histograms = {}
+    scores = SkillAssessment.objects.filter(status='completed').order_by().values_list('skill_set_id', 'percentage')
+    for skill_set_id, percentage in scores.iterator(chunk_size=2000):
+        histogram = histograms.get(skill_set_id)
+        if histogram is None:
+            histogram = histograms[skill_set_id] = ScoreHistogram(skill_set_id=skill_set_id, counts=[0] * bins)
+        histogram.counts[min(max(int(round(percentage * (bins - 1) / 100)), 0), bins - 1)] += 1
+        histogram.total += 1
+        histogram.score_sum += percentage
+
+    ScoreHistogram.objects.bulk_create(histograms.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_assessments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreHistogram',
+            fields=[
+                ('skill_set', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='skill_assessments.skillset')),
+                ('counts', models.JSONField(default=list, help_text='Completed assessments per 0.1% score bin')),
+                ('total', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_score_histograms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_assessments', '0002_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentanswer',
+            name='grading_status',
+            field=models.CharField(choices=[('graded', 'Graded'), ('pending', 'Pending'), ('failed', 'Grading Failed')], default='graded', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='assessmentanswer',
+            name='verdict',
+            field=models.JSONField(blank=True, help_text='Sandbox result for coding answers', null=True),
+        ),
+    ]
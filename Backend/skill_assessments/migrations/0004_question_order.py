@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_assessments', '0003_answer_grading'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillassessment',
+            name='question_cursor',
+            field=models.IntegerField(default=0, help_text='Position of the next question in question_order'),
+        ),
+        migrations.AddField(
+            model_name='skillassessment',
+            name='question_order',
+            field=models.JSONField(blank=True, default=list, help_text='Question IDs in the order they are served, fixed at start'),
+        ),
+        migrations.AddField(
+            model_name='skillset',
+            name='shuffle_questions',
+            field=models.BooleanField(default=False, help_text='Serve the questions in a new random order on each attempt'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 11:53
+
+from django.db import migrations, models
+
+from skill_assessments.badge_tokens import issue_badge_token
+
+
+def sign_badge_expiry(apps, schema_editor):
+    """Re-sign the codes of badges that expire, so the claim carries the expiry"""
+    UserSkillBadge = apps.get_model('skill_assessments', 'UserSkillBadge')
+    badges = list(UserSkillBadge.objects.filter(expires_at__isnull=False))
+    for badge in badges:
+        badge.verification_code = issue_badge_token(
+            badge.user_id, badge.skill_set_id, badge.assessment_id, badge.earned_at.date(), badge.expires_at
+        )
+    UserSkillBadge.objects.bulk_update(badges, ['verification_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skill_assessments', '0005_badge_verification_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userskillbadge',
+            name='verification_code',
+            field=models.CharField(help_text='Signed token encoding user, skill set, assessment, issue date and expiry', max_length=255, unique=True),
+        ),
+        migrations.RunPython(sign_badge_expiry, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,9 @@
 # skill_assessments/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-import uuid
+from django.utils import timezone
+from .badge_tokens import issue_badge_token, read_badge_token
 
 class SkillCategory(models.Model):
     """Categories for organizing skills"""
@@ -55,6 +56,10 @@ class SkillSet(models.Model):
         blank=True
     )
     prerequisites = models.ManyToManyField('self', blank=True, symmetrical=False)
+    shuffle_questions = models.BooleanField(
+        default=False,
+        help_text="Serve the questions in a new random order on each attempt"
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -143,6 +148,12 @@ class SkillAssessment(models.Model):
     passed = models.BooleanField(default=False)
     time_taken = models.IntegerField(default=0, help_text="Time in seconds")
     attempt_number = models.IntegerField(default=1)
+    question_order = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Question IDs in the order they are served, fixed at start"
+    )
+    question_cursor = models.IntegerField(default=0, help_text="Position of the next question in question_order")
     
     class Meta:
         ordering = ['-started_at']
@@ -161,6 +172,12 @@ class SkillAssessment(models.Model):
 
 class AssessmentAnswer(models.Model):
     """User's answer to assessment question"""
+    GRADING_STATUS = [
+        ('graded', 'Graded'),
+        ('pending', 'Pending'),
+        ('failed', 'Grading Failed')
+    ]
+    
     assessment = models.ForeignKey(
         SkillAssessment, 
         on_delete=models.CASCADE, 
@@ -179,6 +196,8 @@ class AssessmentAnswer(models.Model):
     points_earned = models.IntegerField(default=0)
     time_taken = models.IntegerField(default=0)
     feedback = models.TextField(blank=True)
+    grading_status = models.CharField(max_length=10, choices=GRADING_STATUS, default='graded')
+    verdict = models.JSONField(null=True, blank=True, help_text="Sandbox result for coding answers")
     answered_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -199,7 +218,11 @@ class UserSkillBadge(models.Model):
     assessment = models.ForeignKey(SkillAssessment, on_delete=models.CASCADE)
     earned_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
-    verification_code = models.CharField(max_length=100, unique=True)
+    verification_code = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Signed token encoding user, skill set, assessment, issue date and expiry"
+    )
     is_public = models.BooleanField(default=True)
     
     class Meta:
@@ -208,9 +231,20 @@ class UserSkillBadge(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.skill_set.name} Badge"
     
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+    
     def save(self, *args, **kwargs):
-        if not self.verification_code:
-            self.verification_code = str(uuid.uuid4())
+        # Re-signed when the expiry changes, so the claim never outlives the row
+        claim = read_badge_token(self.verification_code) if self.verification_code else None
+        if claim is None or claim['expires_at'] != self.expires_at:
+            issued_on = claim['issued_on'] if claim else timezone.now().date()
+            self.verification_code = issue_badge_token(
+                self.user_id, self.skill_set_id, self.assessment_id, issued_on, self.expires_at
+            )
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'verification_code'}
         super().save(*args, **kwargs)
 
 
@@ -295,4 +329,86 @@ class PeerComparison(models.Model):
         ordering = ['-comparison_date']
     
     def __str__(self):
-        return f"{self.user.username} - {self.skill_set.name} Comparison"
\ No newline at end of file
+        return f"{self.user.username} - {self.skill_set.name} Comparison"
+
+
+class ScoreHistogram(models.Model):
+    """
+    Distribution of completed assessment percentages for a skill set, kept
+    up to date on completion so peer comparisons don't scan every assessment
+    """
+    BINS = 1001  # 0.1% wide bins over 0-100%
+    
+    skill_set = models.OneToOneField(
+        SkillSet,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score_histogram'
+    )
+    counts = models.JSONField(default=list, help_text="Completed assessments per 0.1% score bin")
+    total = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.skill_set.name} - {self.total} scores"
+    
+    @classmethod
+    def bin_for(cls, percentage):
+        return min(max(int(round(percentage * (cls.BINS - 1) / 100)), 0), cls.BINS - 1)
+    
+    def add(self, percentage):
+        if len(self.counts) != self.BINS:
+            self.counts = [0] * self.BINS
+        self.counts[self.bin_for(percentage)] += 1
+        self.total += 1
+        self.score_sum += percentage
+    
+    @classmethod
+    def record(cls, skill_set_id, percentage):
+        """Add a completed assessment's score under a row lock; returns the histogram"""
+        with transaction.atomic(savepoint=False):
+            histogram, created = cls.objects.select_for_update().get_or_create(skill_set_id=skill_set_id)
+            histogram.add(percentage)
+            histogram.save()
+        return histogram
+    
+    def compare(self, percentage, exclude=()):
+        """
+        (percentile, average, count) of the recorded scores without the
+        scores in exclude (the user's own), or None if nothing is left.
+        The percentile is the share of scores in lower bins.
+        """
+        total = self.total - len(exclude)
+        if total <= 0:
+            return None
+        
+        score_bin = self.bin_for(percentage)
+        below = sum(self.counts[:score_bin]) - sum(1 for score in exclude if self.bin_for(score) < score_bin)
+        average = (self.score_sum - sum(exclude)) / total
+        return max(below, 0) / total * 100, average, total
+    
+    @classmethod
+    def rebuild(cls, skill_set_ids=None, batch_size=500):
+        """
+        Recompute histograms from the completed assessments in one pass.
+        Returns the number of histograms written.
+        """
+        scores = SkillAssessment.objects.filter(status='completed').order_by()
+        if skill_set_ids is not None:
+            scores = scores.filter(skill_set_id__in=skill_set_ids)
+        
+        histograms = {}
+        for skill_set_id, percentage in scores.values_list('skill_set_id', 'percentage').iterator(chunk_size=2000):
+            if skill_set_id not in histograms:
+                histograms[skill_set_id] = cls(skill_set_id=skill_set_id)
+            histograms[skill_set_id].add(percentage)
+        
+        stale = cls.objects.all()
+        if skill_set_ids is not None:
+            stale = stale.filter(skill_set_id__in=skill_set_ids)
+        with transaction.atomic():
+            stale.delete()
+            cls.objects.bulk_create(histograms.values(), batch_size=batch_size)
+        
+        return len(histograms)
@@ -9,6 +9,9 @@ class SkillCategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_subcategories_count(self, obj):
+        # Annotated by SkillCategoryViewSet querysets
+        if hasattr(obj, 'subcategories_count'):
+            return obj.subcategories_count
         return obj.subcategories.count()
 
 class AssessmentOptionSerializer(serializers.ModelSerializer):
@@ -37,6 +40,9 @@ class SkillSetSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_question_count(self, obj):
+        # Annotated by SkillSetViewSet querysets
+        if hasattr(obj, 'question_count'):
+            return obj.question_count
         return obj.questions.filter(is_active=True).count()
 
 class SkillAssessmentSerializer(serializers.ModelSerializer):
@@ -50,11 +56,18 @@ class SkillAssessmentSerializer(serializers.ModelSerializer):
 
 class AssessmentAnswerSerializer(serializers.ModelSerializer):
     question_text = serializers.CharField(source='question.question_text', read_only=True)
-    
+    verdict = serializers.SerializerMethodField()
+
     class Meta:
         model = AssessmentAnswer
         fields = '__all__'
 
+    def get_verdict(self, obj):
+        # Sandbox output and error text are the submission's own output: never returned
+        if not obj.verdict:
+            return None
+        return {'status': obj.verdict['status'], 'passed': obj.verdict['passed']}
+
 class UserSkillBadgeSerializer(serializers.ModelSerializer):
     skill_set_name = serializers.CharField(source='skill_set.name', read_only=True)
     badge_image = serializers.ImageField(source='skill_set.badge_image', read_only=True)
@@ -81,4 +94,19 @@ class PeerComparisonSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = PeerComparison
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+class AnswerSubmissionSerializer(serializers.Serializer):
+    question_id = serializers.IntegerField()
+    selected_option_id = serializers.IntegerField(required=False, allow_null=True)
+    text_answer = serializers.CharField(required=False, allow_blank=True, default='')
+    code_answer = serializers.CharField(required=False, allow_blank=True, default='', trim_whitespace=False)
+    time_taken = serializers.IntegerField(required=False, min_value=0, default=0)
+
+class BulkAnswerSubmissionSerializer(serializers.Serializer):
+    answers = AnswerSubmissionSerializer(many=True, allow_empty=False)
+    complete = serializers.BooleanField(required=False, default=False)
+    
+    def validate_answers(self, value):
+        if len(value) > 500:
+            raise serializers.ValidationError('At most 500 answers per request')
+        return value
@@ -0,0 +1,516 @@
+import json
+import os
+import pwd
+import subprocess
+import sys
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from utils.code_sandbox import SandboxPool
+from .badge_tokens import read_badge_token
+from .grading import code_grader, apply_verdict
+from .models import (
+    SkillCategory, SkillSet, AssessmentQuestion, AssessmentOption, SkillAssessment, AssessmentAnswer,
+    UserSkillBadge, PeerComparison, ScoreHistogram
+)
+
+
+class PeerComparisonHistogramTest(TestCase):
+    """Histogram peer comparisons agree with the exact per-assessment queries"""
+
+    PEER_SCORES = [12, 35, 35, 50, 62, 62, 62, 80, 91, 100]
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='Programming', description='Programming')
+        cls.skill_set = SkillSet.objects.create(
+            name='Python', category=category, description='Python',
+            difficulty_level='beginner', estimated_time=30
+        )
+        for i, score in enumerate(cls.PEER_SCORES):
+            user = User.objects.create_user(username=f'peer{i}', password='pass')
+            cls._assessment(user, score, status='completed')
+
+        cls.user = User.objects.create_user(username='learner', password='pass')
+        cls._assessment(cls.user, 40, status='completed')
+
+    @classmethod
+    def _assessment(cls, user, score, status, attempt_number=1):
+        return SkillAssessment.objects.create(
+            user=user, skill_set=cls.skill_set, status=status, total_score=score, max_score=100,
+            percentage=score, attempt_number=attempt_number
+        )
+
+    def setUp(self):
+        call_command('rebuild_score_histograms', stdout=StringIO())
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_complete_uses_histogram(self):
+        assessment = self._assessment(self.user, 62, status='in-progress', attempt_number=2)
+        url = f'/api/assessments/assessments/{assessment.id}/complete_assessment/'
+
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.client.post(url).status_code, 400)
+
+        comparison = PeerComparison.objects.get()
+        self.assertEqual(comparison.total_peers, len(self.PEER_SCORES))
+        self.assertAlmostEqual(comparison.peer_average, sum(self.PEER_SCORES) / len(self.PEER_SCORES))
+        below = sum(1 for score in self.PEER_SCORES if score < 62)
+        self.assertAlmostEqual(comparison.percentile, below / len(self.PEER_SCORES) * 100)
+
+        histogram = ScoreHistogram.objects.get(skill_set=self.skill_set)
+        self.assertEqual(histogram.total, len(self.PEER_SCORES) + 2)
+        self.assertEqual(histogram.counts[ScoreHistogram.bin_for(62)], 4)
+
+    def test_rebuild_matches_incremental_updates(self):
+        assessment = self._assessment(self.user, 77, status='in-progress', attempt_number=2)
+        self.client.post(f'/api/assessments/assessments/{assessment.id}/complete_assessment/')
+        incremental = ScoreHistogram.objects.get(skill_set=self.skill_set)
+
+        self.assertEqual(ScoreHistogram.rebuild(), 1)
+        rebuilt = ScoreHistogram.objects.get(skill_set=self.skill_set)
+        self.assertEqual((rebuilt.counts, rebuilt.total), (incremental.counts, incremental.total))
+        self.assertAlmostEqual(rebuilt.score_sum, incremental.score_sum)
+
+
+class SandboxPoolTest(SimpleTestCase):
+    """Submissions run under limits in pooled sandbox processes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = SandboxPool(workers=2, time_limit=1, memory_mb=128, output_limit=1000)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def test_verdicts(self):
+        cases = [
+            ('print(input() * 2)  \n\n', 'abab', 'accepted'),
+            ('print(sum(range(10)))', '46', 'wrong_answer'),
+            ('1 / 0', '', 'runtime_error'),
+            ('while True: pass', '', 'time_limit'),
+            ("data = ' ' * (512 * 1024 * 1024)", '', 'memory_limit'),
+            ("while True: print('x' * 100)", '', 'output_limit'),
+        ]
+        futures = [self.pool.submit(code, expected, stdin='ab') for code, expected, _ in cases]
+        for (code, _, status), future in zip(cases, futures):
+            self.assertEqual(future.result(timeout=30)['status'], status, code)
+
+    def test_submissions_are_isolated(self):
+        self.pool.grade("import builtins; builtins.leak = 1", '')
+        verdict = self.pool.grade("import builtins; print(hasattr(builtins, 'leak'))", 'False')
+        self.assertTrue(verdict['passed'])
+
+    def test_sandbox_user_cannot_read_the_web_worker(self):
+        try:
+            uid = pwd.getpwnam('nobody').pw_uid
+            runnable = os.geteuid() == 0 and subprocess.run(
+                [sys.executable, '-I', '-S', '-c', ''], user=uid, cwd='/', capture_output=True
+            ).returncode == 0
+        except (OSError, KeyError):
+            runnable = False
+        if not runnable:
+            self.skipTest('needs root and an interpreter the nobody account can run')
+
+        pool = SandboxPool(workers=1, time_limit=1, user='nobody')
+        self.assertEqual(pool.grade('import os; print(os.getuid())', str(uid))['status'], 'accepted')
+        verdict = pool.grade('import os; print(open(f"/proc/{os.getppid()}/environ").read())', '')
+        self.assertEqual(verdict['status'], 'runtime_error')
+        self.assertIn('PermissionError', verdict['error'])
+
+
+@override_settings(CODE_GRADER_ENABLED=True)
+class CodeAnswerGradingTest(TestCase):
+    """Coding answers are graded off the request and cached by question and code"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='Programming', description='Programming')
+        skill_set = SkillSet.objects.create(
+            name='Python', category=category, description='Python',
+            difficulty_level='beginner', estimated_time=30
+        )
+        cls.question = AssessmentQuestion.objects.create(
+            skill_set=skill_set, question_type='coding', question_text='Print the squares of 1-3',
+            expected_output='1\n4\n9', points=20
+        )
+        cls.user = User.objects.create_user(username='learner', password='pass')
+        cls.assessments = [
+            SkillAssessment.objects.create(
+                user=cls.user, skill_set=skill_set, status='in-progress', max_score=20, attempt_number=attempt
+            )
+            for attempt in (1, 2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _submit(self, assessment, code):
+        return self.client.post(f'/api/assessments/assessments/{assessment.id}/submit_answer/', {
+            'question_id': self.question.id, 'code_answer': code, 'time_taken': 30
+        }, format='json')
+
+    def test_pending_answer_graded_then_cached(self):
+        code = 'for i in range(1, 4):\n    print(i * i)\n'
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self._submit(self.assessments[0], code)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['grading_status'], 'pending')
+        self.assertEqual(len(callbacks), 1)
+
+        complete_url = f'/api/assessments/assessments/{self.assessments[0].id}/complete_assessment/'
+        self.assertEqual(self.client.post(complete_url).status_code, 400)
+
+        # What the pool thread does once the sandbox returns
+        pool = SandboxPool(workers=1)
+        verdict = pool.grade(code, self.question.expected_output)
+        cache.set(code_grader.verdict_key(self.question, code), verdict)
+        answer = apply_verdict(response.json()['answer_id'], verdict)
+        self.assertEqual((answer.grading_status, answer.is_correct, answer.points_earned), ('graded', True, 20))
+        self.assertIsNone(apply_verdict(answer.id, verdict))
+
+        self.assertEqual(self.client.post(complete_url).json()['assessment']['percentage'], 100)
+
+        # Same code on the next attempt: graded from the cache in the request
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self._submit(self.assessments[1], code)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['is_correct'], response.json()['total_score']), (True, 20))
+        self.assertEqual(callbacks, [])
+        self.assertEqual(AssessmentAnswer.objects.filter(grading_status='graded').count(), 2)
+
+    def test_sandbox_output_is_not_returned(self):
+        with self.captureOnCommitCallbacks():
+            response = self._submit(self.assessments[0], 'import os\nraise ValueError(os.environ)\n')
+        verdict = {
+            'status': 'runtime_error', 'passed': False, 'output': 'SECRET_OUTPUT',
+            'error': 'Traceback (most recent call last):\nValueError: SECRET_ERROR', 'elapsed': 0.1
+        }
+        apply_verdict(response.json()['answer_id'], verdict)
+
+        response = self.client.get(f'/api/assessments/assessments/{self.assessments[0].id}/answers/')
+        answer = response.json()['answers'][0]
+        self.assertEqual(answer['verdict'], {'status': 'runtime_error', 'passed': False})
+        self.assertIn('(ValueError)', answer['feedback'])
+        self.assertNotIn('SECRET', response.content.decode())
+        self.assertEqual(AssessmentAnswer.objects.get().verdict['output'], 'SECRET_OUTPUT')
+
+    @override_settings(CODE_GRADER_ENABLED=False)
+    def test_disabled_grader_stores_code_ungraded(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self._submit(self.assessments[0], 'print(1)\nprint(4)\nprint(9)\n')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['grading_status'], response.json()['points_earned']), ('graded', 0))
+        self.assertEqual(callbacks, [])
+
+
+class QuestionOrderTest(TestCase):
+    """start_assessment fixes the question order; get_question walks it with a cursor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='Programming', description='Programming')
+        cls.skill_set = SkillSet.objects.create(
+            name='Python', category=category, description='Python',
+            difficulty_level='beginner', estimated_time=30, shuffle_questions=True
+        )
+        cls.questions = [
+            AssessmentQuestion.objects.create(
+                skill_set=cls.skill_set, question_type='fill-blank', question_text=f'Question {i}', points=i + 1
+            )
+            for i in range(6)
+        ]
+        cls.user = User.objects.create_user(username='learner', password='pass')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_questions_served_in_fixed_order(self):
+        response = self.client.post('/api/assessments/assessments/start_assessment/', {
+            'skill_set_id': self.skill_set.id
+        }, format='json')
+        assessment = SkillAssessment.objects.get(id=response.json()['id'])
+        self.assertEqual(assessment.max_score, 21)
+        self.assertEqual(sorted(assessment.question_order), [question.id for question in self.questions])
+
+        # Deactivated after start: skipped
+        AssessmentQuestion.objects.filter(id=assessment.question_order[2]).update(is_active=False)
+
+        url = f'/api/assessments/assessments/{assessment.id}/'
+        served = []
+        while True:
+            response = self.client.get(url + 'get_question/')
+            if response.status_code == 404:
+                break
+            question_id = response.json()['id']
+            self.assertEqual(self.client.get(url + 'get_question/').json()['id'], question_id)
+            served.append(question_id)
+            self.client.post(url + 'submit_answer/', {'question_id': question_id, 'text_answer': 'x'}, format='json')
+
+        order = assessment.question_order
+        self.assertEqual(served, order[:2] + order[3:])
+        assessment.refresh_from_db()
+        self.assertEqual(assessment.question_cursor, 6)
+
+    def _start(self):
+        response = self.client.post('/api/assessments/assessments/start_assessment/', {
+            'skill_set_id': self.skill_set.id
+        }, format='json')
+        assessment = SkillAssessment.objects.get(id=response.json()['id'])
+        return assessment, f'/api/assessments/assessments/{assessment.id}/'
+
+    def test_answers_out_of_order_are_not_served_again(self):
+        assessment, url = self._start()
+        order = assessment.question_order
+        self.assertEqual(self.client.get(url + 'get_question/').json()['id'], order[0])
+
+        response = self.client.post(url + 'submit_answer/', {'question_id': order[1], 'text_answer': 'x'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url + 'get_question/').json()['id'], order[0])
+        self.client.post(url + 'submit_answer/', {'question_id': order[0], 'text_answer': 'x'}, format='json')
+        self.assertEqual(self.client.get(url + 'get_question/').json()['id'], order[2])
+
+    def test_same_question_cannot_be_answered_twice(self):
+        assessment, url = self._start()
+        question = AssessmentQuestion.objects.get(id=assessment.question_order[0])
+        question.question_type = 'mcq'
+        question.save()
+        option = AssessmentOption.objects.create(question=question, option_text='x', is_correct=True)
+
+        data = {'question_id': question.id, 'selected_option_id': option.id, 'time_taken': 10}
+        self.assertEqual(self.client.post(url + 'submit_answer/', data, format='json').json()['total_score'], question.points)
+        response = self.client.post(url + 'submit_answer/', data, format='json')
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'Question already answered'))
+
+        other_skill_set = SkillSet.objects.create(
+            name='Go', category=self.skill_set.category, description='Go',
+            difficulty_level='beginner', estimated_time=30
+        )
+        foreign = AssessmentQuestion.objects.create(skill_set=other_skill_set, question_type='fill-blank', question_text='Go')
+        response = self.client.post(url + 'submit_answer/', {'question_id': foreign.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        SkillAssessment.objects.filter(pk=assessment.pk).update(status='completed')
+        data['question_id'] = assessment.question_order[1]
+        self.assertEqual(self.client.post(url + 'submit_answer/', data, format='json').status_code, 400)
+
+        assessment.refresh_from_db()
+        self.assertEqual((assessment.total_score, assessment.time_taken), (question.points, 10))
+        self.assertEqual(assessment.answers.count(), 1)
+
+
+class BadgeVerificationTest(TestCase):
+    """Badge codes are signed at creation; forged and expired codes are rejected without the database"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='learner', password='pass')
+        category = SkillCategory.objects.create(name='Programming', description='Programming')
+        cls.skill_set = SkillSet.objects.create(
+            name='Python', category=category, description='Python',
+            difficulty_level='beginner', estimated_time=30
+        )
+        cls.assessment = SkillAssessment.objects.create(user=cls.user, skill_set=cls.skill_set, status='completed')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _badge(self, **fields):
+        return UserSkillBadge.objects.create(
+            user=self.user, skill_set=self.skill_set, assessment=self.assessment, **fields
+        )
+
+    def _verify(self, code):
+        return self.client.get('/api/assessments/badges/verify/', {'code': code})
+
+    def test_public_verification(self):
+        with self.assertNumQueries(1):
+            badge = self._badge()
+
+        with self.assertNumQueries(1):
+            response = self._verify(badge.verification_code)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['badge'], {
+            'skill_set_id': self.skill_set.id, 'issued_on': badge.earned_at.date().isoformat(), 'expires_at': None
+        })
+
+        # Someone else's claim with this badge's signature
+        payload = signing.b64_encode(json.dumps({
+            'u': self.user.id + 1, 's': self.skill_set.id, 'a': self.assessment.id, 'd': '2026-01-01'
+        }, separators=(',', ':')).encode()).decode()
+        forged = payload + ':' + badge.verification_code.rsplit(':', 1)[1]
+        for code in [forged, badge.verification_code[:-2], '']:
+            with self.assertNumQueries(0):
+                response = self._verify(code)
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['verified'])
+
+    def test_expired_private_and_deleted_badges_do_not_verify(self):
+        expired = self._badge(expires_at=timezone.now() - timedelta(days=1))
+        with self.assertNumQueries(0):
+            response = self._verify(expired.verification_code)
+        self.assertEqual((response.status_code, response.json()['error']), (400, 'Badge has expired'))
+
+        current = self._badge(expires_at=timezone.now() + timedelta(days=30))
+        self.assertEqual(self._verify(current.verification_code).status_code, 200)
+
+        self.client.force_authenticate(self.user)
+        self.assertTrue(self.client.get(f'/api/assessments/badges/{current.id}/verify/').json()['verified'])
+        self.assertFalse(self.client.get(f'/api/assessments/badges/{expired.id}/verify/').json()['verified'])
+
+        # Shortened on the row without re-signing: the row wins
+        UserSkillBadge.objects.filter(pk=current.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self._verify(current.verification_code).json()['error'], 'Badge has expired')
+        self.assertFalse(self.client.get(f'/api/assessments/badges/{current.id}/verify/').json()['verified'])
+        UserSkillBadge.objects.filter(pk=current.pk).update(expires_at=None)
+
+        UserSkillBadge.objects.filter(pk=current.pk).update(is_public=False)
+        self.assertEqual(self._verify(current.verification_code).json()['error'], 'Invalid verification code')
+        UserSkillBadge.objects.filter(pk=current.pk).update(is_public=True)
+        current.delete()
+        self.assertEqual(self._verify(current.verification_code).status_code, 400)
+
+    def test_changing_the_expiry_re_signs_the_code(self):
+        badge = self._badge(expires_at=timezone.now() - timedelta(days=1))
+        expired_code = badge.verification_code
+
+        badge.expires_at = timezone.now() + timedelta(days=30)
+        badge.save(update_fields=['expires_at'])
+        badge.refresh_from_db()
+        self.assertNotEqual(badge.verification_code, expired_code)
+        response = self._verify(badge.verification_code)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['badge']['issued_on'], badge.earned_at.date().isoformat())
+        self.assertEqual(self._verify(expired_code).status_code, 400)
+
+        extended_code = badge.verification_code
+        badge.expires_at = timezone.now() - timedelta(minutes=1)
+        badge.save()
+        self.assertEqual(self._verify(badge.verification_code).json()['error'], 'Badge has expired')
+        self.assertEqual(self._verify(extended_code).json()['error'], 'Invalid verification code')
+
+        # Saving without an expiry change keeps the code
+        badge.refresh_from_db()
+        shortened_code = badge.verification_code
+        self.assertEqual(read_badge_token(shortened_code)['expires_at'], badge.expires_at)
+        badge.is_public = False
+        badge.save()
+        self.assertEqual(badge.verification_code, shortened_code)
+
+
+class BulkAnswerSubmissionTest(TestCase):
+    """submit_answers scores a whole assessment with a fixed number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = SkillCategory.objects.create(name='Programming', description='Programming')
+        cls.skill_set = SkillSet.objects.create(
+            name='Python', category=category, description='Python',
+            difficulty_level='beginner', estimated_time=30, passing_score=50
+        )
+        cls.questions = []
+        for i in range(12):
+            question = AssessmentQuestion.objects.create(
+                skill_set=cls.skill_set, question_type='mcq', question_text=f'Question {i}', points=10
+            )
+            question.right = AssessmentOption.objects.create(question=question, option_text='Right', is_correct=True)
+            question.wrong = AssessmentOption.objects.create(question=question, option_text='Wrong', order=1)
+            cls.questions.append(question)
+        cls.user = User.objects.create_user(username='learner', password='pass')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _start(self):
+        response = self.client.post('/api/assessments/assessments/start_assessment/', {
+            'skill_set_id': self.skill_set.id
+        }, format='json')
+        return response.json()['id']
+
+    def _answers(self, questions):
+        return [
+            {'question_id': question.id, 'selected_option_id': (question.right if i % 3 else question.wrong).id,
+             'time_taken': 10}
+            for i, question in enumerate(questions)
+        ]
+
+    def _submit(self, assessment_id, answers, complete=False):
+        return self.client.post(f'/api/assessments/assessments/{assessment_id}/submit_answers/', {
+            'answers': answers, 'complete': complete
+        }, format='json')
+
+    def test_query_count_independent_of_answer_count(self):
+        counts = []
+        for size in (2, 12):
+            assessment_id = self._start()
+            with CaptureQueriesContext(connection) as queries:
+                response = self._submit(assessment_id, self._answers(self.questions[:size]))
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_submit_retry_and_complete(self):
+        assessment_id = self._start()
+        response = self._submit(assessment_id, self._answers(self.questions[:6])).json()
+        self.assertEqual((response['total_score'], response['completed']), (40, False))
+
+        # The first six again (a retried upload) plus the rest, completing the assessment
+        response = self._submit(assessment_id, self._answers(self.questions[:6]) + self._answers(self.questions[6:]),
+                                 complete=True).json()
+        self.assertEqual(response['skipped_question_ids'], [question.id for question in self.questions[:6]])
+        self.assertEqual(len(response['answers']), 6)
+        self.assertTrue(response['completed'])
+
+        assessment = SkillAssessment.objects.get(id=assessment_id)
+        self.assertEqual((assessment.status, assessment.total_score, assessment.time_taken), ('completed', 80, 120))
+        self.assertEqual(assessment.question_cursor, 12)
+        self.assertTrue(assessment.passed)
+        self.assertEqual(AssessmentAnswer.objects.filter(assessment=assessment).count(), 12)
+        self.assertTrue(UserSkillBadge.objects.filter(assessment=assessment).exists())
+
+        self.assertEqual(self._submit(assessment_id, self._answers(self.questions[:1])).status_code, 400)
+
+    def test_complete_waits_for_earlier_pending_answers(self):
+        assessment_id = self._start()
+        # A coding answer from an earlier call, still with the grader
+        AssessmentAnswer.objects.create(
+            assessment_id=assessment_id, question=self.questions[0], grading_status='pending'
+        )
+
+        response = self._submit(assessment_id, self._answers(self.questions[1:]), complete=True)
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(response.json()['completed'])
+        self.assertIn('message', response.json())
+        self.assertEqual(SkillAssessment.objects.get(id=assessment_id).status, 'in-progress')
+        self.assertFalse(ScoreHistogram.objects.filter(skill_set=self.skill_set).exists())
+
+    def test_rejects_foreign_questions(self):
+        other = AssessmentQuestion.objects.create(
+            skill_set=SkillSet.objects.create(
+                name='Go', category=self.skill_set.category, description='Go',
+                difficulty_level='beginner', estimated_time=30
+            ),
+            question_type='mcq', question_text='Other'
+        )
+        response = self._submit(self._start(), [{'question_id': other.id}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['question_ids'], [other.id])
@@ -1,27 +1,37 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.utils import timezone
-from django.db.models import Avg, Count
+from django.db import transaction
+from django.db.models import Count, F, Q
 from .models import *
 from .serializers import *
+from .grading import code_grader, verdict_feedback
+from .badge_tokens import read_badge_token, claim_expired
+import random
 import uuid
 
 class SkillCategoryViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SkillCategory.objects.filter(is_active=True, parent_category=None)
+    queryset = SkillCategory.objects.filter(is_active=True, parent_category=None).annotate(
+        subcategories_count=Count('subcategories')
+    ).order_by('order', 'name')
     serializer_class = SkillCategorySerializer
     permission_classes = [IsAuthenticated]
     
     @action(detail=True, methods=['get'])
     def subcategories(self, request, pk=None):
         category = self.get_object()
-        subcategories = category.subcategories.filter(is_active=True)
+        subcategories = category.subcategories.filter(is_active=True).annotate(
+            subcategories_count=Count('subcategories')
+        ).order_by('order', 'name')
         serializer = self.get_serializer(subcategories, many=True)
         return Response(serializer.data)
 
 class SkillSetViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SkillSet.objects.filter(is_active=True)
+    queryset = SkillSet.objects.filter(is_active=True).select_related('category').annotate(
+        question_count=Count('questions', filter=Q(questions__is_active=True))
+    ).prefetch_related('prerequisites').order_by('category', 'difficulty_level')
     serializer_class = SkillSetSerializer
     permission_classes = [IsAuthenticated]
     
@@ -49,7 +59,7 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return SkillAssessment.objects.filter(user=self.request.user)
+        return SkillAssessment.objects.filter(user=self.request.user).select_related('user', 'skill_set')
     
     @action(detail=False, methods=['post'])
     def start_assessment(self, request):
@@ -66,18 +76,21 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
             skill_set=skill_set
         ).count() + 1
         
-        # Calculate max score
-        max_score = skill_set.questions.filter(is_active=True).aggregate(
-            total=models.Sum('points')
-        )['total'] or 0
+        # Fix the question order and max score for this attempt
+        questions = list(skill_set.questions.filter(is_active=True).order_by(
+            'question_type', 'id'
+        ).values_list('id', 'points'))
+        if skill_set.shuffle_questions:
+            random.shuffle(questions)
         
         assessment = SkillAssessment.objects.create(
             user=request.user,
             skill_set=skill_set,
             status='in-progress',
             started_at=timezone.now(),
-            max_score=max_score,
-            attempt_number=attempt_number
+            max_score=sum(points for _, points in questions),
+            attempt_number=attempt_number,
+            question_order=[question_id for question_id, _ in questions]
         )
         
         serializer = self.get_serializer(assessment)
@@ -90,18 +103,43 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
         if assessment.status != 'in-progress':
             return Response({'error': 'Assessment is not in progress'}, status=400)
         
-        answered_questions = assessment.answers.values_list('question_id', flat=True)
-        questions = assessment.skill_set.questions.filter(
-            is_active=True
-        ).exclude(id__in=answered_questions)
+        if assessment.question_order:
+            question = self._question_at_cursor(assessment)
+        else:
+            # Started before question orders were fixed at start
+            answered_questions = assessment.answers.values_list('question_id', flat=True)
+            question = assessment.skill_set.questions.filter(
+                is_active=True
+            ).exclude(id__in=answered_questions).first()
         
-        if not questions.exists():
+        if question is None:
             return Response({'message': 'No more questions'}, status=404)
         
-        question = questions.first()
         serializer = AssessmentQuestionSerializer(question)
         return Response(serializer.data)
     
+    def _question_at_cursor(self, assessment):
+        """
+        The question at the assessment's cursor, skipping ones already
+        answered (e.g. out of order) or deactivated since start
+        """
+        order = assessment.question_order
+        cursor = assessment.question_cursor
+        answered = set(assessment.answers.values_list('question_id', flat=True))
+        question = None
+        while question is None and cursor < len(order):
+            if order[cursor] not in answered:
+                question = AssessmentQuestion.objects.filter(
+                    id=order[cursor], is_active=True
+                ).prefetch_related('options').first()
+            if question is None:
+                cursor += 1
+        
+        if cursor != assessment.question_cursor:
+            SkillAssessment.objects.filter(pk=assessment.pk).update(question_cursor=cursor)
+            assessment.question_cursor = cursor
+        return question
+    
     @action(detail=True, methods=['post'])
     def submit_answer(self, request, pk=None):
         assessment = self.get_object()
@@ -116,49 +154,234 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
         except AssessmentQuestion.DoesNotExist:
             return Response({'error': 'Question not found'}, status=404)
         
-        is_correct = False
-        points_earned = 0
-        feedback = ""
-        
-        if question.question_type == 'mcq' and selected_option_id:
-            try:
-                selected_option = question.options.get(id=selected_option_id)
-                is_correct = selected_option.is_correct
-                if is_correct:
-                    points_earned = question.points
-                feedback = question.explanation
-            except AssessmentOption.DoesNotExist:
-                pass
-        
-        answer = AssessmentAnswer.objects.create(
-            assessment=assessment,
-            question=question,
-            selected_option_id=selected_option_id if selected_option_id else None,
-            text_answer=text_answer,
-            code_answer=code_answer,
-            is_correct=is_correct,
-            points_earned=points_earned,
-            time_taken=time_taken,
-            feedback=feedback
-        )
-        
-        assessment.total_score += points_earned
-        assessment.time_taken += time_taken
-        assessment.save()
+        with transaction.atomic():
+            # Locked like submit_answers, so a double submit cannot answer twice
+            assessment = self.get_queryset().select_for_update(of=('self',)).get(pk=assessment.pk)
+            if assessment.status != 'in-progress':
+                return Response({'error': 'Assessment is not in progress'}, status=400)
+            
+            if assessment.question_order:
+                in_assessment = question.id in assessment.question_order
+            else:
+                in_assessment = question.skill_set_id == assessment.skill_set_id
+            if not in_assessment:
+                return Response({'error': 'Question is not in this assessment'}, status=400)
+            if assessment.answers.filter(question=question).exists():
+                return Response({'error': 'Question already answered'}, status=400)
+            
+            selected_option = None
+            if question.question_type == 'mcq' and selected_option_id:
+                selected_option = question.options.filter(id=selected_option_id).first()
+            result = self._score_answer(question, selected_option, code_answer)
+            
+            answer = AssessmentAnswer.objects.create(
+                assessment=assessment,
+                question=question,
+                selected_option_id=selected_option_id if selected_option_id else None,
+                text_answer=text_answer,
+                code_answer=code_answer,
+                time_taken=time_taken,
+                **result
+            )
+            if answer.grading_status == 'pending':
+                code_grader.submit(answer)
+            
+            # F() update: the grader credits pending answers concurrently
+            progress = {
+                'total_score': F('total_score') + answer.points_earned,
+                'time_taken': F('time_taken') + time_taken
+            }
+            # Answering the question at the cursor moves on to the next one
+            cursor = assessment.question_cursor
+            if cursor < len(assessment.question_order) and assessment.question_order[cursor] == question.id:
+                progress['question_cursor'] = F('question_cursor') + 1
+            SkillAssessment.objects.filter(pk=assessment.pk).update(**progress)
+            assessment.total_score += answer.points_earned
         
         correct_option = question.options.filter(is_correct=True).first()
         
         return Response({
-            'is_correct': is_correct,
-            'points_earned': points_earned,
+            'answer_id': answer.id,
+            'grading_status': answer.grading_status,
+            'is_correct': answer.is_correct,
+            'points_earned': answer.points_earned,
             'correct_option_id': correct_option.id if correct_option else None,
-            'feedback': feedback,
+            'feedback': answer.feedback,
             'total_score': assessment.total_score
+        }, status=status.HTTP_202_ACCEPTED if answer.grading_status == 'pending' else status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['post'])
+    def submit_answers(self, request, pk=None):
+        """
+        Submit many answers at once (e.g. a timed assessment taken offline),
+        optionally completing the assessment in the same call. Questions
+        that already have an answer are skipped, so a retried upload is safe;
+        the assessment row is locked for the call, so concurrent retries
+        cannot both insert the same answers.
+        """
+        submission = BulkAnswerSubmissionSerializer(data=request.data)
+        if not submission.is_valid():
+            return Response(submission.errors, status=400)
+        items = submission.validated_data['answers']
+        
+        assessment = self.get_object()
+        with transaction.atomic():
+            assessment = self.get_queryset().select_for_update(of=('self',)).get(pk=assessment.pk)
+            if assessment.status != 'in-progress':
+                return Response({'error': 'Assessment is not in progress'}, status=400)
+            
+            question_ids = {item['question_id'] for item in items}
+            questions = {
+                question.id: question
+                for question in assessment.skill_set.questions.filter(id__in=question_ids).prefetch_related('options')
+            }
+            unknown = question_ids - set(questions)
+            if unknown:
+                return Response(
+                    {'error': 'Questions not in this assessment', 'question_ids': sorted(unknown)},
+                    status=400
+                )
+            
+            answered = set(assessment.answers.values_list('question_id', flat=True))
+            new_answers, skipped = [], []
+            for item in items:
+                question = questions[item['question_id']]
+                if question.id in answered:
+                    skipped.append(question.id)
+                    continue
+                answered.add(question.id)
+                
+                selected_option = None
+                if question.question_type == 'mcq' and item.get('selected_option_id'):
+                    selected_option = next(
+                        (option for option in question.options.all() if option.id == item['selected_option_id']),
+                        None
+                    )
+                new_answers.append(AssessmentAnswer(
+                    assessment=assessment,
+                    question=question,
+                    selected_option=selected_option,
+                    text_answer=item['text_answer'],
+                    code_answer=item['code_answer'],
+                    time_taken=item['time_taken'],
+                    **self._score_answer(question, selected_option, item['code_answer'])
+                ))
+            
+            points = sum(answer.points_earned for answer in new_answers)
+            pending = any(answer.grading_status == 'pending' for answer in new_answers)
+            completed = False
+            AssessmentAnswer.objects.bulk_create(new_answers)
+            for answer in new_answers:
+                if answer.grading_status == 'pending':
+                    code_grader.submit(answer)
+            
+            progress = {
+                'total_score': F('total_score') + points,
+                'time_taken': F('time_taken') + sum(answer.time_taken for answer in new_answers)
+            }
+            order, cursor = assessment.question_order, assessment.question_cursor
+            while cursor < len(order) and order[cursor] in answered:
+                cursor += 1
+            if cursor != assessment.question_cursor:
+                progress['question_cursor'] = cursor
+            SkillAssessment.objects.filter(pk=assessment.pk).update(**progress)
+            
+            # Same guard as complete_assessment: answers from earlier calls may still be grading
+            if submission.validated_data['complete'] and not pending:
+                pending = assessment.answers.filter(grading_status='pending').exists()
+                if not pending:
+                    assessment.refresh_from_db(fields=['total_score', 'time_taken', 'question_cursor'])
+                    completed = self._complete(assessment)
+        
+        response = {
+            'answers': [
+                {
+                    'answer_id': answer.id,
+                    'question_id': answer.question_id,
+                    'grading_status': answer.grading_status,
+                    'is_correct': answer.is_correct,
+                    'points_earned': answer.points_earned,
+                    'feedback': answer.feedback
+                }
+                for answer in new_answers
+            ],
+            'skipped_question_ids': skipped,
+            'total_score': assessment.total_score + (0 if completed else points),
+            'completed': completed
+        }
+        if completed:
+            response['assessment'] = self.get_serializer(assessment).data
+        elif submission.validated_data['complete']:
+            response['message'] = 'Some answers are still being graded; complete the assessment once they are done'
+        return Response(response, status=status.HTTP_202_ACCEPTED if pending else status.HTTP_200_OK)
+    
+    def _score_answer(self, question, selected_option, code_answer):
+        """
+        Score one answer: MCQs from the chosen option, coding answers from a
+        cached verdict or else left pending for the background grader
+        """
+        result = {'is_correct': False, 'points_earned': 0, 'feedback': '', 'grading_status': 'graded', 'verdict': None}
+        
+        if question.question_type == 'mcq' and selected_option is not None:
+            result['is_correct'] = selected_option.is_correct
+            result['points_earned'] = question.points if selected_option.is_correct else 0
+            result['feedback'] = question.explanation
+        elif code_grader.should_grade(question, code_answer):
+            # Same code for the same question: reuse the verdict, otherwise grade in the background
+            verdict = code_grader.cached_verdict(question, code_answer)
+            if verdict is None:
+                result['grading_status'] = 'pending'
+            else:
+                result.update(
+                    is_correct=verdict['passed'],
+                    points_earned=question.points if verdict['passed'] else 0,
+                    feedback=verdict_feedback(question, verdict),
+                    verdict=verdict
+                )
+        return result
+    
+    @action(detail=True, methods=['get'])
+    def answers(self, request, pk=None):
+        """Answers so far, with grading status (poll while coding answers are pending)"""
+        assessment = self.get_object()
+        answers = list(assessment.answers.select_related('question'))
+        return Response({
+            'pending': sum(1 for answer in answers if answer.grading_status == 'pending'),
+            'answers': AssessmentAnswerSerializer(answers, many=True).data
         })
     
     @action(detail=True, methods=['post'])
     def complete_assessment(self, request, pk=None):
         assessment = self.get_object()
+        
+        if assessment.answers.filter(grading_status='pending').exists():
+            return Response(
+                {'error': 'Some answers are still being graded'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            if not self._complete(assessment):
+                return Response(
+                    {'error': 'Assessment is already completed'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        serializer = self.get_serializer(assessment)
+        return Response({
+            'assessment': serializer.data,
+            'message': 'Assessment completed successfully'
+        })
+    
+    def _complete(self, assessment):
+        """Score and close the assessment (call inside a transaction); False if it already was"""
+        # Only the request that completes the assessment adds it to the histogram
+        claimed = SkillAssessment.objects.filter(pk=assessment.pk).exclude(status='completed').update(
+            status='completed', completed_at=timezone.now()
+        )
+        if not claimed:
+            return False
+        
         assessment.status = 'completed'
         assessment.completed_at = timezone.now()
         assessment.calculate_percentage()
@@ -168,23 +391,18 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
         
         self._generate_skill_gaps(assessment)
         self._generate_peer_comparison(assessment)
-        
-        serializer = self.get_serializer(assessment)
-        return Response({
-            'assessment': serializer.data,
-            'message': 'Assessment completed successfully'
-        })
+        return True
     
     @action(detail=True, methods=['get'])
     def detailed_report(self, request, pk=None):
         assessment = self.get_object()
-        answers = assessment.answers.all()
+        answers = assessment.answers.select_related('question')
         
-        skill_gaps = SkillGap.objects.filter(assessment=assessment)
+        skill_gaps = SkillGap.objects.filter(assessment=assessment).select_related('skill_set')
         peer_comparison = PeerComparison.objects.filter(
             user=request.user,
             skill_set=assessment.skill_set
-        ).first()
+        ).select_related('skill_set').first()
         
         return Response({
             'assessment': SkillAssessmentSerializer(assessment).data,
@@ -201,7 +419,7 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
         )
     
     def _generate_skill_gaps(self, assessment):
-        incorrect_answers = assessment.answers.filter(is_correct=False)
+        incorrect_answers = assessment.answers.filter(is_correct=False).select_related('question')
         weaknesses = []
         
         for answer in incorrect_answers:
@@ -226,29 +444,26 @@ class SkillAssessmentViewSet(viewsets.ModelViewSet):
         )
     
     def _generate_peer_comparison(self, assessment):
-        peer_assessments = SkillAssessment.objects.filter(
+        histogram = ScoreHistogram.record(assessment.skill_set_id, assessment.percentage)
+        
+        # Peers are everyone else: take the user's own scores back out
+        own_scores = list(SkillAssessment.objects.filter(
+            user=assessment.user,
             skill_set=assessment.skill_set,
             status='completed'
-        ).exclude(user=assessment.user)
+        ).values_list('percentage', flat=True))
         
-        if peer_assessments.exists():
-            stats = peer_assessments.aggregate(
-                avg_score=Avg('percentage'),
-                count=Count('id')
-            )
-            
-            better_than = peer_assessments.filter(
-                percentage__lt=assessment.percentage
-            ).count()
-            percentile = (better_than / stats['count']) * 100 if stats['count'] > 0 else 0
+        comparison = histogram.compare(assessment.percentage, exclude=own_scores)
+        if comparison:
+            percentile, peer_average, total_peers = comparison
             
             PeerComparison.objects.create(
                 user=assessment.user,
                 skill_set=assessment.skill_set,
                 user_score=assessment.percentage,
-                peer_average=stats['avg_score'] or 0,
+                peer_average=peer_average,
                 percentile=percentile,
-                total_peers=stats['count']
+                total_peers=total_peers
             )
 
 class UserSkillBadgeViewSet(viewsets.ReadOnlyModelViewSet):
@@ -256,12 +471,49 @@ class UserSkillBadgeViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return UserSkillBadge.objects.filter(user=self.request.user)
+        return UserSkillBadge.objects.filter(user=self.request.user).select_related('user', 'skill_set')
     
     @action(detail=True, methods=['get'])
     def verify(self, request, pk=None):
         badge = self.get_object()
+        claim = read_badge_token(badge.verification_code)
         return Response({
-            'verified': True,
+            'verified': claim is not None and not badge.is_expired,
             'badge': UserSkillBadgeSerializer(badge).data
+        })
+    
+    @action(detail=False, methods=['get'], url_path='verify', authentication_classes=[], permission_classes=[AllowAny])
+    def verify_code(self, request):
+        """
+        Public check of a badge verification code (?code=...). Forged and
+        expired codes are rejected from the signed claim alone; a valid
+        claim costs one lookup on the unique code, so deleted and private
+        badges, and expiries changed on the row, are honoured. Only the
+        skill set and dates are returned, never who holds the badge.
+        """
+        code = request.query_params.get('code', '')
+        claim = read_badge_token(code)
+        badge = None
+        if claim is not None and not claim_expired(claim):
+            badge = UserSkillBadge.objects.filter(verification_code=code, is_public=True).only('expires_at').first()
+            if badge is not None:
+                # The row's expiry holds even if it was changed without re-signing
+                claim['expires_at'] = badge.expires_at
+        if claim is not None and claim_expired(claim):
+            return Response(
+                {'verified': False, 'error': 'Badge has expired', 'expires_at': claim['expires_at']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if badge is None:
+            return Response(
+                {'verified': False, 'error': 'Invalid verification code'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'verified': True,
+            'badge': {
+                'skill_set_id': claim['skill_set_id'],
+                'issued_on': claim['issued_on'],
+                'expires_at': claim['expires_at']
+            }
         })
\ No newline at end of file
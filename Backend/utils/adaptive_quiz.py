@@ -1,23 +1,256 @@
 import numpy as np
 import random
+import base64
+import threading
 from typing import Dict, List, Tuple, Any, Optional
-from scipy.optimize import minimize_scalar
 from scipy.stats import norm
 import json
 
+EXPERIENCE_LEVELS = ['student', 'junior', 'mid', 'senior']
+QUESTION_TYPES = ['rating', 'multiple_choice', 'boolean']
+
+
+class AbilityEstimator:
+    """
+    Full-history ability estimation on a fixed theta quadrature grid.
+    A session keeps one log-likelihood value per grid point; each response
+    adds an O(grid) vector update, and EAP, MLE and posterior SE are read
+    off that vector. The vector is stored as base64-encoded float32.
+    """
+    
+    THETA_GRID = np.linspace(-4.0, 4.0, 81)
+    LOG_PRIOR = norm.logpdf(THETA_GRID)  # Standard normal prior for EAP
+    
+    @classmethod
+    def initial_state(cls) -> np.ndarray:
+        """Log-likelihood before any response (flat)"""
+        return np.zeros_like(cls.THETA_GRID)
+    
+    @staticmethod
+    def encode(log_likelihood: np.ndarray) -> str:
+        """Pack a log-likelihood vector for JSON persistence"""
+        return base64.b64encode(np.asarray(log_likelihood, dtype=np.float32).tobytes()).decode('ascii')
+    
+    @classmethod
+    def decode(cls, encoded: Optional[str]) -> np.ndarray:
+        """Unpack a persisted log-likelihood vector"""
+        if not encoded:
+            return cls.initial_state()
+        return np.frombuffer(base64.b64decode(encoded), dtype=np.float32).astype(np.float64)
+    
+    @classmethod
+    def grid_log_probabilities(cls, difficulty, discrimination) -> Tuple[np.ndarray, np.ndarray]:
+        """log P and log(1 - P) of the 2PL model on the grid (rows per item if arrays are given)"""
+        z = np.multiply.outer(discrimination, cls.THETA_GRID) - np.multiply(discrimination, difficulty)[..., None]
+        return -np.logaddexp(0.0, -z), -np.logaddexp(0.0, z)
+    
+    @staticmethod
+    def update(log_likelihood: np.ndarray, log_p: np.ndarray, log_q: np.ndarray, score: float) -> np.ndarray:
+        """
+        Add one response to the log-likelihood.
+        score is the standardized response in [0, 1]; fractional scores
+        contribute proportionally to the positive and negative terms.
+        """
+        score = min(max(float(score), 0.0), 1.0)
+        return log_likelihood + score * log_p + (1.0 - score) * log_q
+    
+    @classmethod
+    def estimate(cls, log_likelihood: np.ndarray) -> Dict[str, float]:
+        """EAP estimate, posterior SE and grid MLE from a log-likelihood vector"""
+        grid = cls.THETA_GRID
+        
+        log_posterior = log_likelihood + cls.LOG_PRIOR
+        weights = np.exp(log_posterior - log_posterior.max())
+        weights /= weights.sum()
+        
+        eap = float(np.dot(weights, grid))
+        se = float(np.sqrt(np.dot(weights, (grid - eap) ** 2)))
+        
+        # MLE: grid argmax refined by a parabola through its neighbours
+        i = int(np.argmax(log_likelihood))
+        mle = float(grid[i])
+        if 0 < i < len(grid) - 1:
+            left, center, right = log_likelihood[i - 1:i + 2]
+            curvature = left - 2 * center + right
+            if curvature < 0:
+                mle += 0.5 * (left - right) / curvature * (grid[1] - grid[0])
+        
+        return {'eap': eap, 'se': se, 'mle': mle}
+    
+    @classmethod
+    def estimate_many(cls, log_likelihood: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized EAP estimates and posterior SEs for a (examinees x grid) matrix"""
+        grid = cls.THETA_GRID
+        
+        log_posterior = log_likelihood + cls.LOG_PRIOR
+        weights = np.exp(log_posterior - log_posterior.max(axis=1, keepdims=True))
+        weights /= weights.sum(axis=1, keepdims=True)
+        
+        eap = weights @ grid
+        se = np.sqrt(np.einsum('ij,ij->i', weights, (grid[None, :] - eap[:, None]) ** 2))
+        return eap, se
+
+
+class CompiledItemBank:
+    """
+    Question bank compiled into flat NumPy arrays for vectorized CAT item selection.
+    Item i is described by difficulty[i], discrimination[i], type_codes[i] and
+    level_mask[i] (one bit per experience level it is eligible for).
+    """
+    
+    def __init__(self, question_bank: Dict[str, List[Dict]],
+                 experience_questions: Dict[str, List[Dict]],
+                 ab_test_variants: Optional[Dict[str, List[Dict]]] = None):
+        """Compile general and experience-specific questions into item arrays"""
+        self.question_bank = question_bank
+        self.experience_questions = experience_questions
+        self.ab_test_variants = ab_test_variants or {}
+        
+        items = []
+        level_bits = []
+        general = []
+        
+        for category in question_bank.values():
+            for question in category:
+                items.append(question)
+                level_bits.append(self.level_bits(question.get('experience_levels', EXPERIENCE_LEVELS)))
+                general.append(True)
+        
+        for level, questions in experience_questions.items():
+            for question in questions:
+                items.append(question)
+                level_bits.append(self.level_bits([level]))
+                general.append(False)
+        
+        self.items = items
+        self.ids = [question['id'] for question in items]
+        self.index = {question_id: i for i, question_id in enumerate(self.ids)}
+        self.difficulty = np.array([q['difficulty'] for q in items], dtype=np.float64)
+        self.discrimination = np.array([q['discrimination'] for q in items], dtype=np.float64)
+        self.type_codes = np.array(
+            [QUESTION_TYPES.index(q['type']) if q['type'] in QUESTION_TYPES else -1 for q in items],
+            dtype=np.int8
+        )
+        self.level_mask = np.array(level_bits, dtype=np.uint8)
+        self.is_general = np.array(general, dtype=bool)
+        self.has_variants = np.array([q['id'] in self.ab_test_variants for q in items], dtype=bool)
+        self._discrimination_sq = self.discrimination ** 2
+        
+        # Per-item log P / log(1 - P) on the estimator grid (items x grid)
+        self.grid_log_p, self.grid_log_q = AbilityEstimator.grid_log_probabilities(
+            self.difficulty, self.discrimination
+        )
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    @staticmethod
+    def level_bits(levels: List[str]) -> int:
+        """Encode a list of experience levels as a bitmask"""
+        bits = 0
+        for level in levels:
+            if level in EXPERIENCE_LEVELS:
+                bits |= 1 << EXPERIENCE_LEVELS.index(level)
+        return bits
+    
+    def eligible(self, experience_level: str) -> np.ndarray:
+        """Boolean mask of items eligible for an experience level"""
+        bit = self.level_bits([experience_level])
+        return (self.level_mask & bit) != 0
+    
+    def asked_mask(self, asked_ids) -> np.ndarray:
+        """Boolean mask of items already asked"""
+        mask = np.zeros(len(self.items), dtype=bool)
+        positions = [self.index[question_id] for question_id in asked_ids if question_id in self.index]
+        if positions:
+            mask[positions] = True
+        return mask
+    
+    def probability(self, ability) -> np.ndarray:
+        """2PL probability of a positive response for every item"""
+        return 1.0 / (1.0 + np.exp(-self.discrimination * (ability - self.difficulty)))
+    
+    def information(self, ability) -> np.ndarray:
+        """Fisher information a^2 * P * (1 - P) of every item at the given ability"""
+        prob = self.probability(ability)
+        return self._discrimination_sq * prob * (1.0 - prob)
+    
+    def select(self, ability: float, experience_level: str, asked_ids) -> Optional[int]:
+        """Index of the most informative unasked eligible item (None if exhausted)"""
+        remaining = ~self.asked_mask(asked_ids)
+        candidates = remaining & self.eligible(experience_level)
+        
+        if not candidates.any():
+            # Fallback to any remaining general question
+            candidates = remaining & self.is_general
+            if not candidates.any():
+                return None
+        
+        information = np.where(candidates, self.information(ability), -np.inf)
+        return int(np.argmax(information))
+    
+    def select_many(self, abilities: np.ndarray, eligible: np.ndarray, asked: np.ndarray) -> np.ndarray:
+        """
+        Vectorized select() for many examinees at once.
+        eligible and asked are (examinees x items) masks; returns -1 where exhausted.
+        """
+        remaining = ~asked
+        candidates = remaining & eligible
+        
+        empty = ~candidates.any(axis=1)
+        if empty.any():
+            candidates[empty] = remaining[empty] & self.is_general
+        
+        prob = 1.0 / (1.0 + np.exp(-self.discrimination * (abilities[:, None] - self.difficulty)))
+        information = np.where(candidates, self._discrimination_sq * prob * (1.0 - prob), -np.inf)
+        
+        choices = np.argmax(information, axis=1)
+        choices[~candidates.any(axis=1)] = -1
+        return choices
+
+
 class AdaptiveQuizEngine:
     """
     Adaptive Quiz Engine implementing Item Response Theory (IRT) and 
     Computerized Adaptive Testing (CAT) principles
     """
     
-    def __init__(self):
-        """Initialize the adaptive quiz engine"""
-        self.question_bank = self._initialize_question_bank()
-        self.experience_questions = self._initialize_experience_questions()
-        self.ab_test_variants = self._initialize_ab_variants()
-        
-    def _initialize_question_bank(self) -> Dict[str, Any]:
+    TERMINATION_CRITERIA = {
+        'se_threshold': 0.3,  # Stop when SE is below this
+        'min_questions': 5,
+        'max_questions': 15
+    }
+    
+    _item_bank = None
+    _item_bank_lock = threading.Lock()
+    
+    def __init__(self, item_bank: Optional[CompiledItemBank] = None, variant_selector: Any = None):
+        """
+        Initialize the adaptive quiz engine (the item bank is compiled once per process).
+        variant_selector, if given, serves A/B variants instead of the in-code ones;
+        it must provide select(question_id) and record_outcome(variant_id, success).
+        """
+        self.item_bank = item_bank if item_bank is not None else self._get_item_bank()
+        self.question_bank = self.item_bank.question_bank
+        self.experience_questions = self.item_bank.experience_questions
+        self.ab_test_variants = self.item_bank.ab_test_variants
+        self.variant_selector = variant_selector
+    
+    @classmethod
+    def _get_item_bank(cls) -> CompiledItemBank:
+        """Get the process-wide compiled item bank, building it on first use"""
+        if cls._item_bank is None:
+            with cls._item_bank_lock:
+                if cls._item_bank is None:
+                    cls._item_bank = CompiledItemBank(
+                        cls._initialize_question_bank(),
+                        cls._initialize_experience_questions(),
+                        cls._initialize_ab_variants()
+                    )
+        return cls._item_bank
+        
+    @staticmethod
+    def _initialize_question_bank() -> Dict[str, Any]:
         """Initialize the adaptive question bank with IRT parameters"""
         return {
             'technical_skills': [
@@ -128,7 +361,8 @@ class AdaptiveQuizEngine:
             ]
         }
     
-    def _initialize_experience_questions(self) -> Dict[str, List[Dict]]:
+    @staticmethod
+    def _initialize_experience_questions() -> Dict[str, List[Dict]]:
         """Initialize experience-specific question branches"""
         return {
             'student': [
@@ -203,7 +437,8 @@ class AdaptiveQuizEngine:
             ]
         }
     
-    def _initialize_ab_variants(self) -> Dict[str, List[Dict]]:
+    @staticmethod
+    def _initialize_ab_variants() -> Dict[str, List[Dict]]:
         """Initialize A/B test variants for questions"""
         return {
             'tech_001': [
@@ -249,20 +484,23 @@ class AdaptiveQuizEngine:
             'experience_level': experience_level,
             'questions_asked': [],
             'responses': {},
-            'ability_estimate': 0.0,  # Initial ability estimate (theta)
-            'ability_se': 1.0,  # Standard error of ability estimate
+            'ability_estimate': 0.0,  # Initial ability estimate (theta, EAP)
+            'ability_se': 1.0,  # Posterior standard error of ability estimate
+            'ability_mle': None,
+            'ability_history': [],
+            'ability_state': AbilityEstimator.encode(AbilityEstimator.initial_state()),
             'question_count': 0,
             'max_questions': self._get_max_questions(experience_level),
-            'termination_criteria': {
-                'se_threshold': 0.3,  # Stop when SE is below this
-                'min_questions': 5,
-                'max_questions': 15
-            }
+            'termination_criteria': dict(self.TERMINATION_CRITERIA)
         }
         
         # Get first question
         first_question = self._select_next_question(session)
         session['current_question'] = first_question
+        if first_question is None:
+            # Empty item bank (or nothing eligible): there is nothing to ask
+            session['completed'] = True
+            session['final_ability'] = session['ability_estimate']
         
         return session
     
@@ -286,6 +524,13 @@ class AdaptiveQuizEngine:
         session['questions_asked'].append(question_id)
         session['question_count'] += 1
         
+        # Report the outcome of the served A/B variant
+        if self.variant_selector is not None and current_question.get('variant_id') is not None:
+            self.variant_selector.record_outcome(
+                current_question['variant_id'],
+                self._is_valid_response(current_question, response)
+            )
+        
         # Update ability estimate using IRT
         self._update_ability_estimate(session, current_question, response)
         
@@ -297,123 +542,98 @@ class AdaptiveQuizEngine:
         
         # Select next question
         next_question = self._select_next_question(session)
+        if next_question is None:
+            # Item bank exhausted for this examinee
+            session['completed'] = True
+            session['final_ability'] = session['ability_estimate']
+            return session
+        
         session['current_question'] = next_question
         
         return session
     
-    def _select_next_question(self, session: Dict[str, Any]) -> Dict[str, Any]:
+    def _select_next_question(self, session: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Select the next most informative question using CAT principles"""
-        experience_level = session['experience_level']
-        asked_questions = set(session['questions_asked'])
-        current_ability = session['ability_estimate']
+        item_index = self.item_bank.select(
+            session['ability_estimate'],
+            session['experience_level'],
+            session['questions_asked']
+        )
         
-        # Get available questions for experience level
-        available_questions = []
+        if item_index is None:
+            return None
         
-        # Add general questions
-        for category in self.question_bank.values():
-            for question in category:
-                if (question['id'] not in asked_questions and 
-                    experience_level in question['experience_levels']):
-                    available_questions.append(question)
-        
-        # Add experience-specific questions
-        if experience_level in self.experience_questions:
-            for question in self.experience_questions[experience_level]:
-                if question['id'] not in asked_questions:
-                    available_questions.append(question)
-        
-        if not available_questions:
-            # Fallback to any remaining question
-            for category in self.question_bank.values():
-                for question in category:
-                    if question['id'] not in asked_questions:
-                        available_questions.append(question)
-                        break
-        
-        # Select question with maximum information at current ability level
-        best_question = None
-        max_information = -1
-        
-        for question in available_questions:
-            information = self._calculate_information(question, current_ability)
-            if information > max_information:
-                max_information = information
-                best_question = question
+        best_question = dict(self.item_bank.items[item_index])
         
         # Apply A/B testing if variants exist
-        if best_question and best_question['id'] in self.ab_test_variants:
+        if self.variant_selector is not None:
+            variant = self.variant_selector.select(best_question['id'])
+            if variant is not None:
+                best_question['text'] = variant['text']
+                best_question['variant'] = variant['variant']
+                best_question['variant_id'] = variant['id']
+                if variant.get('options'):
+                    best_question['options'] = list(variant['options'])
+        elif self.item_bank.has_variants[item_index]:
             best_question = self._select_ab_variant(best_question)
         
-        return best_question or available_questions[0]  # Fallback
+        return best_question
     
-    def _calculate_information(self, question: Dict[str, Any], ability: float) -> float:
-        """Calculate Fisher information for a question at given ability level"""
-        difficulty = question['difficulty']
-        discrimination = question['discrimination']
-        
-        # Calculate probability of correct response (for rating questions, use scaled probability)
-        if question['type'] == 'rating':
-            # For rating questions, calculate information based on expected response
-            prob = self._irt_probability(ability, difficulty, discrimination)
-        else:
-            # For multiple choice/boolean, use standard IRT
-            prob = self._irt_probability(ability, difficulty, discrimination)
-        
-        # Fisher information formula: a^2 * P * (1-P)
-        information = (discrimination ** 2) * prob * (1 - prob)
-        
-        return information
-    
-    def _irt_probability(self, ability: float, difficulty: float, discrimination: float) -> float:
-        """Calculate IRT probability using 2-parameter logistic model"""
-        exponent = discrimination * (ability - difficulty)
-        probability = 1 / (1 + np.exp(-exponent))
-        return probability
-    
-    def _update_ability_estimate(self, session: Dict[str, Any], question: Dict[str, Any], response: Any):
-        """Update ability estimate using Maximum Likelihood Estimation"""
-        # Convert response to standardized score (0-1 scale)
+    def _standardize_response(self, question: Dict[str, Any], response: Any) -> float:
+        """Convert a raw response to a standardized score on the 0-1 scale"""
         if question['type'] == 'rating':
             scale_max = question['scale'][1]
-            standardized_response = float(response) / scale_max
+            return float(response) / scale_max
         elif question['type'] == 'boolean':
-            standardized_response = 1.0 if response else 0.0
+            return 1.0 if response else 0.0
         elif question['type'] == 'multiple_choice':
             # For multiple choice, use position in options as score
             if isinstance(response, list):  # Multiple select
-                standardized_response = len(response) / len(question['options'])
-            else:
-                try:
-                    option_index = question['options'].index(response)
-                    standardized_response = (option_index + 1) / len(question['options'])
-                except ValueError:
-                    standardized_response = 0.5  # Default if option not found
-        else:
-            standardized_response = 0.5  # Default
-        
-        # Update ability using Newton-Raphson method (simplified)
-        difficulty = question['difficulty']
-        discrimination = question['discrimination']
-        
-        # Calculate likelihood and derivative
-        current_ability = session['ability_estimate']
-        prob = self._irt_probability(current_ability, difficulty, discrimination)
-        
-        # Likelihood derivative (simplified for single item)
-        if standardized_response > 0.5:  # Treat as "correct" response
-            likelihood_derivative = discrimination * (1 - prob)
-        else:  # Treat as "incorrect" response
-            likelihood_derivative = -discrimination * prob
-        
-        # Update ability estimate (simplified MLE)
-        learning_rate = 0.1
-        session['ability_estimate'] += learning_rate * likelihood_derivative
+                return len(response) / len(question['options'])
+            try:
+                option_index = question['options'].index(response)
+                return (option_index + 1) / len(question['options'])
+            except ValueError:
+                return 0.5  # Default if option not found
+        return 0.5  # Default
+    
+    def _is_valid_response(self, question: Dict[str, Any], response: Any) -> bool:
+        """Whether a response is a usable answer to the question as presented (A/B outcome)"""
+        if question['type'] == 'rating':
+            try:
+                return question['scale'][0] <= float(response) <= question['scale'][1]
+            except (TypeError, ValueError):
+                return False
+        elif question['type'] == 'boolean':
+            return isinstance(response, bool)
+        elif question['type'] == 'multiple_choice':
+            if isinstance(response, list):
+                return bool(response) and all(r in question['options'] for r in response)
+            return response in question['options']
+        return response is not None
+    
+    def _update_ability_estimate(self, session: Dict[str, Any], question: Dict[str, Any], response: Any):
+        """Update the ability estimate from the full response history (grid EAP/MLE)"""
+        score = self._standardize_response(question, response)
         
-        # Update standard error (simplified)
-        information = self._calculate_information(question, session['ability_estimate'])
-        if information > 0:
-            session['ability_se'] = 1.0 / np.sqrt(information + 1e-6)  # Add small constant to avoid division by zero
+        item_index = self.item_bank.index.get(question['id'])
+        if item_index is not None:
+            log_p = self.item_bank.grid_log_p[item_index]
+            log_q = self.item_bank.grid_log_q[item_index]
+        else:
+            log_p, log_q = AbilityEstimator.grid_log_probabilities(
+                question['difficulty'], question['discrimination']
+            )
+        
+        log_likelihood = AbilityEstimator.decode(session.get('ability_state'))
+        log_likelihood = AbilityEstimator.update(log_likelihood, log_p, log_q, score)
+        estimate = AbilityEstimator.estimate(log_likelihood)
+        
+        session['ability_state'] = AbilityEstimator.encode(log_likelihood)
+        session['ability_estimate'] = round(estimate['eap'], 4)
+        session['ability_se'] = round(estimate['se'], 4)
+        session['ability_mle'] = round(estimate['mle'], 4)
+        session.setdefault('ability_history', []).append(session['ability_estimate'])
     
     def _should_terminate(self, session: Dict[str, Any]) -> bool:
         """Check if adaptive quiz should terminate"""
@@ -434,7 +654,7 @@ class AdaptiveQuizEngine:
         return False
     
     def _select_ab_variant(self, question: Dict[str, Any]) -> Dict[str, Any]:
-        """Select A/B test variant based on performance and weights"""
+        """Select an in-code A/B test variant based on performance and weights (no variant selector)"""
         question_id = question['id']
         variants = self.ab_test_variants.get(question_id, [])
         
@@ -504,8 +724,10 @@ class AdaptiveQuizEngine:
     
     def _get_ability_progression(self, session: Dict[str, Any]) -> List[float]:
         """Get ability estimate progression throughout the quiz"""
-        # This would ideally be tracked during the session
-        # For now, return a simplified progression
+        if session.get('ability_history'):
+            return [0.0] + list(session['ability_history'])
+        
+        # Sessions without tracked history: approximate the progression
         final_ability = session['ability_estimate']
         question_count = session['question_count']
         
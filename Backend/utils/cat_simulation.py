@@ -0,0 +1,205 @@
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from utils.adaptive_quiz import AdaptiveQuizEngine, AbilityEstimator, EXPERIENCE_LEVELS
+
+
+class CATSimulator:
+    """
+    Monte Carlo simulation of the adaptive quiz (CAT) with synthetic examinees.
+
+    Examinees with known true ability answer items drawn from the engine's
+    compiled item bank under the 2PL model. All examinees are stepped
+    together: item selection, response generation and ability updates are
+    matrix operations over (examinees x items) and (examinees x grid).
+    """
+
+    def __init__(self, engine: Optional[AdaptiveQuizEngine] = None, seed: Optional[int] = None):
+        """Initialize the simulator with an engine (default: the shared item bank)"""
+        self.engine = engine or AdaptiveQuizEngine()
+        self.item_bank = self.engine.item_bank
+        self.criteria = dict(self.engine.TERMINATION_CRITERIA)
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, n_examinees: int = 1000, experience_level: Optional[str] = None,
+            true_abilities: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Simulate n_examinees complete adaptive sessions.
+
+        experience_level fixes the branch for every examinee; by default
+        levels are drawn uniformly. true_abilities defaults to N(0, 1).
+        """
+        bank = self.item_bank
+        n_items = len(bank)
+
+        if true_abilities is None:
+            true_abilities = self.rng.standard_normal(n_examinees)
+        true_abilities = np.asarray(true_abilities, dtype=np.float64)
+        n_examinees = len(true_abilities)
+
+        if experience_level:
+            levels = np.full(n_examinees, EXPERIENCE_LEVELS.index(experience_level))
+        else:
+            levels = self.rng.integers(0, len(EXPERIENCE_LEVELS), n_examinees)
+        eligible = (bank.level_mask[None, :] & (1 << levels)[:, None].astype(np.uint8)) != 0
+
+        log_likelihood = np.zeros((n_examinees, len(AbilityEstimator.THETA_GRID)))
+        asked = np.zeros((n_examinees, n_items), dtype=bool)
+        estimates = np.zeros(n_examinees)
+        standard_errors = np.ones(n_examinees)
+        question_counts = np.zeros(n_examinees, dtype=np.int64)
+        active = np.ones(n_examinees, dtype=bool)
+        exhausted = np.zeros(n_examinees, dtype=bool)
+        exposure = np.zeros(n_items, dtype=np.int64)
+        step_times = []
+
+        for _ in range(self.criteria['max_questions']):
+            rows = np.flatnonzero(active)
+            if rows.size == 0:
+                break
+
+            started = time.perf_counter()
+
+            choices = bank.select_many(estimates[rows], eligible[rows], asked[rows])
+            out_of_items = choices < 0
+            if out_of_items.any():
+                exhausted[rows[out_of_items]] = True
+                active[rows[out_of_items]] = False
+                rows, choices = rows[~out_of_items], choices[~out_of_items]
+                if rows.size == 0:
+                    step_times.append(time.perf_counter() - started)
+                    break
+
+            # Dichotomous responses from the 2PL model at the true abilities
+            prob = 1.0 / (1.0 + np.exp(
+                -bank.discrimination[choices] * (true_abilities[rows] - bank.difficulty[choices])
+            ))
+            scores = (self.rng.random(rows.size) < prob).astype(np.float64)[:, None]
+
+            log_likelihood[rows] += scores * bank.grid_log_p[choices] + (1.0 - scores) * bank.grid_log_q[choices]
+            estimates[rows], standard_errors[rows] = AbilityEstimator.estimate_many(log_likelihood[rows])
+
+            asked[rows, choices] = True
+            question_counts[rows] += 1
+            exposure += np.bincount(choices, minlength=n_items)
+
+            done = (question_counts[rows] >= self.criteria['max_questions']) | (
+                (question_counts[rows] >= self.criteria['min_questions'])
+                & (standard_errors[rows] <= self.criteria['se_threshold'])
+            )
+            active[rows[done]] = False
+
+            step_times.append(time.perf_counter() - started)
+
+        return self._build_report(
+            true_abilities, estimates, standard_errors, question_counts,
+            exhausted, exposure, step_times
+        )
+
+    def _build_report(self, true_abilities, estimates, standard_errors, question_counts,
+                      exhausted, exposure, step_times) -> Dict[str, Any]:
+        """Summarize a simulation run"""
+        n_examinees = len(true_abilities)
+        errors = estimates - true_abilities
+        reached_precision = (standard_errors <= self.criteria['se_threshold']) & ~exhausted
+        total_answers = int(question_counts.sum())
+        total_time = float(sum(step_times))
+        step_ms = np.array(step_times) * 1000 if step_times else np.zeros(1)
+        exposure_rates = exposure / n_examinees if n_examinees else exposure.astype(float)
+
+        return {
+            'examinees': n_examinees,
+            'questions_to_termination': {
+                'mean': round(float(question_counts.mean()), 2),
+                'median': float(np.median(question_counts)),
+                'p90': float(np.percentile(question_counts, 90)),
+                'min': int(question_counts.min()),
+                'max': int(question_counts.max()),
+                'distribution': {
+                    int(count): int(n) for count, n in zip(*np.unique(question_counts, return_counts=True))
+                },
+            },
+            'termination_reasons': {
+                'se_threshold': int(reached_precision.sum()),
+                'bank_exhausted': int(exhausted.sum()),
+                'max_questions': int((~reached_precision & ~exhausted).sum()),
+            },
+            'estimation': {
+                'bias': round(float(errors.mean()), 4),
+                'rmse': round(float(np.sqrt(np.mean(errors ** 2))), 4),
+                'mean_se': round(float(standard_errors.mean()), 4),
+                'correlation': round(float(np.corrcoef(true_abilities, estimates)[0, 1]), 4)
+                if n_examinees > 1 and true_abilities.std() > 0 else None,
+            },
+            'exposure': {
+                'max_rate': round(float(exposure_rates.max()), 4),
+                'mean_rate': round(float(exposure_rates.mean()), 4),
+                'unused_items': int((exposure == 0).sum()),
+                'items': {
+                    question_id: round(float(rate), 4)
+                    for question_id, rate in zip(self.item_bank.ids, exposure_rates)
+                },
+            },
+            'latency': {
+                'steps': len(step_times),
+                'total_seconds': round(total_time, 4),
+                'per_step_ms': {
+                    'mean': round(float(step_ms.mean()), 3),
+                    'p50': round(float(np.percentile(step_ms, 50)), 3),
+                    'p95': round(float(np.percentile(step_ms, 95)), 3),
+                    'max': round(float(step_ms.max()), 3),
+                },
+                'answers_per_second': round(total_answers / total_time, 1) if total_time > 0 else None,
+            },
+        }
+
+    def benchmark_sequential(self, n_examinees: int = 100,
+                             experience_level: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Time the per-request path: start_adaptive_session/process_response one
+        answer at a time, as a single worker would serve them.
+        """
+        answer_times = []
+        start_times = []
+
+        for true_ability in self.rng.standard_normal(n_examinees):
+            level = experience_level or EXPERIENCE_LEVELS[self.rng.integers(0, len(EXPERIENCE_LEVELS))]
+
+            started = time.perf_counter()
+            session = self.engine.start_adaptive_session(0, level)
+            start_times.append(time.perf_counter() - started)
+
+            while not session.get('completed'):
+                response = self._simulated_response(session['current_question'], true_ability)
+                started = time.perf_counter()
+                session = self.engine.process_response(session, response)
+                answer_times.append(time.perf_counter() - started)
+
+        answer_ms = np.array(answer_times) * 1000
+        return {
+            'examinees': n_examinees,
+            'answers': len(answer_times),
+            'start_session_ms': round(float(np.mean(start_times)) * 1000, 3),
+            'per_answer_ms': {
+                'mean': round(float(answer_ms.mean()), 3),
+                'p50': round(float(np.percentile(answer_ms, 50)), 3),
+                'p95': round(float(np.percentile(answer_ms, 95)), 3),
+                'max': round(float(answer_ms.max()), 3),
+            },
+            'answers_per_second': round(len(answer_times) / float(np.sum(answer_times)), 1),
+        }
+
+    def _simulated_response(self, question: Dict[str, Any], true_ability: float) -> Any:
+        """Raw response in the question's own format, drawn from the 2PL model"""
+        prob = 1.0 / (1.0 + np.exp(-question['discrimination'] * (true_ability - question['difficulty'])))
+        positive = bool(self.rng.random() < prob)
+
+        if question['type'] == 'rating':
+            return question['scale'][1] if positive else question['scale'][0]
+        if question['type'] == 'boolean':
+            return positive
+        if question['type'] == 'multiple_choice':
+            return question['options'][-1] if positive else question['options'][0]
+        return positive
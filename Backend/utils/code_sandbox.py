@@ -0,0 +1,222 @@
+import json
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Sequence
+
+# Runs in every sandbox process. The interpreter starts and blocks on stdin
+# until a job arrives, so a pooled process only has to apply its limits and
+# run the submission. Output is captured (up to a cap) and reported as one
+# JSON line on the real stdout.
+BOOTSTRAP = r'''
+import io, json, sys, traceback
+try:
+    import resource
+except ImportError:
+    resource = None
+
+cpu_seconds, memory_bytes, output_limit = (int(value) for value in sys.argv[1:4])
+job = json.loads(sys.stdin.read())
+report = sys.stdout
+
+if resource is not None:
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+class OutputLimitExceeded(BaseException):
+    pass
+
+
+class CappedOutput(io.StringIO):
+    def write(self, text):
+        if self.tell() + len(text) > output_limit:
+            raise OutputLimitExceeded()
+        return super().write(text)
+
+
+output = CappedOutput()
+sys.stdin, sys.stdout, sys.stderr = io.StringIO(job['stdin']), output, io.StringIO()
+status, error = 'ok', ''
+try:
+    exec(compile(job['code'], '<submission>', 'exec'), {'__name__': '__main__'})
+except SystemExit as e:
+    if e.code not in (None, 0):
+        status, error = 'error', f'SystemExit: {e.code}'
+except OutputLimitExceeded:
+    status = 'output_limit'
+except MemoryError:
+    status = 'memory_limit'
+except BaseException:
+    status, error = 'error', traceback.format_exc(limit=-3)
+
+report.write(json.dumps({'status': status, 'output': output.getvalue()[:output_limit], 'error': error}))
+report.flush()
+'''
+
+
+def normalize_output(text: str) -> str:
+    """Line endings unified, trailing whitespace and trailing blank lines dropped"""
+    lines = [line.rstrip() for line in text.replace('\r\n', '\n').split('\n')]
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines)
+
+
+class SandboxPool:
+    """
+    Runs untrusted Python submissions in a pool of pre-warmed sandbox
+    processes and grades their output.
+
+    Each submission gets a fresh isolated interpreter (-I -S, empty
+    environment, its own temporary working directory and process group)
+    with CPU time, address space and file size limits; the process is
+    started ahead of time and discarded after one job, so no state leaks
+    between submissions. Jobs run on a thread pool, so submit() returns a
+    Future immediately and callers never wait on a sandbox.
+
+    These limits alone do not isolate a submission from the host: a
+    process running as the web worker's user can read its parent's
+    environment (/proc/<ppid>/environ), the settings and the database
+    file. Pass `user` (and `group`) to run sandboxes as a separate
+    unprivileged account, which needs the workers to start as root or
+    with CAP_SETUID/CAP_SETGID, and/or a `wrapper` command prefix such as
+    nsjail or bwrap for filesystem, network and namespace isolation.
+    """
+
+    # Wall clock allowance over the CPU limit (sleeping or blocked code)
+    WALL_TIME_FACTOR = 2.0
+
+    def __init__(self, workers: int = 4, time_limit: int = 5, memory_mb: int = 256,
+                 output_limit: int = 64 * 1024, python: Optional[str] = None,
+                 user: Optional[str] = None, group: Optional[str] = None, wrapper: Sequence[str] = ()):
+        self.workers = workers
+        self.time_limit = max(int(time_limit), 1)
+        self.memory_mb = memory_mb
+        self.output_limit = output_limit
+        self.python = python or sys.executable
+        self.user = user
+        self.group = group
+        self.wrapper = list(wrapper)
+        self._idle = queue.Queue()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the job threads and pre-warm one sandbox per worker"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sandbox')
+                for _ in range(self.workers):
+                    self._idle.put(self._spawn())
+
+    def shutdown(self):
+        """Stop accepting jobs and kill the idle sandboxes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        while True:
+            try:
+                process, workdir = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._kill(process)
+            process.communicate()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def submit(self, code: str, expected_output: str, stdin: str = '') -> Future:
+        """Grade a submission in the background; the Future resolves to a verdict"""
+        self.start()
+        return self._executor.submit(self.grade, code, expected_output, stdin)
+
+    def grade(self, code: str, expected_output: str, stdin: str = '') -> Dict[str, Any]:
+        """
+        Run a submission and compare its output with the expected output.
+        Verdict status is one of accepted, wrong_answer, runtime_error,
+        time_limit, memory_limit or output_limit.
+        """
+        result = self.run(code, stdin)
+        status = result['status']
+        if status == 'ok':
+            passed = normalize_output(result['output']) == normalize_output(expected_output)
+            status = 'accepted' if passed else 'wrong_answer'
+        elif status == 'error':
+            status = 'runtime_error'
+        return {
+            'status': status,
+            'passed': status == 'accepted',
+            'output': result['output'],
+            'error': result['error'],
+            'elapsed': result['elapsed']
+        }
+
+    def run(self, code: str, stdin: str = '') -> Dict[str, Any]:
+        """Run a submission in a sandbox: status ok/error/time_limit/memory_limit/output_limit"""
+        try:
+            process, workdir = self._idle.get_nowait()
+        except queue.Empty:
+            process, workdir = self._spawn()
+        if self._executor is not None:
+            # Replace it now, so the next job finds a warm sandbox
+            self._idle.put(self._spawn())
+
+        started = time.perf_counter()
+        job = json.dumps({'code': code, 'stdin': stdin}).encode()
+        try:
+            stdout, stderr = process.communicate(job, timeout=self.time_limit * self.WALL_TIME_FACTOR)
+        except subprocess.TimeoutExpired:
+            self._kill(process)
+            process.communicate()
+            return self._result('time_limit', started)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if process.returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            return self._result('time_limit', started)
+        try:
+            report = json.loads(stdout.decode('utf-8', 'replace'))
+        except ValueError:
+            # Killed, or the submission wrote to the real stdout
+            error = stderr.decode('utf-8', 'replace')[-2000:]
+            if 'MemoryError' in error:
+                return self._result('memory_limit', started)
+            return self._result('error', started, error=error or f'Exited with code {process.returncode}')
+        return self._result(report['status'], started, report['output'], report['error'])
+
+    def _result(self, status, started, output='', error=''):
+        return {'status': status, 'output': output, 'error': error, 'elapsed': time.perf_counter() - started}
+
+    def _spawn(self):
+        workdir = tempfile.mkdtemp(prefix='sandbox-')
+        credentials = {}
+        if self.user is not None:
+            # Drop to the sandbox account in the child, with no supplementary groups
+            shutil.chown(workdir, self.user, self.group)
+            credentials = {'user': self.user, 'group': self.group, 'extra_groups': []}
+        process = subprocess.Popen(
+            self.wrapper + [self.python, '-I', '-S', '-c', BOOTSTRAP,
+                            str(self.time_limit), str(self.memory_mb * 1024 * 1024), str(self.output_limit)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=workdir, env={}, start_new_session=True, **credentials
+        )
+        return process, workdir
+
+    @staticmethod
+    def _kill(process):
+        try:
+            if hasattr(os, 'killpg'):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
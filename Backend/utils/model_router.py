@@ -0,0 +1,247 @@
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+try:
+    from groq import APITimeoutError
+except ImportError:  # groq is optional for the routing logic itself
+    APITimeoutError = TimeoutError
+
+
+class ModelRouter:
+    """
+    Latency-aware routing of chat completions across Groq models.
+
+    Short/simple queries and the voice channel go to a small fast model,
+    complex planning questions go to the large model. Each route has a
+    per-request timeout and a fallback model that is tried once when the
+    primary times out. Per-route latency statistics are kept in memory.
+    """
+
+    DEFAULT_POLICY = {
+        'routes': {
+            'fast': {
+                'model': 'llama-3.1-8b-instant',
+                'fallback': 'llama-3.3-70b-versatile',
+                'timeout': 8.0,
+            },
+            'large': {
+                'model': 'llama-3.3-70b-versatile',
+                'fallback': 'llama-3.1-8b-instant',
+                'timeout': 20.0,
+            },
+        },
+        # Channels that always use a given route (voice answers are short)
+        'channel_routes': {
+            'voice': 'fast',
+        },
+        'simple_route': 'fast',
+        'complex_route': 'large',
+        'default_route': 'large',
+        # Queries up to this many words without complex keywords are "simple"
+        'short_query_words': 15,
+        # Queries this long are always treated as complex
+        'complex_query_words': 60,
+        # Matched as whole words/phrases, case-insensitively
+        'complex_keywords': [
+            'plan', 'plans', 'planning', 'roadmap', 'strategy', 'step by step', 'step-by-step',
+            'transition', 'switch career', 'career path', 'compare',
+            'comparison', 'pros and cons', 'curriculum', 'timeline',
+            'schedule', 'detailed', 'explain why',
+        ],
+        # Number of recent latency samples kept per route
+        'latency_window': 500,
+    }
+
+    def __init__(self, policy: Optional[Dict[str, Any]] = None):
+        """Initialize the router, merging the given policy over the defaults"""
+        self.policy = self._merge_policy(policy or {})
+        self._complex_pattern = self._keyword_pattern(self.policy['complex_keywords'])
+        self._lock = threading.Lock()
+        self._stats = {
+            route_name: self._empty_stats()
+            for route_name in self.policy['routes']
+        }
+
+    def _merge_policy(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge user overrides into the default policy (routes merged per key)"""
+        policy = {key: value for key, value in self.DEFAULT_POLICY.items() if key != 'routes'}
+        policy['routes'] = {name: dict(route) for name, route in self.DEFAULT_POLICY['routes'].items()}
+        policy['channel_routes'] = dict(self.DEFAULT_POLICY['channel_routes'])
+
+        for key, value in overrides.items():
+            if key == 'routes':
+                for route_name, route_config in value.items():
+                    policy['routes'].setdefault(route_name, {}).update(route_config)
+            elif key == 'channel_routes':
+                policy['channel_routes'].update(value)
+            else:
+                policy[key] = value
+
+        for route_name in (policy['simple_route'], policy['complex_route'], policy['default_route']):
+            if route_name not in policy['routes']:
+                raise ValueError(f"Unknown route '{route_name}' in model routing policy")
+
+        return policy
+
+    @staticmethod
+    def _keyword_pattern(keywords: List[str]) -> Optional[re.Pattern]:
+        """Regex matching any keyword as a whole word (so 'plan' doesn't match 'planet')"""
+        if not keywords:
+            return None
+        alternatives = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+        return re.compile(rf'\b(?:{alternatives})\b')
+
+    def _empty_stats(self) -> Dict[str, Any]:
+        """Create an empty statistics record for a route"""
+        return {
+            'requests': 0,
+            'successes': 0,
+            'timeouts': 0,
+            'fallbacks': 0,
+            'errors': 0,
+            'models': {},
+            'latencies': deque(maxlen=self.policy['latency_window']),
+        }
+
+    def select_route(self, message: str, channel: str = 'chat') -> str:
+        """Pick a route name for a user message on the given channel"""
+        channel_route = self.policy['channel_routes'].get(channel)
+        if channel_route:
+            return channel_route
+
+        text = (message or '').lower()
+        word_count = len(text.split())
+
+        if word_count >= self.policy['complex_query_words']:
+            return self.policy['complex_route']
+        if self._complex_pattern and self._complex_pattern.search(text):
+            return self.policy['complex_route']
+        if word_count <= self.policy['short_query_words']:
+            return self.policy['simple_route']
+
+        return self.policy['default_route']
+
+    def complete(self, client, messages: List[Dict[str, str]], channel: str = 'chat',
+                 route: Optional[str] = None, **params) -> Dict[str, Any]:
+        """
+        Run a chat completion on the routed model, falling back on timeout.
+
+        Returns a dict with the response content, the route and model used,
+        the latency in milliseconds and whether the fallback model answered.
+        """
+        if route is None:
+            user_message = next(
+                (m['content'] for m in reversed(messages) if m.get('role') == 'user'), ''
+            )
+            route = self.select_route(user_message, channel)
+
+        route_config = self.policy['routes'][route]
+        models = [route_config['model']]
+        if route_config.get('fallback') and route_config['fallback'] != route_config['model']:
+            models.append(route_config['fallback'])
+
+        # Retries would multiply the timeout before the fallback is reached
+        if hasattr(client, 'with_options'):
+            client = client.with_options(max_retries=0)
+
+        self._record(route, requests=1)
+        last_error = None
+
+        for attempt, model in enumerate(models):
+            started = time.perf_counter()
+            try:
+                completion = client.chat.completions.create(
+                    messages=messages,
+                    model=model,
+                    timeout=route_config.get('timeout'),
+                    **params
+                )
+            except (APITimeoutError, TimeoutError) as e:
+                self._record(route, timeouts=1)
+                last_error = e
+                continue
+            except Exception:
+                self._record(route, errors=1)
+                raise
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._record(route, successes=1, fallbacks=1 if attempt > 0 else 0,
+                         model=model, latency_ms=latency_ms)
+
+            return {
+                'content': completion.choices[0].message.content,
+                'route': route,
+                'model': model,
+                'latency_ms': round(latency_ms, 2),
+                'fallback': attempt > 0,
+            }
+
+        self._record(route, errors=1)
+        raise last_error
+
+    def _record(self, route: str, model: Optional[str] = None,
+                latency_ms: Optional[float] = None, **counters):
+        """Update the in-memory statistics for a route"""
+        with self._lock:
+            stats = self._stats.setdefault(route, self._empty_stats())
+            for counter, increment in counters.items():
+                stats[counter] += increment
+            if model is not None:
+                stats['models'][model] = stats['models'].get(model, 0) + 1
+            if latency_ms is not None:
+                stats['latencies'].append(latency_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-route request counters and latency percentiles"""
+        with self._lock:
+            snapshot = {
+                route: dict(stats, latencies=list(stats['latencies']), models=dict(stats['models']))
+                for route, stats in self._stats.items()
+            }
+
+        report = {}
+        for route, stats in snapshot.items():
+            latencies = np.array(stats.pop('latencies'), dtype=float)
+            route_config = self.policy['routes'].get(route, {})
+            stats['model'] = route_config.get('model')
+            stats['fallback_model'] = route_config.get('fallback')
+            if latencies.size:
+                p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+                stats['latency_ms'] = {
+                    'samples': int(latencies.size),
+                    'mean': round(float(latencies.mean()), 2),
+                    'p50': round(float(p50), 2),
+                    'p95': round(float(p95), 2),
+                    'p99': round(float(p99), 2),
+                    'max': round(float(latencies.max()), 2),
+                }
+            else:
+                stats['latency_ms'] = {'samples': 0}
+            report[route] = stats
+
+        return report
+
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Get the process-wide router, configured from settings.LLM_ROUTING if available"""
+    global _default_router
+    if _default_router is None:
+        with _default_router_lock:
+            if _default_router is None:
+                policy = None
+                try:
+                    from django.conf import settings
+                    policy = getattr(settings, 'LLM_ROUTING', None)
+                except ImportError:
+                    pass
+                _default_router = ModelRouter(policy)
+    return _default_router
@@ -0,0 +1,66 @@
+import heapq
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class SkillMatchMatrix:
+    """
+    Sparse (roles x skills) matrix of required skills, for scoring a skill
+    set against every role at once.
+
+    A role's match score is the percentage of its required skills the
+    user has; roles that require nothing score NO_REQUIREMENTS_SCORE.
+    Scoring is one sparse matrix-vector product, and the top k roles are
+    picked with a heap, so a request never loops over roles in Python
+    beyond the selection.
+    """
+
+    NO_REQUIREMENTS_SCORE = 50.0
+
+    def __init__(self, role_ids: Sequence[int], role_skills: Sequence[Iterable[str]]):
+        self.role_ids = np.asarray(role_ids, dtype=np.int64)
+        self.vocabulary = {}
+        rows, columns = [], []
+        for row, skills in enumerate(role_skills):
+            for skill in set(skills):
+                rows.append(row)
+                columns.append(self.vocabulary.setdefault(skill, len(self.vocabulary)))
+
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, columns)),
+            shape=(len(self.role_ids), len(self.vocabulary))
+        )
+        self.required_counts = np.diff(self.matrix.indptr)
+
+    def __len__(self):
+        return len(self.role_ids)
+
+    def skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        """Indicator vector of the known skills among some skills"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float64)
+        columns = [self.vocabulary[skill] for skill in set(skills) if skill in self.vocabulary]
+        vector[columns] = 1.0
+        return vector
+
+    def scores(self, skills: Iterable[str]) -> np.ndarray:
+        """Match percentage (rounded to 2 places) of every role"""
+        matched = self.matrix @ self.skill_vector(skills)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = np.round(matched / self.required_counts * 100, 2)
+        return np.where(self.required_counts > 0, percentages, self.NO_REQUIREMENTS_SCORE)
+
+    def top_k(self, skills: Iterable[str], k: int,
+              candidates: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        (role ID, score) of the k best matching roles, best first; ties go
+        to the lower role ID. `candidates` is an optional boolean mask over
+        the roles.
+        """
+        scores = self.scores(skills)
+        indices = np.arange(len(self.role_ids)) if candidates is None else np.flatnonzero(candidates)
+        best = heapq.nlargest(
+            k, zip(scores[indices].tolist(), (-self.role_ids[indices]).tolist())
+        )
+        return [(-negated_id, score) for score, negated_id in best]
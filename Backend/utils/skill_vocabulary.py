@@ -0,0 +1,95 @@
+import re
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+SEPARATORS = re.compile(r'[^\w+#]+')
+
+
+def normalize_skill(text: str) -> str:
+    """Case and separators folded away: 'Node.js', 'node js' and 'NodeJS' are all 'nodejs'"""
+    return SEPARATORS.sub('', str(text).casefold())
+
+
+def trigrams(normalized: str) -> Set[str]:
+    padded = f'$${normalized}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillVocabulary:
+    """
+    Canonical skills with their aliases, resolved to integer skill IDs.
+
+    Exact resolution is a dict lookup on the normalized text. Fuzzy
+    resolution scores the query against every name and alias through a
+    trigram index: the posting lists of the query's trigrams are counted
+    with one bincount, giving the Jaccard similarity of every term at once.
+    """
+
+    def __init__(self, skills: Iterable[Tuple[int, str, Sequence[str]]], min_similarity: float = 0.5):
+        """`skills` holds (skill ID, canonical name, aliases)"""
+        self.min_similarity = min_similarity
+        self.names: Dict[int, str] = {}
+        self.exact: Dict[str, int] = {}
+        terms, term_skills = [], []
+        for skill_id, name, aliases in skills:
+            self.names[skill_id] = name
+            for text in [name, *aliases]:
+                normalized = normalize_skill(text)
+                if normalized and normalized not in self.exact:
+                    self.exact[normalized] = skill_id
+                    terms.append(normalized)
+                    term_skills.append(skill_id)
+
+        self.term_skills = np.asarray(term_skills, dtype=np.int64)
+        self.term_sizes = np.zeros(len(terms), dtype=np.int64)
+        postings: Dict[str, List[int]] = {}
+        for index, term in enumerate(terms):
+            grams = trigrams(term)
+            self.term_sizes[index] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+        self.postings = {gram: np.asarray(indices, dtype=np.int64) for gram, indices in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, text: str, limit: int = 5, min_similarity: Optional[float] = None) -> List[Tuple[int, float]]:
+        """(skill ID, similarity) of the closest skills, best first"""
+        normalized = normalize_skill(text)
+        if not normalized or not len(self.term_skills):
+            return []
+        if min_similarity is None:
+            min_similarity = self.min_similarity
+
+        grams = trigrams(normalized)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.term_skills))
+        similarity = shared / (len(grams) + self.term_sizes - shared)
+
+        best: Dict[int, float] = {}
+        for index in np.flatnonzero(similarity >= min_similarity):
+            skill_id = int(self.term_skills[index])
+            best[skill_id] = max(best.get(skill_id, 0.0), float(similarity[index]))
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def resolve(self, text: str, fuzzy: bool = True) -> Optional[int]:
+        """Skill ID of a name or alias, else (with fuzzy) of the closest skill, else None"""
+        skill_id = self.exact.get(normalize_skill(text))
+        if skill_id is None and fuzzy:
+            matches = self.search(text, limit=1)
+            skill_id = matches[0][0] if matches else None
+        return skill_id
+
+    def key(self, text: str, fuzzy: bool = False) -> Hashable:
+        """
+        Skill ID of a skill, or its normalized text if it is not in the
+        vocabulary, so unknown skills still compare equal to themselves
+        """
+        skill_id = self.resolve(text, fuzzy=fuzzy)
+        return skill_id if skill_id is not None else normalize_skill(text)
+
+    def keys(self, skills: Iterable[str], fuzzy: bool = False) -> Set[Hashable]:
+        return {self.key(skill, fuzzy=fuzzy) for skill in skills}
@@ -0,0 +1,158 @@
+from typing import Dict, Any, Sequence, Tuple
+
+import numpy as np
+
+DAYS = np.dtype('<i4')  # days since 1970-01-01
+VALUES = np.dtype('<f8')
+
+
+def pack_series(days: Sequence[int], values: Sequence[float]) -> Tuple[bytes, bytes]:
+    """Packed little-endian (days, values) arrays of a series"""
+    return np.asarray(days, dtype=DAYS).tobytes(), np.asarray(values, dtype=VALUES).tobytes()
+
+
+def unpack_series(days: bytes, values: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    return np.frombuffer(days, dtype=DAYS), np.frombuffer(values, dtype=VALUES)
+
+
+def month_index(days: np.ndarray) -> np.ndarray:
+    """Months since January 1970 of day numbers"""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def month_label(index: int) -> str:
+    return str(np.datetime64(int(index), 'M'))
+
+
+class TrendAnalyzer:
+    """
+    Rolling averages, growth rates and forecasts for many time series at
+    once.
+
+    All series are downsampled onto one monthly grid (the mean of each
+    month's points) as a (series x months) matrix, and every statistic is
+    computed on that matrix with array operations, so the cost does not
+    grow with a Python loop per series. The forecast is a least-squares
+    line per series; series with at least two years of observed months
+    covering the whole calendar are fitted as a line plus a level per
+    calendar month instead, giving a seasonal forecast.
+    """
+
+    SEASONAL_MIN_MONTHS = 24
+
+    def __init__(self, months: int = 24, window: int = 3, horizon: int = 6):
+        self.months = max(int(months), 2)
+        self.window = max(int(window), 1)
+        self.horizon = max(int(horizon), 0)
+
+    def grid(self, series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """(first month index, series x months matrix of monthly means, NaN where empty)"""
+        lengths = [len(days) for days, _ in series]
+        matrix = np.full((len(series), self.months), np.nan)
+        if not sum(lengths):
+            return 0, matrix
+
+        rows = np.repeat(np.arange(len(series)), lengths)
+        months = month_index(np.concatenate([days for days, _ in series]))
+        values = np.concatenate([values for _, values in series])
+
+        first = months.max() - self.months + 1
+        keep = months >= first
+        rows, columns, values = rows[keep], months[keep] - first, values[keep]
+
+        sums = np.zeros(matrix.shape)
+        counts = np.zeros(matrix.shape)
+        np.add.at(sums, (rows, columns), values)
+        np.add.at(counts, (rows, columns), 1)
+        with np.errstate(invalid='ignore'):
+            matrix = np.where(counts > 0, sums / counts, np.nan)
+        return first, matrix
+
+    @staticmethod
+    def forward_fill(matrix: np.ndarray) -> np.ndarray:
+        observed = ~np.isnan(matrix)
+        last = np.where(observed, np.arange(matrix.shape[1]), 0)
+        np.maximum.accumulate(last, axis=1, out=last)
+        filled = matrix[np.arange(matrix.shape[0])[:, None], last]
+        # Before a series' first point there is nothing to carry forward
+        filled[np.cumsum(observed, axis=1) == 0] = np.nan
+        return filled
+
+    def rolling_average(self, matrix: np.ndarray) -> np.ndarray:
+        """Mean of the observed values in each trailing window"""
+        observed = ~np.isnan(matrix)
+        padding = np.zeros((matrix.shape[0], 1))
+        sums = np.hstack([padding, np.cumsum(np.where(observed, matrix, 0), axis=1)])
+        counts = np.hstack([padding, np.cumsum(observed, axis=1)])
+        start = np.maximum(np.arange(1, matrix.shape[1] + 1) - self.window, 0)
+        window_sums = sums[:, 1:] - sums[:, start]
+        window_counts = counts[:, 1:] - counts[:, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+    @staticmethod
+    def growth_rates(filled: np.ndarray) -> np.ndarray:
+        """Month-over-month change in percent (NaN for the first month and from zero)"""
+        rates = np.full(filled.shape, np.nan)
+        previous, current = filled[:, :-1], filled[:, 1:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates[:, 1:] = np.where(previous != 0, (current - previous) / np.abs(previous) * 100, np.nan)
+        return rates
+
+    def forecast(self, first: int, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(slope per month, intercept, series x horizon forecast) fitted on the observed months"""
+        observed = ~np.isnan(matrix)
+        t = np.broadcast_to(np.arange(matrix.shape[1], dtype=float), matrix.shape)
+        y = np.where(observed, matrix, 0.0)
+        n = observed.sum(axis=1).astype(float)
+        sum_t = np.where(observed, t, 0).sum(axis=1)
+        sum_y = y.sum(axis=1)
+        sum_tt = np.where(observed, t * t, 0).sum(axis=1)
+        sum_ty = (np.where(observed, t, 0) * y).sum(axis=1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denominator = n * sum_tt - sum_t ** 2
+            slope = np.where(denominator > 0, (n * sum_ty - sum_t * sum_y) / denominator, 0.0)
+            intercept = np.where(n > 0, (sum_y - slope * sum_t) / n, np.nan)
+        seasonal = np.zeros((matrix.shape[0], 12))
+
+        # Long series that cover every calendar month are refitted jointly
+        # as slope * t + a level per calendar month, by solving the stacked
+        # normal equations of all of them at once
+        calendar_month = (first + np.arange(matrix.shape[1])) % 12
+        dummies = np.eye(12)[calendar_month]
+        covered = (observed.astype(float) @ dummies > 0).all(axis=1)
+        seasonal_rows = (n >= self.SEASONAL_MIN_MONTHS) & covered
+        if seasonal_rows.any():
+            design = np.column_stack([t[0], dummies])
+            weights = observed[seasonal_rows].astype(float)
+            gram = np.einsum('sm,mi,mj->sij', weights, design, design)
+            moments = np.einsum('sm,mi,sm->si', weights, design, y[seasonal_rows])
+            coefficients = np.linalg.solve(gram, moments[..., None])[..., 0]
+            levels = coefficients[:, 1:]
+            slope[seasonal_rows] = coefficients[:, 0]
+            intercept[seasonal_rows] = levels.mean(axis=1)
+            seasonal[seasonal_rows] = levels - levels.mean(axis=1, keepdims=True)
+
+        future = np.arange(matrix.shape[1], matrix.shape[1] + self.horizon)
+        forecast = (intercept[:, None] + slope[:, None] * future[None, :]
+                    + seasonal[:, (first + future) % 12])
+        return slope, intercept, forecast
+
+    def analyze(self, series: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Dict[str, Any]:
+        """
+        Monthly values, rolling averages, growth rates, trend slopes and
+        forecasts of some series, as arrays with one row per series
+        """
+        first, matrix = self.grid(series)
+        filled = self.forward_fill(matrix)
+        slope, _, forecast = self.forecast(first, matrix)
+        return {
+            'months': [month_label(first + i) for i in range(self.months)],
+            'forecast_months': [month_label(first + self.months + i) for i in range(self.horizon)],
+            'values': matrix,
+            'rolling_average': self.rolling_average(matrix),
+            'growth_rate': self.growth_rates(filled),
+            'slope': slope,
+            'forecast': forecast,
+        }
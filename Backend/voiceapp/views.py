@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 
 import pyttsx3
 
+from utils.model_router import get_model_router
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,8 +87,9 @@ class VoiceBotFunction:
             Focus on careers like Software Developer, Web Developer, UX Designer, Database Developer, 
             Network Security Engineer, Mobile Developer, QA/Testing, Technical Support, etc."""
 
-            # Call Groq API
-            chat_completion = groq_client.chat.completions.create(
+            # Call Groq API (voice channel is routed to the fast model)
+            result = get_model_router().complete(
+                groq_client,
                 messages=[
                     {
                         "role": "system",
@@ -97,13 +100,13 @@ class VoiceBotFunction:
                         "content": user_message
                     }
                 ],
-                model="llama-3.3-70b-versatile",  # Latest fast model
+                channel="voice",
                 temperature=0.7,
                 max_tokens=512,  # Shorter for voice
                 top_p=0.95,
             )
             
-            return chat_completion.choices[0].message.content
+            return result["content"]
 
         except Exception as e:
             logger.error(f"Error in get_voice_response: {e}")